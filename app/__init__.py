@@ -2,12 +2,15 @@
 Application factory module.
 
 Initializes and configures the Flask application, database, migrations,
-and registers all route blueprints.
+the OpenTimestamps stamping queue, the verified token cache, the bcrypt pool,
+the rate limiter, the proof verification cache and upgrade worker, and registers
+the CLI commands and all route blueprints.
 """
 
 from flask import Flask
 from flask_cors import CORS
 from flask_migrate import Migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
 from app.infraDB.config.connection import db
 
@@ -23,18 +26,48 @@ def create_app():
     app = Flask(__name__)
     # Load configuration settings from the Config object
     app.config.from_object(Config)
+    # Take the client address from X-Forwarded-For, as set by the trusted proxies only
+    if app.config["PROXY_FIX_X_FOR"] > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
 
     # Enable CORS for all domains and methods
     CORS(app, 
          origins="*",  # Allow all origins
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],  # Allow all common methods
-         allow_headers=["Content-Type", "Authorization"],  # Allow common headers
+         allow_headers=["Content-Type", "Authorization", "Idempotency-Key"],  # Allow common headers
+         expose_headers=["Idempotent-Replayed"],  # Let clients tell replayed responses apart
          supports_credentials=True)  # Allow credentials if needed
 
     # Initialize SQLAlchemy with the Flask app
     db.init_app(app)
     # Initialize Flask-Migrate for database migrations support
     Migrate(app, db)
+    # Bind the background OpenTimestamps stamping queue to the app
+    from app.services.stamping_service import stamping_queue
+    stamping_queue.init_app(app)
+    # Size the cache of verified JWT claims
+    from app.auth.tokens import token_cache
+    token_cache.init_app(app)
+    # Bound the threads doing bcrypt work
+    from app.utils.security import password_hasher
+    password_hasher.init_app(app)
+    # Token-bucket limits for the expensive endpoints
+    from app.auth.rate_limit import rate_limiter
+    rate_limiter.init_app(app)
+    # Cache of proof verification results
+    from app.services.verification_service import verification_cache
+    verification_cache.init_app(app)
+    # Upgrade of stamped proofs, on demand or on a schedule
+    from app.services.upgrade_service import upgrade_worker
+    upgrade_worker.init_app(app)
+
+    # Register maintenance commands ('flask ots ...', 'flask ledger ...', 'flask idempotency ...')
+    from app.commands.ots import ots_cli
+    app.cli.add_command(ots_cli)
+    from app.commands.ledger import ledger_cli
+    app.cli.add_command(ledger_cli)
+    from app.commands.idempotency import idempotency_cli
+    app.cli.add_command(idempotency_cli)
 
     # Register authentication routes
     from app.routes.auth_route import auth_bp
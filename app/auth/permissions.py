@@ -2,13 +2,14 @@
 Permission decorator module.
 
 Provides a decorator to enforce JWT-based permission levels on Flask endpoints.
+The token is verified once per request and its claims are exposed to the
+endpoint through app.auth.tokens.current_claims.
 """
 
 from functools import wraps
-from flask import request, jsonify
-import jwt
+from flask import request, jsonify, g
 from jwt import ExpiredSignatureError, InvalidTokenError
-from flask import current_app
+from app.auth.tokens import decode_token
 
 def permission_required(required_level):
     """
@@ -41,12 +42,8 @@ def permission_required(required_level):
                 return jsonify({"error": "Token not provided"}), 401
 
             try:
-                # Decode the JWT using the application's secret key
-                payload = jwt.decode(
-                    token,
-                    current_app.config["SECRET_KEY"],
-                    algorithms=["HS256"]
-                )
+                # Verify the JWT (or reuse the claims of an already verified token)
+                payload = decode_token(token)
                 permission = payload.get("permission")
 
                 # Ensure the permission field is present in the token payload
@@ -64,7 +61,8 @@ def permission_required(required_level):
                 if levels.get(permission, 0) < levels.get(required_level, 0):
                     return jsonify({"error": "Insufficient permission"}), 403
 
-                # Permission is sufficient; proceed to the decorated function
+                # Permission is sufficient; share the claims and proceed to the decorated function
+                g.jwt_claims = payload
                 return func(*args, **kwargs)
 
             except ExpiredSignatureError:
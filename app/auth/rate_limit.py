@@ -0,0 +1,247 @@
+"""
+Rate limiting module.
+
+Provides a token-bucket rate limiter for the expensive endpoints (bcrypt-bound
+login, subprocess-bound proof verification, ...). Buckets are keyed by the
+authenticated user, or by remote address for anonymous requests, and sized by
+permission level. Buckets live in process memory by default; a Redis URL in
+RATE_LIMIT_STORAGE_URL shares them between processes.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, jsonify, g
+
+# Seconds per period accepted in limit strings such as '60/minute'
+_PERIODS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+
+def parse_limit(limit: str) -> tuple:
+    """
+    Parse a limit string into token-bucket parameters.
+
+    Args:
+        limit (str): '<count>/<period>', e.g. '10/minute'.
+
+    Returns:
+        tuple(float, float): Bucket capacity and refill rate in tokens per second.
+
+    Raises:
+        ValueError: If the limit string is malformed.
+    """
+    try:
+        count, period = limit.split("/")
+        capacity = float(count)
+        seconds = _PERIODS[period.strip().lower()]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit '{limit}', expected '<count>/<second|minute|hour|day>'")
+
+    if capacity <= 0:
+        raise ValueError(f"Invalid rate limit '{limit}', count must be positive")
+
+    return capacity, capacity / seconds
+
+
+class MemoryBucketStore:
+    """
+    Token buckets held in this process's memory.
+
+    Buckets are kept in least-recently-used order. Once the store grows past
+    max_entries, the least recently used buckets are evicted, each in constant
+    time; they are the ones most likely to have refilled completely, and a full
+    bucket is indistinguishable from a new one.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self._buckets = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: float, rate: float, cost: float = 1) -> float:
+        """
+        Take tokens from a bucket.
+
+        Args:
+            key (str): Bucket identifier.
+            capacity (float): Maximum number of tokens in the bucket.
+            rate (float): Tokens added per second.
+            cost (float): Tokens the request needs.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise seconds until enough tokens are available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / rate
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+
+            while len(self._buckets) > self._max_entries:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+
+class RedisBucketStore:
+    """
+    Token buckets shared between processes through Redis.
+
+    Each bucket is a hash updated atomically by a Lua script and expires once it
+    would be full again. Requires the optional 'redis' package.
+    """
+
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local wait = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        wait = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_STORAGE_URL points to Redis but the 'redis' package is not installed")
+
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    def consume(self, key: str, capacity: float, rate: float, cost: float = 1) -> float:
+        """
+        Take tokens from a shared bucket.
+
+        Args:
+            key (str): Bucket identifier.
+            capacity (float): Maximum number of tokens in the bucket.
+            rate (float): Tokens added per second.
+            cost (float): Tokens the request needs.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise seconds until enough tokens are available.
+        """
+        wait = self._script(keys=[f"rate_limit:{key}"], args=[capacity, rate, time.time(), cost])
+        return float(wait)
+
+
+class RateLimiter:
+    """
+    Applies per-permission token-bucket limits to decorated endpoints.
+    """
+
+    def __init__(self):
+        self._enabled = False
+        self._limits = {}
+        self._store = None
+
+    def init_app(self, app):
+        """
+        Read the limits and create the bucket store of a Flask application.
+
+        Args:
+            app (Flask): The application whose RATE_LIMIT_* settings apply.
+        """
+        self._enabled = app.config["RATE_LIMIT_ENABLED"]
+        self._limits = {
+            level: parse_limit(limit)
+            for level, limit in app.config["RATE_LIMITS"].items()
+        }
+
+        url = app.config["RATE_LIMIT_STORAGE_URL"]
+        if url.startswith(("redis://", "rediss://", "unix://")):
+            self._store = RedisBucketStore(url)
+        else:
+            self._store = MemoryBucketStore()
+
+        app.extensions["rate_limiter"] = self
+
+    def check(self, scope: str, cost: float = 1) -> float:
+        """
+        Charge the current request to its bucket.
+
+        Authenticated requests (behind permission_required) are keyed by user ID and
+        limited by permission level; other requests are keyed by remote address and
+        use the 'anonymous' limit. Behind a reverse proxy, PROXY_FIX_X_FOR makes the
+        remote address the client's rather than the proxy's.
+
+        Args:
+            scope (str): Name of the protected operation; each scope has its own buckets.
+            cost (float): Tokens the request needs.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise seconds to wait.
+        """
+        if not self._enabled:
+            return 0.0
+
+        claims = g.get("jwt_claims")
+        if claims:
+            key = f"{scope}:user:{claims['user_id']}"
+            level = claims.get("permission", "anonymous")
+        else:
+            key = f"{scope}:ip:{request.remote_addr}"
+            level = "anonymous"
+
+        capacity, rate = self._limits.get(level, self._limits["anonymous"])
+        return self._store.consume(key, capacity, rate, cost)
+
+
+# Shared limiter instance, bound to the application in create_app
+rate_limiter = RateLimiter()
+
+
+def rate_limit(scope: str, cost: float = 1):
+    """
+    Decorator factory that rate-limits an endpoint.
+
+    Place it below permission_required so the bucket is keyed by the verified user.
+
+    Args:
+        scope (str): Name of the protected operation (e.g. 'login', 'verify').
+        cost (float, optional): Tokens one request consumes (default 1).
+
+    Returns:
+        function: A decorator that returns HTTP 429 with Retry-After when the bucket is empty.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            wait = rate_limiter.check(scope, cost)
+            if wait > 0:
+                # Bucket empty: tell the client when a token will be available
+                response = jsonify({"error": "Too many requests"})
+                response.headers["Retry-After"] = str(math.ceil(wait))
+                return response, 429
+
+            return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,120 @@
+"""
+Token verification module.
+
+Verifies JWTs and caches the verified claims, so a client repeating the same
+token (e.g. a scanner posting movements all shift long) skips the HMAC check
+and JSON parsing. The claims of the current request are kept on flask.g.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import jwt
+from flask import current_app, g
+
+
+class TokenCache:
+    """
+    Thread-safe LRU cache of verified JWT claims, keyed by the token's SHA256 digest.
+
+    An entry is dropped as soon as the token's 'exp' claim has passed, so a cached
+    token never outlives its signature; when the cache is full, the least recently
+    used token is evicted.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self._entries = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Size the cache from the application configuration.
+
+        Args:
+            app (Flask): The application whose JWT_CACHE_SIZE applies.
+        """
+        self._max_size = app.config["JWT_CACHE_SIZE"]
+        app.extensions["token_cache"] = self
+
+    def get(self, token: str):
+        """
+        Return the cached claims of a token that has not expired yet.
+
+        Args:
+            token (str): Encoded JWT.
+
+        Returns:
+            dict or None: Verified claims, or None on a miss.
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if claims["exp"] <= time.time():
+                # Expired: the token must go through jwt.decode, which rejects it
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: dict):
+        """
+        Cache the claims of a token that was just verified.
+
+        Args:
+            token (str): Encoded JWT.
+            claims (dict): Claims returned by jwt.decode; must carry 'exp'.
+        """
+        if self._max_size <= 0 or "exp" not in claims:
+            return
+
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+# Shared cache instance, bound to the application in create_app
+token_cache = TokenCache()
+
+
+def decode_token(token: str) -> dict:
+    """
+    Verify a JWT and return its claims, using the cache when possible.
+
+    Args:
+        token (str): Encoded JWT.
+
+    Returns:
+        dict: Verified claims ('user_id', 'email', 'permission', 'exp', 'iat').
+
+    Raises:
+        jwt.ExpiredSignatureError: If the token has expired.
+        jwt.InvalidTokenError: If the token is malformed or its signature is invalid.
+    """
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = jwt.decode(
+            token,
+            current_app.config["SECRET_KEY"],
+            algorithms=["HS256"]
+        )
+        token_cache.put(token, claims)
+    return claims
+
+
+def current_claims() -> dict:
+    """
+    Return the claims of the token that authenticated the current request.
+
+    Only available inside endpoints protected by permission_required.
+
+    Returns:
+        dict: Verified claims ('user_id', 'email', 'permission', ...).
+    """
+    return g.jwt_claims
@@ -0,0 +1,5 @@
+"""
+Flask CLI commands package.
+
+Groups the maintenance commands registered on the application in create_app.
+"""
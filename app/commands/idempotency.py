@@ -0,0 +1,20 @@
+"""
+Idempotency commands module.
+
+Defines the 'flask idempotency' command group for Idempotency-Key maintenance.
+"""
+
+import click
+from flask.cli import AppGroup
+from app.services.idempotency_service import purge_expired_keys
+
+idempotency_cli = AppGroup("idempotency", help="Idempotency-Key maintenance.")
+
+
+@idempotency_cli.command("purge")
+def purge_command():
+    """
+    Remove the Idempotency-Keys older than IDEMPOTENCY_KEY_TTL.
+    """
+    removed = purge_expired_keys()
+    click.echo(f"Removed {removed} expired Idempotency-Key(s).")
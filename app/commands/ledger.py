@@ -0,0 +1,63 @@
+"""
+Ledger commands module.
+
+Defines the 'flask ledger' command group for transaction hash chain maintenance.
+"""
+
+import os
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.services.ledger_service import rehash_transactions, verify_ledger
+
+ledger_cli = AppGroup("ledger", help="Transaction hash chain maintenance.")
+
+
+@ledger_cli.command("verify")
+@click.option("--resume", is_flag=True, help="Start after the last successful verification instead of the first transaction.")
+@click.option("--batch-size", type=int, default=None, help="Rows read at a time (default: TRANSACTIONS_EXPORT_BATCH_SIZE).")
+def verify_command(resume, batch_size):
+    """
+    Check the hash chain linking every transaction to the previous one.
+
+    Exits with status 1 and reports the first broken link if the ledger was altered.
+    """
+    result = verify_ledger(batch_size or current_app.config["TRANSACTIONS_EXPORT_BATCH_SIZE"], resume=resume)
+
+    if not result["valid"]:
+        click.echo(
+            f"Broken link at transaction {result['transaction_id']}: {result['reason']} "
+            f"({result['checked']} transaction(s) verified before it).",
+            err=True
+        )
+        raise SystemExit(1)
+
+    click.echo(
+        f"Ledger intact: {result['checked']} transaction(s) verified, "
+        f"head {result['transaction_id']} ({result['chain_hash']})."
+    )
+
+
+@ledger_cli.command("rehash")
+@click.option("--workers", type=int, default=None, help="Worker processes (default: one per CPU).")
+@click.option("--batch-size", type=int, default=None, help="Rows per batch (default: TRANSACTIONS_EXPORT_BATCH_SIZE).")
+def rehash_command(workers, batch_size):
+    """
+    Recompute every transaction hash from its canonical record and flag mismatches.
+
+    Exits with status 1 if any transaction no longer matches its hash. Nothing is rewritten.
+    """
+    def report(transaction_id, reason):
+        click.echo(f"Transaction {transaction_id}: {reason}", err=True)
+
+    totals = rehash_transactions(
+        batch_size or current_app.config["TRANSACTIONS_EXPORT_BATCH_SIZE"],
+        max(1, workers or os.cpu_count() or 1),
+        on_mismatch=report
+    )
+    click.echo(
+        f"Checked {totals['checked']} transaction(s): {totals['canonical']} match their canonical record, "
+        f"{totals['legacy']} recorded before canonical records, {totals['mismatch']} mismatch(es)."
+    )
+    if totals["mismatch"]:
+        raise SystemExit(1)
@@ -0,0 +1,79 @@
+"""
+OTS commands module.
+
+Defines the 'flask ots' command group for OpenTimestamps proof maintenance.
+"""
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.services.stamping_service import stamping_queue
+from app.services.storage_service import migrate_proof_storage
+from app.services.upgrade_service import upgrade_worker
+from app.utils.ots_handler import compact_proofs
+
+ots_cli = AppGroup("ots", help="OpenTimestamps proof maintenance.")
+
+
+@ots_cli.command("upgrade")
+@click.option("--batch-size", type=int, default=None, help="Proof files per batch (default: OTS_UPGRADE_BATCH_SIZE).")
+@click.option("--all", "drain", is_flag=True, help="Keep running batches until no proof is due.")
+def upgrade_command(batch_size, drain):
+    """
+    Upgrade stamped proofs with the Bitcoin attestations their calendars have completed.
+    """
+    totals = upgrade_worker.run(drain=drain, batch_size=batch_size)
+    click.echo(
+        f"Upgraded {totals['upgraded']} proof file(s); "
+        f"{totals['pending']} not anchored yet, {totals['failed']} failed."
+    )
+
+
+@ots_cli.command("recover-pending")
+@click.option("--older-than", type=int, default=None,
+              help="Seconds a proof must have been pending (default: OTS_STAMP_RECOVER_AFTER).")
+@click.option("--failed", "include_failed", is_flag=True,
+              help="Also retry the proofs whose stamping gave up after OTS_STAMP_MAX_ATTEMPTS.")
+def recover_pending_command(older_than, include_failed):
+    """
+    Stamp again the transactions whose pending proof was lost or whose retry is due.
+    """
+    submitted = stamping_queue.recover(older_than, include_failed=include_failed)
+    # Queued jobs are stamped before the command exits
+    stamping_queue.wait_idle()
+    click.echo(f"Re-submitted {submitted} pending transaction(s) for stamping.")
+
+
+@ots_cli.command("migrate-storage")
+@click.option("--dry-run", is_flag=True, help="Only report what would be moved.")
+def migrate_storage_command(dry_run):
+    """
+    Move legacy flat-layout proofs to content-addressed storage ('ab/cd/<sha256>.ots').
+    """
+    counts = migrate_proof_storage(dry_run=dry_run, logger=current_app.logger)
+    verb = "Would move" if dry_run else "Moved"
+    click.echo(
+        f"{verb} {counts['moved']} proof file(s); {counts['current']} already in place, "
+        f"{counts['missing']} missing, {counts['invalid']} invalid."
+    )
+
+
+@ots_cli.command("compact")
+@click.option("--min-dead-ratio", type=float, default=0.0,
+              help="Only compact when at least this share of segment bytes is dead (default: always).")
+def compact_command(min_dead_ratio):
+    """
+    Rewrite packed proof segments without the proofs superseded by upgrades.
+    """
+    if current_app.config["OTS_STORAGE"] != "packed":
+        click.echo("Proofs are stored as files (OTS_STORAGE=files): nothing to compact.")
+        return
+
+    stats = compact_proofs(min_dead_ratio)
+    if not stats:
+        click.echo("Nothing to compact.")
+        return
+    click.echo(
+        f"Compacted {stats['segments']} segment(s) holding {stats['proofs']} proof(s); "
+        f"{stats['reclaimed_bytes']} byte(s) reclaimed."
+    )
@@ -8,6 +8,7 @@ from flask import jsonify
 from marshmallow import ValidationError
 from app.schemas.login_schema import LoginSchema
 from app.services.auth_service import authenticate_user
+from app.utils.security import PasswordHasherBusy
 
 def user_login(data):
     """
@@ -21,6 +22,7 @@ def user_login(data):
                   - 200 and {'access_token': token, 'user': {...}} on success.
                   - 401 with an error message for invalid credentials.
                   - 400 with validation error details.
+                  - 503 with a Retry-After header when password hashing is saturated.
                   - 500 with a generic error message for unexpected exceptions.
     """
     try:
@@ -51,6 +53,12 @@ def user_login(data):
         # Input data did not pass schema validation
         return jsonify({"errors": ve.messages}), 400
 
+    except PasswordHasherBusy as busy:
+        # Password hashing pool saturated: shed load and ask the client to retry
+        response = jsonify({"error": str(busy)})
+        response.headers["Retry-After"] = str(busy.retry_after)
+        return response, 503
+
     except Exception as e:
         # Catch-all for unexpected errors
         return jsonify({"error": str(e)}), 500
@@ -6,28 +6,167 @@ deleting, and filtering transactions, including JWT-based user identification.
 """
 
 import os
-from flask import request, jsonify, current_app, send_from_directory
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+from flask import request, jsonify, current_app, send_from_directory, send_file, Response, stream_with_context, url_for
 from marshmallow import ValidationError
-from app.schemas.transaction_schema import TransactionInputSchema
+from app.schemas.transaction_schema import (
+    TransactionInputSchema,
+    TransactionBatchSchema,
+    TransactionSearchSchema,
+    TransactionVerifySchema,
+    TransactionVerifyBatchSchema,
+    ProofLinksSchema,
+    ProofArchiveSchema
+)
 from app.services.transaction_service import (
     create_entry_transaction,
     create_exit_transaction,
+    create_batch_transactions,
     get_all_transactions_service,
     get_transactions_by_product,
     delete_transaction_by_id,
     get_transaction_by_id,
     get_transactions_by_user,
-    get_ots_file_by_transaction_id
+    search_transactions,
+    stream_transactions,
+    get_ots_file_by_transaction_id,
+    read_ots_file,
+    issue_proof_links
+)
+from app.services.archive_service import stream_proof_archive
+from app.services.idempotency_service import (
+    IdempotencyConflict,
+    fingerprint_request,
+    find_idempotent_response
+)
+from app.services.verification_service import (
+    verify_transaction_proof,
+    verify_proof_file,
+    find_verification_targets,
+    verify_transactions_batch
 )
-from app.utils.formatters import format_transaction
-import jwt
+from app.utils.formatters import format_transaction, format_transaction_row, format_batch_results
+from app.utils.pagination import parse_page_args
+from app.utils.export import EXPORT_MIMETYPES, stream_export, stream_ndjson
+from app.utils.signed_urls import check_proof_link
+from app.auth.tokens import current_claims
+
+
+def _page_args():
+    """
+    Read the pagination parameters of the current request.
+
+    Returns:
+        tuple(int, tuple or None): The page size and the decoded cursor, if any.
+
+    Raises:
+        ValueError: If 'limit' or 'cursor' is invalid.
+    """
+    return parse_page_args(
+        request.args,
+        current_app.config["TRANSACTIONS_PAGE_DEFAULT_LIMIT"],
+        current_app.config["TRANSACTIONS_PAGE_MAX_LIMIT"]
+    )
+
+
+def _export_response(export_format: str, product_id: int = None, user_id: int = None):
+    """
+    Stream every matching transaction instead of a single page.
+
+    The ledger is read through a server-side cursor and serialized row by row,
+    so memory use stays flat and the first bytes are sent right away.
+
+    Args:
+        export_format (str): 'ndjson' or 'json'.
+        product_id (int, optional): ID of the product to filter transactions.
+        user_id (int, optional): ID of the user whose transactions to export.
+
+    Returns:
+        Response: Streamed export with HTTP 200.
+
+    Raises:
+        ValueError: If the export format is not supported.
+    """
+    transactions = stream_transactions(
+        current_app.config["TRANSACTIONS_EXPORT_BATCH_SIZE"],
+        product_id=product_id,
+        user_id=user_id
+    )
+    chunks = stream_export((format_transaction_row(t) for t in transactions), export_format)
+    # Keep the app context, and with it the database session, open while streaming
+    return Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[export_format]), 200
+
+
+def _page_response(transactions, next_cursor):
+    """
+    Build the JSON envelope of a page of transactions.
+
+    Args:
+        transactions (list[Row]): Transaction rows of the page.
+        next_cursor (str or None): Cursor of the next page, None on the last page.
+
+    Returns:
+        Response: JSON page with HTTP 200.
+    """
+    return jsonify({
+        "items": [format_transaction_row(t) for t in transactions],
+        "next_cursor": next_cursor
+    }), 200
+
+
+def _idempotency_scope(user_id: int):
+    """
+    Read the Idempotency-Key header of a transaction-creating request and look the key up.
+
+    Args:
+        user_id (int): User sending the request; keys are scoped per user.
+
+    Returns:
+        tuple: (idempotency, response). 'idempotency' is passed to the service, or None
+               without the header. 'response' is set when the request must not be processed:
+               the replayed response of a completed request, or an error.
+    """
+    key = request.headers.get("Idempotency-Key")
+    if key is None:
+        return None, None
+    if not key or len(key) > 255:
+        return None, (jsonify({"errors": {"Idempotency-Key": ["Must be 1 to 255 characters."]}}), 400)
+
+    request_hash = fingerprint_request(request.method, request.full_path, request.get_data())
+    found = find_idempotent_response(user_id, key, request_hash)
+    if found is None:
+        return {"key": key, "request_hash": request_hash, "ttl": current_app.config["IDEMPOTENCY_KEY_TTL"]}, None
+    if found["state"] == "mismatch":
+        return None, (jsonify({"error": "This Idempotency-Key was already used for a different request."}), 422)
+
+    # Completed: replay the stored response as it was sent
+    response = current_app.response_class(found["body"], status=found["status"], mimetype="application/json")
+    response.headers["Idempotent-Replayed"] = "true"
+    return None, response
+
+
+def _created_response(idempotency: dict, body, status: int):
+    """
+    Build the response of a transaction-creating request.
+
+    With an Idempotency-Key, the body stored with the movement is sent, so the
+    first response and its replays are identical.
+
+    Returns:
+        tuple: (Response, status).
+    """
+    if idempotency:
+        return current_app.response_class(idempotency["response"], mimetype="application/json"), status
+    return jsonify(body), status
 
 
 def create_entry_controller():
     """
     Create an entry transaction for a product.
 
-    Validates input data, decodes JWT to obtain user info,
+    Validates input data, reads user info from the verified token claims,
     and delegates transaction creation to the service layer.
 
     Returns:
@@ -38,42 +177,33 @@ def create_entry_controller():
         # Validate and deserialize request JSON using TransactionInputSchema
         data = TransactionInputSchema().load(request.json)
 
-        # Retrieve JWT from Authorization header and strip 'Bearer ' prefix
-        token = request.headers.get('Authorization', '').replace('Bearer ', '')
-        if not token:
-            return jsonify({"error": "Token not provided"}), 401
-
-        try:
-            # Decode JWT to extract user ID and email
-            payload = jwt.decode(
-                token,
-                current_app.config["SECRET_KEY"],
-                algorithms=["HS256"]
-            )
-            user_id = payload["user_id"]
-            user_email = payload["email"]
-
-        except jwt.ExpiredSignatureError:
-            # JWT has expired
-            return jsonify({"error": "Token expired"}), 401
-        except jwt.InvalidTokenError:
-            # JWT is invalid
-            return jsonify({"error": "Invalid token"}), 401
+        # User identity from the token verified by permission_required
+        claims = current_claims()
+        user_id = claims["user_id"]
+
+        # A retried request replays its stored response instead of being applied again
+        idempotency, replay = _idempotency_scope(user_id)
+        if replay is not None:
+            return replay
 
         # Create entry transaction with user context
         transaction = create_entry_transaction(
             data,
             user_id=user_id,
-            user_email=user_email
+            idempotency=idempotency
         )
 
         # Format and return transaction with 201 status
-        return jsonify(format_transaction(transaction)), 201
+        return _created_response(idempotency, format_transaction(transaction), 201)
 
     except ValidationError as ve:
         # Schema validation errors
         return jsonify({"errors": ve.messages}), 400
 
+    except IdempotencyConflict as ic:
+        # A concurrent request with the same Idempotency-Key committed first
+        return jsonify({"error": str(ic)}), 409
+
     except ValueError as ve:
         # Domain errors from service layer (e.g., invalid product)
         return jsonify({"error": str(ve)}), 404
@@ -87,7 +217,7 @@ def create_exit_controller():
     """
     Create an exit transaction for a product.
 
-    Validates input data, decodes JWT to obtain user info,
+    Validates input data, reads user info from the verified token claims,
     and delegates transaction creation to the service layer.
 
     Returns:
@@ -98,40 +228,31 @@ def create_exit_controller():
         # Validate and deserialize request JSON using TransactionInputSchema
         data = TransactionInputSchema().load(request.json)
 
-        # Retrieve JWT from Authorization header and strip 'Bearer ' prefix
-        token = request.headers.get('Authorization', '').replace('Bearer ', '')
-        if not token:
-            return jsonify({"error": "Token not provided"}), 401
-
-        try:
-            # Decode JWT to extract user ID and email
-            payload = jwt.decode(
-                token,
-                current_app.config["SECRET_KEY"],
-                algorithms=["HS256"]
-            )
-            user_id = payload["user_id"]
-            user_email = payload["email"]
-        except jwt.ExpiredSignatureError:
-            # JWT has expired
-            return jsonify({"error": "Token expired"}), 401
-        except jwt.InvalidTokenError:
-            # JWT is invalid
-            return jsonify({"error": "Invalid token"}), 401
+        # User identity from the token verified by permission_required
+        claims = current_claims()
+        user_id = claims["user_id"]
+
+        # A retried request replays its stored response instead of being applied again
+        idempotency, replay = _idempotency_scope(user_id)
+        if replay is not None:
+            return replay
 
         # Create exit transaction with user context
         transaction = create_exit_transaction(
             data,
-            user_email,
-            user_id
+            user_id=user_id,
+            idempotency=idempotency
         )
 
         # Format and return transaction with 201 status
-        return jsonify(format_transaction(transaction)), 201
+        return _created_response(idempotency, format_transaction(transaction), 201)
 
     except ValidationError as ve:
         # Schema validation errors
         return jsonify({"errors": ve.messages}), 400
+    except IdempotencyConflict as ic:
+        # A concurrent request with the same Idempotency-Key committed first
+        return jsonify({"error": str(ic)}), 409
     except ValueError as ve:
         # Domain errors from service layer (e.g., invalid product)
         return jsonify({"error": str(ve)}), 404
@@ -140,19 +261,87 @@ def create_exit_controller():
         return jsonify({"error": str(e)}), 500
 
 
+def create_batch_controller():
+    """
+    Create a batch of entry and exit transactions in one database transaction.
+
+    Validates the batch payload, reads user info from the verified token claims,
+    and delegates batch processing to the service layer.
+
+    Returns:
+        Response: JSON with per-item results and HTTP 201 if every item was created,
+                  HTTP 207 if some best-effort items failed, HTTP 409 if an atomic
+                  batch was rejected, or error messages with appropriate HTTP status.
+    """
+    try:
+        # Validate and deserialize request JSON using TransactionBatchSchema
+        data = TransactionBatchSchema().load(request.json)
+
+        # Bound the work a single request can trigger
+        max_items = current_app.config["TRANSACTION_BATCH_MAX_ITEMS"]
+        if len(data["items"]) > max_items:
+            return jsonify({"errors": {"items": [f"A batch accepts at most {max_items} items."]}}), 400
+
+        # User identity from the token verified by permission_required
+        claims = current_claims()
+        user_id = claims["user_id"]
+
+        # A retried request replays its stored response instead of being applied again
+        idempotency, replay = _idempotency_scope(user_id)
+        if replay is not None:
+            return replay
+
+        # Apply the whole batch with user context
+        results = create_batch_transactions(
+            data["items"],
+            user_id=user_id,
+            mode=data["mode"],
+            idempotency=idempotency
+        )
+
+        return _created_response(idempotency, *format_batch_results(data["mode"], results))
+
+    except ValidationError as ve:
+        # Schema validation errors
+        return jsonify({"errors": ve.messages}), 400
+    except IdempotencyConflict as ic:
+        # A concurrent request with the same Idempotency-Key committed first
+        return jsonify({"error": str(ic)}), 409
+    except ValueError as ve:
+        # Atomic batch rejected (e.g., missing product or insufficient stock)
+        return jsonify({"error": str(ve)}), 409
+    except Exception as e:
+        # Unexpected server error
+        return jsonify({"error": str(e)}), 500
+
+
 def get_all_transactions_controller():
     """
-    Retrieve all transactions.
+    Retrieve a page of transactions.
+
+    Query parameters:
+        limit (int, optional): Page size, up to TRANSACTIONS_PAGE_MAX_LIMIT.
+        cursor (str, optional): 'next_cursor' returned with the previous page.
+        format (str, optional): 'ndjson' or 'json' to stream every transaction instead of a page.
 
     Returns:
-        Response: JSON list of formatted transactions with HTTP 200,
-                  or error message with HTTP 500.
+        Response: JSON page of formatted transactions (or a streamed export) with HTTP 200,
+                  HTTP 400 on invalid pagination or export parameters, or HTTP 500 on error.
     """
     try:
-        # Fetch all transactions via service layer
-        transactions = get_all_transactions_service()
-        # Format and return list of transactions
-        return jsonify([format_transaction(t) for t in transactions]), 200
+        export_format = request.args.get("format")
+        if export_format:
+            # Full ledger export, streamed instead of paginated
+            return _export_response(export_format)
+
+        limit, after = _page_args()
+        # Fetch one page of transactions via service layer
+        transactions, next_cursor = get_all_transactions_service(limit, after)
+        # Format and return the page with the cursor of the next one
+        return _page_response(transactions, next_cursor)
+    except ValueError as ve:
+        # Invalid limit, cursor or export format
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         # Unexpected server error
         return jsonify({"error": str(e)}), 500
@@ -160,25 +349,72 @@ def get_all_transactions_controller():
 
 def get_transactions_by_product_controller(product_id):
     """
-    Retrieve transactions filtered by product ID.
+    Retrieve a page of transactions filtered by product ID.
 
     Args:
         product_id (int): ID of the product to filter transactions.
 
+    Query parameters:
+        limit (int, optional): Page size, up to TRANSACTIONS_PAGE_MAX_LIMIT.
+        cursor (str, optional): 'next_cursor' returned with the previous page.
+        format (str, optional): 'ndjson' or 'json' to stream every transaction instead of a page.
+
     Returns:
-        Response: JSON list of transactions with HTTP 200,
+        Response: JSON page of transactions (or a streamed export) with HTTP 200,
+                  HTTP 400 on invalid pagination or export parameters,
                   HTTP 404 if none found, or HTTP 500 on error.
     """
     try:
-        transactions = get_transactions_by_product(product_id)
+        export_format = request.args.get("format")
+        if export_format:
+            # Full export of the product's transactions, streamed instead of paginated
+            return _export_response(export_format, product_id=product_id)
 
-        if not transactions:
+        limit, after = _page_args()
+        transactions, next_cursor = get_transactions_by_product(product_id, limit, after)
+
+        if not transactions and after is None:
             # No transactions for the specified product
             return jsonify({"message": "No transactions found for this product"}), 404
 
-        formatted = [format_transaction(t) for t in transactions]
-        return jsonify(formatted), 200
+        return _page_response(transactions, next_cursor)
+
+    except ValueError as ve:
+        # Invalid limit, cursor or export format
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        # Unexpected server error
+        return jsonify({"error": str(e)}), 500
+
+
+def search_transactions_controller():
+    """
+    Search transactions by any combination of product, user, type, time and quantity.
+
+    Query parameters:
+        product_id, user_id, type, from, to, min_quantity, max_quantity: Filters,
+            validated by TransactionSearchSchema.
+        limit (int, optional): Page size, up to TRANSACTIONS_PAGE_MAX_LIMIT.
+        cursor (str, optional): 'next_cursor' returned with the previous page.
+
+    Returns:
+        Response: JSON page of matching transactions with HTTP 200,
+                  HTTP 400 on invalid filters or pagination parameters, or HTTP 500 on error.
+    """
+    try:
+        # Validate filters; limit and cursor are excluded by the schema
+        filters = TransactionSearchSchema().load(request.args)
+        limit, after = _page_args()
 
+        transactions, next_cursor = search_transactions(filters, limit, after)
+        return _page_response(transactions, next_cursor)
+
+    except ValidationError as ve:
+        # Invalid filter values
+        return jsonify({"errors": ve.messages}), 400
+    except ValueError as ve:
+        # Invalid limit or cursor
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         # Unexpected server error
         return jsonify({"error": str(e)}), 500
@@ -192,11 +428,15 @@ def delete_transaction_controller(id: int):
         id (int): Identifier of the transaction to delete.
 
     Returns:
-        Response: Success message with HTTP 200 if deleted,
-                  or error message with HTTP 404.
+        Response: Success message with HTTP 200 if deleted, error message with
+                  HTTP 404 if not found, or HTTP 409 if the transaction is chained.
     """
     # Attempt deletion via service layer
-    success = delete_transaction_by_id(id)
+    try:
+        success = delete_transaction_by_id(id)
+    except ValueError as ve:
+        # Chained transactions are immutable
+        return jsonify({"error": str(ve)}), 409
     if success:
         return jsonify({"message": "Transaction deleted successfully"}), 200
     # Transaction not found in data store
@@ -227,90 +467,331 @@ def get_transaction_by_id_controller(transaction_id):
 
 def get_transactions_by_user_controller():
     """
-    Retrieve transactions for the authenticated user.
+    Retrieve a page of transactions for the authenticated user.
+
+    Takes the user ID from the verified token claims and fetches their transactions.
 
-    Extracts user ID from JWT and fetches their transactions.
+    Query parameters:
+        limit (int, optional): Page size, up to TRANSACTIONS_PAGE_MAX_LIMIT.
+        cursor (str, optional): 'next_cursor' returned with the previous page.
+        format (str, optional): 'ndjson' or 'json' to stream every transaction instead of a page.
 
     Returns:
-        Response: JSON list of user's transactions with HTTP 200,
-                  HTTP 404 if none found, or HTTP 401/500 on error.
+        Response: JSON page of user's transactions (or a streamed export) with HTTP 200,
+                  HTTP 400 on invalid pagination or export parameters,
+                  HTTP 404 if none found, or HTTP 500 on error.
     """
     try:
-        # Retrieve JWT from Authorization header
-        token = request.headers.get('Authorization', '').replace('Bearer ', '')
-        if not token:
-            return jsonify({"error": "Token not provided"}), 401
-
-        try:
-            # Decode JWT to extract user ID
-            payload = jwt.decode(
-                token,
-                current_app.config["SECRET_KEY"],
-                algorithms=["HS256"]
-            )
-            user_id = payload["user_id"]
-        except jwt.ExpiredSignatureError:
-            # JWT has expired
-            return jsonify({"error": "Token expired"}), 401
-        except jwt.InvalidTokenError:
-            # JWT is invalid
-            return jsonify({"error": "Invalid token"}), 401
-
-        # Fetch transactions for the authenticated user
-        transactions = get_transactions_by_user(user_id)
-
-        if not transactions:
+        # User identity from the token verified by permission_required
+        user_id = current_claims()["user_id"]
+
+        export_format = request.args.get("format")
+        if export_format:
+            # Full export of the user's transactions, streamed instead of paginated
+            return _export_response(export_format, user_id=user_id)
+
+        limit, after = _page_args()
+
+        # Fetch a page of transactions for the authenticated user
+        transactions, next_cursor = get_transactions_by_user(user_id, limit, after)
+
+        if not transactions and after is None:
             # No transactions for this user
             return jsonify({"message": "No transactions found for this user"}), 404
 
-        formatted = [format_transaction(t) for t in transactions]
-        return jsonify(formatted), 200
+        return _page_response(transactions, next_cursor)
 
+    except ValueError as ve:
+        # Invalid limit, cursor or export format
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         # Unexpected server error
         return jsonify({"error": str(e)}), 500
 
 def verify_transaction_controller():
-    from flask import request, jsonify
-    from app.utils.ots_handler import verify_ots_file
+    """
+    Verify an OpenTimestamps proof, by transaction ID or by .ots file name.
 
-    data = request.get_json()
-    filename = data.get("ots_filename")
+    A 'transaction_id' also checks the Merkle inclusion path of batched transactions;
+    an 'ots_filename' verifies that proof file as is. Confirmed and recently
+    checked proofs are answered from the verification cache.
 
-    if not filename:
-        return jsonify({"error": "ots_filename is required"}), 400
+    Returns:
+        Response: JSON verification result with HTTP 200 on success,
+                  or error details with HTTP 400 (including a missing or malformed body).
+    """
+    try:
+        # A missing or non-JSON body loads as None and fails validation
+        data = TransactionVerifySchema().load(request.get_json(silent=True))
+    except ValidationError as ve:
+        return jsonify({"errors": ve.messages}), 400
 
-    result = verify_ots_file(filename)
+    if "transaction_id" in data:
+        result = verify_transaction_proof(data["transaction_id"])
+    else:
+        result = verify_proof_file(data["ots_filename"])
 
     if result.get("success"):
         return jsonify({
             "message": "Hash verified successfully",
+            "status": result.get("status"),
+            "block_height": result.get("block_height"),
+            "attested_at": result.get("attested_at"),
             "details": result.get("output", "")
         }), 200
     else:
         return jsonify({
             "message": result.get("message", "Verification failed."),
+            "status": result.get("status", "failed"),
             "details": result.get("output", "No additional info.")
         }), 400
 
+def verify_batch_controller():
+    """
+    Verify the proofs of many transactions, streaming one NDJSON line per transaction.
+
+    Transactions are selected by 'transaction_ids' or by a 'from'/'to' creation range.
+    Lines are written in completion order as proofs are verified.
+
+    Returns:
+        Response: Streamed NDJSON results with HTTP 200,
+                  or error messages with HTTP 400.
+    """
+    try:
+        data = TransactionVerifyBatchSchema().load(request.json)
+    except ValidationError as ve:
+        return jsonify({"errors": ve.messages}), 400
+
+    # Bound the work a single request can trigger
+    max_items = current_app.config["TRANSACTION_VERIFY_BATCH_MAX_ITEMS"]
+    transaction_ids = data.get("transaction_ids")
+    if transaction_ids is not None and len(set(transaction_ids)) > max_items:
+        return jsonify({"errors": {"transaction_ids": [f"A batch verifies at most {max_items} transactions."]}}), 400
+
+    targets, missing = find_verification_targets(
+        transaction_ids=sorted(set(transaction_ids)) if transaction_ids is not None else None,
+        date_from=data.get("date_from"),
+        date_to=data.get("date_to"),
+        limit=max_items + 1
+    )
+    if len(targets) > max_items:
+        return jsonify({"errors": {"from": [f"A batch verifies at most {max_items} transactions; narrow the range."]}}), 400
+
+    results = verify_transactions_batch(targets, missing, current_app.config["OTS_VERIFY_WORKERS"])
+    # Keep the app context, and with it the database session, open while streaming
+    return Response(stream_with_context(stream_ndjson(results)), mimetype=EXPORT_MIMETYPES["ndjson"]), 200
+
+def _proof_cache_headers(response, proof: dict):
+    """
+    Set the validator and caching policy of a proof download.
+
+    Upgraded proofs never change again and may be cached for OTS_DOWNLOAD_MAX_AGE
+    seconds; stamped proofs change once upgraded, so clients revalidate them every time.
+    Proofs need a token to download, so only the client may cache them.
+    """
+    response.set_etag(proof["etag"])
+    if proof["final"]:
+        response.headers["Cache-Control"] = f"private, max-age={current_app.config['OTS_DOWNLOAD_MAX_AGE']}"
+    else:
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+def _offload_response(proof: dict, file_path: str):
+    """
+    Let the front proxy send a proof file (OTS_DOWNLOAD_OFFLOAD), instead of a worker.
+
+    Args:
+        proof (dict): Proof metadata from get_ots_file_by_transaction_id.
+        file_path (str): Absolute path of the proof file.
+
+    Returns:
+        Response or None: An empty response carrying the proxy header, or None when offloading is off.
+    """
+    offload = current_app.config["OTS_DOWNLOAD_OFFLOAD"]
+    if offload == "x-sendfile":
+        header, value = "X-Sendfile", file_path
+    elif offload == "x-accel-redirect":
+        header, value = "X-Accel-Redirect", current_app.config["OTS_DOWNLOAD_ACCEL_PREFIX"].rstrip("/") + "/" + proof["ots_filename"]
+    else:
+        return None
+
+    # The proxy streams the file, and answers Range requests, from the header
+    response = current_app.response_class(mimetype="application/octet-stream")
+    response.headers[header] = value
+    response.headers.set("Content-Disposition", "attachment", filename=proof["filename"])
+    return response
+
 def download_ots_controller(transaction_id: int):
     """
     Controller to return the .ots file for a given transaction ID.
     Handles response formatting and errors.
 
+    Downloads carry a strong ETag: a matching If-None-Match is answered with 304
+    before the proof is read, and Range requests are served partially.
+
     Args:
         transaction_id (int): ID of the transaction.
 
     Returns:
         Response: OTS file or error JSON.
     """
-    result = get_ots_file_by_transaction_id(transaction_id)
+    proof = get_ots_file_by_transaction_id(transaction_id)
+
+    if not proof["success"]:
+        return jsonify({"error": proof["message"]}), 404
+
+    # The client already holds this version of the proof
+    if request.if_none_match.contains(proof["etag"]):
+        return _proof_cache_headers(current_app.response_class(status=304), proof)
 
+    result = read_ots_file(proof)
     if not result["success"]:
         return jsonify({"error": result["message"]}), 404
 
-    return send_from_directory(
-        directory=os.path.abspath(result["directory"]),
-        path=result["filename"],
-        as_attachment=True
+    return _proof_cache_headers(_send_proof(proof, result, proof["etag"]), proof)
+
+def _send_proof(proof: dict, result: dict, etag=True):
+    """
+    Build the response sending a proof located or loaded by read_ots_file.
+
+    Args:
+        proof (dict): Proof metadata, with 'ots_filename' and the download 'filename'.
+        result (dict): read_ots_file result, with 'content' or 'directory'/'path'.
+        etag (str or bool, optional): ETag to send, or True to derive one from the file.
+
+    Returns:
+        Response: The proof, answering Range and conditional requests.
+    """
+    # Proofs served from memory (Merkle-batched transactions, packed storage)
+    if "content" in result:
+        return send_file(
+            BytesIO(result["content"]),
+            mimetype="application/octet-stream",
+            as_attachment=True,
+            download_name=proof["filename"],
+            etag=etag
+        )
+
+    directory = os.path.abspath(result["directory"])
+    response = _offload_response(proof, os.path.join(directory, result["path"]))
+    if response is None:
+        response = send_from_directory(
+            directory=directory,
+            path=result["path"],
+            as_attachment=True,
+            download_name=proof["filename"],
+            etag=etag
+        )
+    return response
+
+def proof_links_controller():
+    """
+    Issue signed, expiring download links for the proofs of several transactions.
+
+    Links are valid for OTS_LINK_TTL seconds and need no token: anyone holding
+    one can download that proof until it expires.
+
+    Returns:
+        Response: JSON with 'expires_at', 'links' and per-transaction 'errors' and HTTP 200,
+                  or error messages with HTTP 400.
+    """
+    try:
+        data = ProofLinksSchema().load(request.json)
+    except ValidationError as ve:
+        return jsonify({"errors": ve.messages}), 400
+
+    transaction_ids = list(dict.fromkeys(data["transaction_ids"]))
+    max_items = current_app.config["OTS_LINK_MAX_ITEMS"]
+    if len(transaction_ids) > max_items:
+        return jsonify({"errors": {"transaction_ids": [f"At most {max_items} links can be issued at once."]}}), 400
+
+    expires, links, errors = issue_proof_links(
+        transaction_ids,
+        current_app.config["OTS_LINK_SECRET"],
+        current_app.config["OTS_LINK_TTL"]
+    )
+
+    return jsonify({
+        "expires_at": datetime.fromtimestamp(expires, timezone.utc).isoformat(),
+        "links": [
+            {
+                "transaction_id": link["transaction_id"],
+                "url": url_for(
+                    "transaction.signed_proof_download",
+                    ots_filename=link["ots_filename"],
+                    tx=link["transaction_id"],
+                    merkle=link["merkle_proof"],
+                    expires=expires,
+                    sig=link["signature"],
+                    _external=True
+                )
+            }
+            for link in links
+        ],
+        "errors": errors
+    }), 200
+
+def proof_archive_controller():
+    """
+    Stream a ZIP archive of the proofs of a product and/or a creation time range.
+
+    The archive is built while it is sent, from a server-side cursor over the
+    transactions, with a manifest.csv listing every selected transaction.
+
+    Returns:
+        Response: Streamed ZIP with HTTP 200, or error messages with HTTP 400.
+    """
+    try:
+        data = ProofArchiveSchema().load(request.args)
+    except ValidationError as ve:
+        return jsonify({"errors": ve.messages}), 400
+
+    chunks = stream_proof_archive(
+        current_app.config["TRANSACTIONS_EXPORT_BATCH_SIZE"],
+        date_from=data.get("date_from"),
+        date_to=data.get("date_to"),
+        product_id=data.get("product_id")
     )
+    # Keep the app context, and with it the database session, open while streaming
+    response = Response(stream_with_context(chunks), mimetype="application/zip")
+    response.headers.set("Content-Disposition", "attachment", filename="proofs.zip")
+    return response, 200
+
+def signed_proof_download_controller(ots_filename: str):
+    """
+    Send a proof through a signed link issued by proof_links_controller.
+
+    The link is checked against its signature and expiry only: no token is
+    decoded and the database is not queried.
+
+    Args:
+        ots_filename (str): Name of the proof in the proof store, from the URL path.
+
+    Returns:
+        Response: The .ots file, 403 if the link is invalid or expired, or 404 if the proof is missing.
+    """
+    try:
+        transaction_id = int(request.args["tx"])
+        expires = int(request.args["expires"])
+    except (KeyError, ValueError):
+        return jsonify({"error": "Invalid or expired link"}), 403
+
+    merkle_proof = request.args.get("merkle") or None
+    if not check_proof_link(current_app.config["OTS_LINK_SECRET"], ots_filename, transaction_id,
+                            merkle_proof, expires, request.args.get("sig")):
+        return jsonify({"error": "Invalid or expired link"}), 403
+
+    proof = {
+        "ots_filename": ots_filename,
+        "merkle_proof": merkle_proof,
+        "filename": f"transaction_{transaction_id}.ots"
+    }
+    result = read_ots_file(proof)
+    if not result["success"]:
+        return jsonify({"error": result["message"]}), 404
+
+    response = _send_proof(proof, result)
+    # The link itself expires: never let a cache keep the proof longer than that
+    max_age = max(0, int(expires - time.time()))
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    return response
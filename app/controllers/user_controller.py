@@ -5,8 +5,7 @@ Defines CRUD controller functions for user resources, handling HTTP requests,
 validating input, invoking service layer operations, and formatting responses.
 """
 
-from flask import request, jsonify, current_app
-import jwt
+from flask import request, jsonify
 from app.schemas.user_schema import UserInputSchema, UserUpdateSchema
 from app.services.user_service import (
     create_user_service,
@@ -15,7 +14,9 @@ from app.services.user_service import (
     update_user_service,
     delete_user_service
 )
-from app.utils.formatters import format_user
+from app.utils.formatters import format_user, format_user_row
+from app.auth.tokens import current_claims
+from app.utils.security import PasswordHasherBusy
 from marshmallow import ValidationError
 
 
@@ -28,7 +29,8 @@ def create_user_controller():
 
     Returns:
         Response: JSON-formatted created user with HTTP 201 on success,
-                  or error messages with HTTP 400/409/500 on failure.
+                  or error messages with HTTP 400/409/500 on failure
+                  (HTTP 503 with Retry-After when password hashing is saturated).
     """
     try:
         # Validate and deserialize request JSON using UserInputSchema
@@ -48,6 +50,12 @@ def create_user_controller():
         # Conflict errors from service layer (e.g., duplicate email)
         return jsonify({"error": str(ve)}), 409
 
+    except PasswordHasherBusy as busy:
+        # Password hashing pool saturated: shed load and ask the client to retry
+        response = jsonify({"error": str(busy)})
+        response.headers["Retry-After"] = str(busy.retry_after)
+        return response, 503
+
     except Exception as e:
         # Unexpected server error
         return jsonify({"error": str(e)}), 500
@@ -66,7 +74,7 @@ def get_all_users_controller():
         users = get_all_users_service()
 
         # Format and return list of users
-        return jsonify([format_user(user) for user in users]), 200
+        return jsonify([format_user_row(user) for user in users]), 200
 
     except Exception as e:
         # Unexpected server error
@@ -113,7 +121,8 @@ def update_user_controller(id):
 
     Returns:
         Response: JSON-formatted updated user with HTTP 200 on success,
-                  or error messages with HTTP 400/404/500 on failure.
+                  or error messages with HTTP 400/404/500 on failure
+                  (HTTP 503 with Retry-After when password hashing is saturated).
     """
     try:
         # Validate and deserialize request JSON using UserUpdateSchema
@@ -131,6 +140,11 @@ def update_user_controller(id):
     except ValueError as ve:
         # Service layer error when user not found
         return jsonify({"error": str(ve)}), 404
+    except PasswordHasherBusy as busy:
+        # Password hashing pool saturated: shed load and ask the client to retry
+        response = jsonify({"error": str(busy)})
+        response.headers["Retry-After"] = str(busy.retry_after)
+        return response, 503
     except Exception as e:
         # Unexpected server error
         return jsonify({"error": str(e)}), 500
@@ -148,24 +162,9 @@ def delete_user_controller(id):
                   or error messages with HTTP 400/404/500 on failure.
     """
     try:
+        # Identity of the requesting admin, from the token verified by permission_required
+        current_user_id = current_claims()["user_id"]
 
-        token = request.headers.get("Authorization", "").replace("Bearer ", "")
-        if not token:
-            return jsonify({"error": "Token not provided"}), 401
-
-        try:
-            payload = jwt.decode(
-                token,
-                current_app.config["SECRET_KEY"],
-                algorithms=["HS256"]
-            )
-            current_user_id = payload["user_id"]
-
-        except jwt.ExpiredSignatureError:
-            return jsonify({"error": "Token expired"}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({"error": "Invalid token"}), 401
-        
         if id == current_user_id:
             return jsonify({"error": "Admin cannot delete their own account"}), 403
 
@@ -0,0 +1,58 @@
+"""
+Unit of work module.
+
+Provides a session scope in which repositories only stage their changes
+(flush), while the service layer commits them once at the end, or rolls
+all of them back if anything fails. Savepoints let a unit of work discard
+part of its changes without abandoning the rest.
+"""
+
+from contextlib import contextmanager
+from app.infraDB.config.connection import db
+
+# Session.info key tracking how many unit_of_work scopes are currently open
+_DEPTH_KEY = "unit_of_work_depth"
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Open a unit of work on the current database session.
+
+    Scopes can be nested: inner scopes join the outermost one, which alone
+    commits on success or rolls back on any exception.
+
+    Yields:
+        Session: The SQLAlchemy session the repositories write to.
+    """
+    session = db.session()
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+
+    try:
+        yield session
+        # Only the outermost scope ends the database transaction
+        if depth == 0:
+            session.commit()
+    except Exception:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
+
+
+@contextmanager
+def savepoint():
+    """
+    Open a SAVEPOINT inside the current unit of work.
+
+    On exception, only the changes made inside the savepoint are rolled back
+    and the exception is re-raised; the enclosing unit of work stays usable.
+
+    Yields:
+        Session: The SQLAlchemy session the repositories write to.
+    """
+    session = db.session()
+    with session.begin_nested():
+        yield session
@@ -1,3 +1,5 @@
 from app.infraDB.models.products import Products
 from app.infraDB.models.users import Users
-from app.infraDB.models.transactions import Transactions
\ No newline at end of file
+from app.infraDB.models.transactions import Transactions
+from app.infraDB.models.ledger import LedgerHead, LedgerCheckpoint
+from app.infraDB.models.idempotency import IdempotencyKey
@@ -0,0 +1,47 @@
+"""
+Idempotency model module.
+
+Defines the SQLAlchemy model recording the Idempotency-Key of transaction-creating
+requests, so a retried request replays the stored response instead of changing
+stock a second time.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime, timezone
+from app.infraDB.config.connection import db
+
+
+class IdempotencyKey(db.Model):
+    """
+    SQLAlchemy model for an Idempotency-Key used by a transaction-creating request.
+
+    The row and the response it replays are written in the same database
+    transaction as the stock change.
+
+    Attributes:
+        id (int): Primary key, auto-incremented identifier.
+        user_id (int): User who sent the request; keys are scoped per user.
+        key (str): Value of the Idempotency-Key header.
+        request_hash (str): SHA256 of the request's method, path and body, to reject
+            the key being reused for a different request.
+        response_status (int): HTTP status of the stored response (set before the row commits).
+        response_body (str): JSON body of the stored response.
+        created_at (datetime): UTC timestamp of the first request.
+        expires_at (datetime): UTC timestamp after which the key is forgotten.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Replay lookups (one probe per write), and rejection of concurrent duplicates
+        Index("ix_idempotency_keys_user_id_key", "user_id", "key", unique=True),
+        # TTL cleanup: expired keys
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,50 @@
+"""
+Ledger model module.
+
+Defines the SQLAlchemy models tracking the transaction hash chain: its head,
+which new transactions link to, and the checkpoints left by successful
+verifications.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime, timezone
+from app.infraDB.config.connection import db
+
+
+class LedgerHead(db.Model):
+    """
+    SQLAlchemy model for the head of the transaction hash chain (a single row).
+
+    The row is locked from the insertion of new transactions until their commit,
+    so transactions are linked one after another in ID order.
+
+    Attributes:
+        id (int): Primary key, always 1.
+        transaction_id (int): Last transaction linked into the chain; None while the ledger is empty.
+        chain_hash (str): Chain hash of that transaction, or the genesis hash.
+        updated_at (datetime): UTC timestamp of the last link.
+    """
+    __tablename__ = "ledger_head"
+
+    id = Column(Integer, primary_key=True)
+    transaction_id = Column(Integer, nullable=True)
+    chain_hash = Column(String(64), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class LedgerCheckpoint(db.Model):
+    """
+    SQLAlchemy model for a verified position of the hash chain.
+
+    Attributes:
+        id (int): Primary key, auto-incremented identifier.
+        transaction_id (int): Last transaction covered by the verification.
+        chain_hash (str): Chain hash of that transaction.
+        created_at (datetime): UTC timestamp of the verification.
+    """
+    __tablename__ = "ledger_checkpoints"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    transaction_id = Column(Integer, nullable=False)
+    chain_hash = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
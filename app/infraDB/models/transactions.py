@@ -6,7 +6,7 @@ movements of products, including relationships to products and users.
 """
 
 from enum import Enum as PyEnum
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Index
 from datetime import datetime, timezone
 from app.infraDB.config.connection import db
 from app.infraDB.models.users import Users
@@ -24,6 +24,37 @@ class TransactionType(PyEnum):
     EXIT = "exit"
 
 
+class ProofStatus(PyEnum):
+    """
+    Enumeration of OpenTimestamps proof states for a transaction.
+
+    Attributes:
+        PENDING (str): The hash is queued and has not been stamped yet.
+        STAMPED (str): The .ots proof was created and submitted to the calendars.
+        UPGRADED (str): The .ots proof was upgraded with its Bitcoin attestation and
+            can be verified without contacting the calendars.
+        FAILED (str): Stamping failed; the transaction has no proof file.
+    """
+    PENDING = "pending"
+    STAMPED = "stamped"
+    UPGRADED = "upgraded"
+    FAILED = "failed"
+
+
+class VerificationStatus(PyEnum):
+    """
+    Enumeration of OpenTimestamps verification outcomes for a transaction.
+
+    Attributes:
+        PENDING (str): The proof is not anchored in a Bitcoin block yet.
+        CONFIRMED (str): A Bitcoin block attests the hash; this never changes afterwards.
+        FAILED (str): The proof could not be verified.
+    """
+    PENDING = "pending"
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+
+
 class Transactions(db.Model):
     """
     SQLAlchemy model for transactions.
@@ -35,11 +66,41 @@ class Transactions(db.Model):
         type (TransactionType): Type of transaction ('entry' or 'exit').
         quantity (int): Quantity of product moved in this transaction.
         blockchain_hash (str): Hash string recording transaction integrity on blockchain.
+        hash_input (str): Exact input blockchain_hash is the SHA256 of, so the hash can be
+            recomputed; None for transactions recorded before it was kept.
+        chain_hash (str): Hash chaining this transaction's record to the previous
+            transaction's chain_hash (see app.utils.ledger).
         ots_filename (str): Directory where the ots file is saved.
+        proof_status (ProofStatus): State of the OpenTimestamps proof for this transaction.
+        proof_hash (str): Hex SHA256 of the stored proof's content, set when it is stamped and
+            again when it is upgraded; None for proofs stored before it was kept.
+        stamp_attempts (int): Number of stamping attempts that failed; the proof stays pending
+            and is retried until OTS_STAMP_MAX_ATTEMPTS is reached, then becomes failed.
+        next_stamp_at (datetime): Earliest time of the next stamping attempt after a failure;
+            None while the first attempt is queued.
+        merkle_proof (str): Hex-encoded inclusion proof when the hash was stamped as part of a
+            Merkle batch; ots_filename then names the batch root's proof.
+        verification_status (VerificationStatus): Outcome of the last verification, None if never verified.
+        block_height (int): Bitcoin block attesting the proof, once confirmed.
+        attested_at (datetime): Time of the attesting block, once confirmed.
+        verified_at (datetime): UTC timestamp of the verification that produced the stored status.
+        upgrade_attempts (int): Number of upgrades tried while the proof was not anchored yet.
+        next_upgrade_at (datetime): Earliest time of the next upgrade attempt; None when due now.
+        upgraded_at (datetime): UTC timestamp of the upgrade that completed the proof.
         created_at (datetime): UTC timestamp when the transaction was created.
         user (Users): Relationship to the Users model.
     """
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Keyset pagination index: listings are ordered and resumed on (created_at, id)
+        Index("ix_transactions_created_at_id", "created_at", "id"),
+        # Filtered listings and searches: equality column first, then the pagination order
+        Index("ix_transactions_product_id_created_at_id", "product_id", "created_at", "id"),
+        Index("ix_transactions_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_transactions_type_created_at_id", "type", "created_at", "id"),
+        # Upgrade worker: stamped proofs that are due for an upgrade
+        Index("ix_transactions_proof_status_next_upgrade_at", "proof_status", "next_upgrade_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
@@ -47,7 +108,21 @@ class Transactions(db.Model):
     type = Column(Enum(TransactionType, name="transactiontype", create_type=False), nullable=False)
     quantity = Column(Integer, nullable=False)
     blockchain_hash = Column(String(66), nullable=False)
+    hash_input = Column(Text, nullable=True)
+    chain_hash = Column(String(64), nullable=True)
     ots_filename = Column(String(255), nullable=True)
+    proof_status = Column(Enum(ProofStatus, name="proofstatus", create_type=False), nullable=False, default=ProofStatus.PENDING)
+    proof_hash = Column(String(64), nullable=True)
+    merkle_proof = Column(Text, nullable=True)
+    verification_status = Column(Enum(VerificationStatus, name="verificationstatus", create_type=False), nullable=True)
+    block_height = Column(Integer, nullable=True)
+    attested_at = Column(DateTime(timezone=True), nullable=True)
+    verified_at = Column(DateTime(timezone=True), nullable=True)
+    stamp_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_stamp_at = Column(DateTime(timezone=True), nullable=True)
+    upgrade_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_upgrade_at = Column(DateTime(timezone=True), nullable=True)
+    upgraded_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     # Relationship to Users model; allows accessing user who made this transaction
@@ -0,0 +1,74 @@
+"""
+Idempotency repository module.
+
+Provides database operations for the Idempotency-Key records of transaction-creating
+requests. Write methods only flush their changes; the service layer commits them
+through a unit_of_work scope.
+"""
+
+from sqlalchemy import select, delete
+from app.infraDB.models.idempotency import IdempotencyKey
+from app.infraDB.config.connection import db
+
+
+class IdempotencyRepository:
+    """
+    Repository for the IdempotencyKey model.
+
+    Methods:
+        select_key(user_id, key): Look up a user's key with one probe of the unique index.
+        insert_key(user_id, key, request_hash, expires_at): Reserve a key for a request in progress.
+        store_response(record, status, body): Record the response of a request on its key.
+        delete_key(record): Remove one key.
+        delete_expired(now): Remove every key that expired before now.
+    """
+
+    def select_key(self, user_id: int, key: str):
+        """
+        Look up a user's key, with one probe of the (user_id, key) unique index.
+
+        Returns:
+            IdempotencyKey or None: The key's record, if any.
+        """
+        return db.session.execute(
+            select(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        ).scalar_one_or_none()
+
+    def insert_key(self, user_id: int, key: str, request_hash: str, expires_at):
+        """
+        Reserve a key for a request in progress.
+
+        The flush raises IntegrityError if another request already holds the key.
+
+        Returns:
+            IdempotencyKey: The staged record, without a response.
+        """
+        record = IdempotencyKey(user_id=user_id, key=key, request_hash=request_hash, expires_at=expires_at)
+        db.session.add(record)
+        db.session.flush()
+        return record
+
+    def store_response(self, record, status: int, body: str):
+        """
+        Record the response of a request on its reserved key.
+        """
+        record.response_status = status
+        record.response_body = body
+        db.session.flush()
+
+    def delete_key(self, record):
+        """
+        Remove one key.
+        """
+        db.session.delete(record)
+        db.session.flush()
+
+    def delete_expired(self, now) -> int:
+        """
+        Remove every key that expired before now.
+
+        Returns:
+            int: Number of keys removed.
+        """
+        result = db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+        return result.rowcount
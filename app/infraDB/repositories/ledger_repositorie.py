@@ -0,0 +1,150 @@
+"""
+Ledger repository module.
+
+Provides database operations for the transaction hash chain: locking and moving
+its head, streaming the chained transactions, and recording verification
+checkpoints. Write methods only flush their changes; the service layer commits
+them through a unit_of_work scope.
+"""
+
+from sqlalchemy import select
+from app.infraDB.models.ledger import LedgerHead, LedgerCheckpoint
+from app.infraDB.models.transactions import Transactions
+from app.infraDB.config.connection import db
+from app.utils.ledger import GENESIS_HASH
+from datetime import datetime, timezone
+
+# Columns of a transaction covered by the hash chain
+_CHAIN_COLUMNS = (
+    Transactions.id,
+    Transactions.product_id,
+    Transactions.user_id,
+    Transactions.type,
+    Transactions.quantity,
+    Transactions.blockchain_hash,
+    Transactions.hash_input,
+    Transactions.created_at,
+    Transactions.chain_hash,
+)
+
+
+class LedgerRepository:
+    """
+    Repository for the LedgerHead and LedgerCheckpoint models.
+
+    Methods:
+        lock_head(): Lock the chain head for the rest of the database transaction.
+        select_head(): Read the chain head without locking it.
+        advance_head(head, transaction_id, chain_hash): Move the locked head to a newly linked transaction.
+        iter_chain(batch_size, after_id, until_id): Stream chained transactions in ID order.
+        select_chain_hash(transaction_id): Read the chain hash stored on one transaction.
+        select_last_checkpoint(): Retrieve the most recent verification checkpoint.
+        insert_checkpoint(transaction_id, chain_hash): Record a verified chain position.
+    """
+
+    def lock_head(self):
+        """
+        Lock the chain head (SELECT ... FOR UPDATE) until the database transaction ends.
+
+        Writers take it after their stock changes and just before inserting their
+        transactions, so transactions inserted while the lock is held get their IDs
+        and links in the same order and concurrent writers cannot fork the chain.
+        The head row is created if missing.
+
+        Returns:
+            LedgerHead: The locked head.
+        """
+        head = db.session.execute(
+            select(LedgerHead).where(LedgerHead.id == 1).with_for_update()
+        ).scalar_one_or_none()
+
+        if head is None:
+            head = LedgerHead(id=1, transaction_id=None, chain_hash=GENESIS_HASH)
+            db.session.add(head)
+            db.session.flush()
+
+        return head
+
+    def select_head(self):
+        """
+        Read the chain head without locking it.
+
+        Returns:
+            LedgerHead or None: The head, if any transaction was ever linked.
+        """
+        return db.session.get(LedgerHead, 1)
+
+    def advance_head(self, head, transaction_id: int, chain_hash: str):
+        """
+        Move the locked head to a newly linked transaction.
+
+        Args:
+            head (LedgerHead): Head returned by lock_head.
+            transaction_id (int): ID of the last linked transaction.
+            chain_hash (str): Its chain hash.
+        """
+        head.transaction_id = transaction_id
+        head.chain_hash = chain_hash
+        head.updated_at = datetime.now(timezone.utc)
+        db.session.flush()
+
+    def iter_chain(self, batch_size: int, after_id: int = None, until_id: int = None):
+        """
+        Stream the chained columns of transactions in ID order.
+
+        Rows are fetched through a server-side cursor in batches of batch_size.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor at a time.
+            after_id (int, optional): Only transactions with a greater ID.
+            until_id (int, optional): Only transactions with this ID or a smaller one.
+
+        Returns:
+            Iterator[Row]: Rows with the columns covered by the chain, plus hash_input and chain_hash.
+        """
+        stmt = select(*_CHAIN_COLUMNS)
+        if after_id is not None:
+            stmt = stmt.where(Transactions.id > after_id)
+        if until_id is not None:
+            stmt = stmt.where(Transactions.id <= until_id)
+
+        stmt = stmt.order_by(Transactions.id).execution_options(stream_results=True, yield_per=batch_size)
+        return db.session.execute(stmt)
+
+    def select_chain_hash(self, transaction_id: int):
+        """
+        Read the chain hash stored on one transaction.
+
+        Returns:
+            str or None: The chain hash, or None if the transaction does not exist.
+        """
+        return db.session.execute(
+            select(Transactions.chain_hash).where(Transactions.id == transaction_id)
+        ).scalar_one_or_none()
+
+    def select_last_checkpoint(self):
+        """
+        Retrieve the most recent verification checkpoint.
+
+        Returns:
+            LedgerCheckpoint or None: The checkpoint, if any verification succeeded.
+        """
+        return db.session.execute(
+            select(LedgerCheckpoint).order_by(LedgerCheckpoint.id.desc()).limit(1)
+        ).scalar_one_or_none()
+
+    def insert_checkpoint(self, transaction_id: int, chain_hash: str):
+        """
+        Record a verified chain position.
+
+        Args:
+            transaction_id (int): Last transaction covered by the verification.
+            chain_hash (str): Its chain hash.
+
+        Returns:
+            LedgerCheckpoint: The created checkpoint.
+        """
+        checkpoint = LedgerCheckpoint(transaction_id=transaction_id, chain_hash=chain_hash)
+        db.session.add(checkpoint)
+        db.session.flush()
+        return checkpoint
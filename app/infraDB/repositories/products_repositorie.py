@@ -3,12 +3,26 @@ Products repository module.
 
 Provides database operations for Products, including CRUD and stock adjustments,
 using SQLAlchemy session management.
+Write methods only flush their changes; the service layer commits them through
+a unit_of_work scope.
 """
 
+from sqlalchemy import select, update
 from app.infraDB.models.products import Products
 from app.infraDB.config.connection import db
 from datetime import datetime, timezone
 
+# Columns read by list endpoints, which serialize rows without loading entities
+_LIST_COLUMNS = (
+    Products.id,
+    Products.code,
+    Products.name,
+    Products.category,
+    Products.current_stock,
+    Products.created_at,
+    Products.updated_at,
+)
+
 
 class ProductsRepository:
     """
@@ -18,11 +32,13 @@ class ProductsRepository:
         insert_product(data): Insert a new product record.
         update_product(id, name, category, current_stock, add_stock): Update product fields.
         delete_product(id): Delete a product by ID.
-        select_all_products(): Retrieve all products.
+        select_all_products(): Retrieve all products as read-only rows.
         select_by_name(name): Retrieve a product by exact name.
         select_product_by_id(id): Retrieve a product by ID.
         select_products_by_name(name): Retrieve products matching partial name.
         select_by_code(code): Retrieve a product by its unique code.
+        product_exists(product_id): Check whether a product exists.
+        adjust_stock(product_id, delta): Atomically change product stock, never below zero.
         add_stock(product_id, quantity): Increase product stock.
         remove_stock(product_id, quantity): Decrease product stock if sufficient.
     """
@@ -46,7 +62,7 @@ class ProductsRepository:
         )
 
         db.session.add(data_insert)
-        db.session.commit()
+        db.session.flush()
 
         return data_insert
 
@@ -90,7 +106,7 @@ class ProductsRepository:
             product.current_stock += add_stock
 
         product.updated_at = datetime.now(timezone.utc)
-        db.session.commit()
+        db.session.flush()
 
         return product
 
@@ -106,19 +122,21 @@ class ProductsRepository:
         """
         # Perform delete operation on matching record
         result = db.session.query(Products).filter(Products.id == id).delete()
-        db.session.commit()
 
         # Return True if any rows were deleted
         return result > 0
 
     def select_all_products(self):
         """
-        Retrieve all products from the database.
+        Retrieve all products from the database as read-only rows.
+
+        Only the listed columns are selected and no entity is added to the
+        session, which keeps large listings cheap to load and serialize.
 
         Returns:
-            list[Products]: List of all product instances.
+            list[Row]: Rows exposing the product columns as attributes.
         """
-        return db.session.query(Products).all()
+        return db.session.execute(select(*_LIST_COLUMNS)).all()
     
     def select_by_name(self, name):
         """
@@ -168,6 +186,50 @@ class ProductsRepository:
         """
         return db.session.query(Products).filter(Products.code == code).first()
 
+    def product_exists(self, product_id: int):
+        """
+        Check whether a product exists, without loading it.
+
+        Args:
+            product_id (int): Identifier of the product.
+
+        Returns:
+            bool: True if the product exists, False otherwise.
+        """
+        return db.session.query(Products.id).filter(Products.id == product_id).first() is not None
+
+    def adjust_stock(self, product_id: int, delta: int):
+        """
+        Atomically change the stock level of a product.
+
+        Runs a single conditional UPDATE ... RETURNING, so the stock check and the
+        change happen in one round trip under the row lock, and concurrent
+        movements can never push the stock below zero.
+
+        Args:
+            product_id (int): ID of the product to update.
+            delta (int): Quantity to add (positive) or remove (negative).
+
+        Returns:
+            Row or None: The product's (id, current_stock) after the change,
+                         or None if not found or stock is insufficient.
+        """
+        # Only the quantity to remove needs checking; additions always match an existing row
+        condition = [Products.id == product_id]
+        if delta < 0:
+            condition.append(Products.current_stock >= -delta)
+
+        stmt = (
+            update(Products)
+            .where(*condition)
+            .values(
+                current_stock=Products.current_stock + delta,
+                updated_at=datetime.now(timezone.utc)
+            )
+            .returning(Products.id, Products.current_stock)
+        )
+        return db.session.execute(stmt).first()
+
     def add_stock(self, product_id: int, quantity: int):
         """
         Increase the stock level of a product.
@@ -177,19 +239,9 @@ class ProductsRepository:
             quantity (int): Amount of stock to add.
 
         Returns:
-            Products or None: Updated product instance or None if not found.
+            Row or None: The product's (id, current_stock) after the change, or None if not found.
         """
-        # Fetch the product by ID
-        product = self.select_product_by_id(product_id)
-        if not product:
-            return None
-
-        # Increase the stock and update timestamp
-        product.current_stock += quantity
-        product.updated_at = datetime.now(timezone.utc)
-        db.session.commit()
-
-        return product
+        return self.adjust_stock(product_id, quantity)
 
     def remove_stock(self, product_id: int, quantity: int):
         """
@@ -200,16 +252,7 @@ class ProductsRepository:
             quantity (int): Amount of stock to remove.
 
         Returns:
-            Products or None: Updated product instance, or None if not found or insufficient stock.
+            Row or None: The product's (id, current_stock) after the change,
+                         or None if not found or insufficient stock.
         """
-        # Fetch the product by ID
-        product = self.select_product_by_id(product_id)
-        # Return None if product does not exist or stock insufficient
-        if not product or product.current_stock < quantity:
-            return None
-
-        # Decrease the stock and update timestamp
-        product.current_stock -= quantity
-        product.updated_at = datetime.now(timezone.utc)
-        db.session.commit()
-        return product
+        return self.adjust_stock(product_id, -quantity)
@@ -3,26 +3,62 @@ Transactions repository module.
 
 Provides database operations for Transactions, including CRUD and queries by product or user,
 using SQLAlchemy session management.
+Write methods only flush their changes; the service layer commits them through
+a unit_of_work scope.
 """
 
-from app.infraDB.models.transactions import Transactions, TransactionType
+from sqlalchemy import select, update, tuple_, func, or_, and_, bindparam
+from sqlalchemy.orm import joinedload
+from app.infraDB.models.transactions import Transactions, TransactionType, ProofStatus, VerificationStatus
+from app.infraDB.models.users import Users
 from app.infraDB.config.connection import db
 
+# Loader option for reads that are serialized: fetch the user's email in the same
+# query (every transaction has a user) instead of one lazy SELECT per transaction
+_with_user_email = joinedload(Transactions.user, innerjoin=True).load_only(Users.email)
+
+# Columns read by list endpoints, which serialize rows without loading entities
+_LIST_COLUMNS = (
+    Transactions.id,
+    Transactions.product_id,
+    Transactions.user_id,
+    Users.email.label("user_email"),
+    Transactions.type,
+    Transactions.quantity,
+    Transactions.blockchain_hash,
+    Transactions.proof_status,
+    Transactions.created_at,
+)
+
 
 class TransactionsRepository:
     """
     Repository for Transactions model.
 
     Methods:
-        insert_transaction(product_id, type, quantity, blockchain_hash, user_id): Insert a new transaction record.
+        insert_transaction(product_id, type, quantity, blockchain_hash, user_id, ots_filename, hash_input, created_at): Insert a new transaction record.
+        update_proof(transaction_id, ots_filename, proof_status, proof_hash): Record the outcome of stamping a transaction.
+        update_batch_proofs(merkle_proofs, ots_filename, proof_status, proof_hash): Record the outcome of stamping a Merkle batch.
+        update_verification(transaction_id, status, block_height, attested_at, verified_at): Record the outcome of verifying a proof.
+        update_verifications(transaction_ids, status, block_height, attested_at, verified_at): Record one outcome for several transactions.
         delete_transaction(id): Delete a transaction by ID.
-        select_all_transactions(): Retrieve all transactions.
-        select_transactions_by_product(product_id): Retrieve transactions filtered by product.
+        select_all_transactions(limit, after): Retrieve a page of all transactions.
+        select_transactions_by_product(product_id, limit, after): Retrieve a page of transactions filtered by product.
         select_transaction_by_id(transaction_id): Retrieve a transaction by ID.
-        select_transactions_by_user(user_id): Retrieve transactions for a specific user.
+        select_transactions_by_ids(transaction_ids): Retrieve several transactions by ID in one query.
+        select_transactions_by_user(user_id, limit, after): Retrieve a page of transactions for a specific user.
+        search_transactions(filters, limit, after): Retrieve a page of transactions matching combined filters.
+        iter_transactions(batch_size, product_id, user_id): Stream transactions through a server-side cursor.
+        select_verification_targets(transaction_ids, date_from, date_to, limit): Retrieve the proof columns of transactions to verify.
+        select_upgrade_candidates(now, limit): Retrieve the stamped proof files due for an upgrade.
+        mark_upgraded(proof_hashes, upgraded_at): Record that proof files were upgraded.
+        schedule_upgrade_retry(ots_filename, attempts, next_upgrade_at): Postpone the next upgrade of a proof file.
+        select_ots_filenames(): Retrieve every distinct proof file name in use.
+        rename_ots_file(old_filename, new_filename): Point transactions to a moved proof file.
     """
 
-    def insert_transaction(self, product_id, type, quantity, blockchain_hash, user_id, ots_filename):
+    def insert_transaction(self, product_id, type, quantity, blockchain_hash, user_id, ots_filename=None,
+                           hash_input=None, created_at=None):
         """
         Create and persist a new transaction.
 
@@ -32,7 +68,10 @@ class TransactionsRepository:
             quantity (int): Quantity moved in the transaction.
             blockchain_hash (str): Blockchain hash for integrity tracking.
             user_id (int): ID of the user performing the transaction.
-            ots_filename (str): Directory where the ots file is saved
+            ots_filename (str, optional): Directory where the ots file is saved; None while the proof is pending.
+            hash_input (str, optional): Input blockchain_hash was computed from.
+            created_at (datetime, optional): Creation time, when it was part of the hashed input;
+                defaults to now.
 
         Returns:
             Transactions: The created transaction instance.
@@ -43,15 +82,120 @@ class TransactionsRepository:
             type=type,
             quantity=quantity,
             blockchain_hash=blockchain_hash,
+            hash_input=hash_input,
             user_id=user_id,
-            ots_filename=ots_filename
+            ots_filename=ots_filename,
+            created_at=created_at
         )
 
         db.session.add(data_insert)
-        db.session.commit()
+        db.session.flush()
 
         return data_insert
 
+    def update_proof(self, transaction_id: int, ots_filename: str, proof_status: ProofStatus,
+                     proof_hash: str = None):
+        """
+        Record the outcome of stamping a transaction.
+
+        Args:
+            transaction_id (int): Identifier of the stamped transaction.
+            ots_filename (str): Name of the generated .ots file, or None if stamping failed.
+            proof_status (ProofStatus): New state of the transaction's proof.
+            proof_hash (str, optional): Hex SHA256 of the generated proof.
+
+        Returns:
+            bool: True if the transaction was updated, False if it no longer exists.
+        """
+        # Update only the proof columns, without loading the transaction
+        result = db.session.query(Transactions).filter_by(id=transaction_id).update(
+            {"ots_filename": ots_filename, "proof_status": proof_status, "proof_hash": proof_hash},
+            synchronize_session=False
+        )
+
+        return result > 0
+
+    def update_batch_proofs(self, merkle_proofs: dict, ots_filename: str, proof_status: ProofStatus,
+                            proof_hash: str = None):
+        """
+        Record the outcome of stamping a Merkle batch in a single statement.
+
+        Args:
+            merkle_proofs (dict): Mapping of transaction ID to its hex-encoded inclusion proof
+                (None when stamping failed).
+            ots_filename (str): Name of the batch root's .ots file, or None if stamping failed.
+            proof_status (ProofStatus): New state of the transactions' proofs.
+            proof_hash (str, optional): Hex SHA256 of the batch root's proof.
+        """
+        # ORM bulk UPDATE by primary key, executed as one executemany
+        db.session.execute(
+            update(Transactions),
+            [
+                {
+                    "id": transaction_id,
+                    "ots_filename": ots_filename,
+                    "merkle_proof": merkle_proof,
+                    "proof_status": proof_status,
+                    "proof_hash": proof_hash
+                }
+                for transaction_id, merkle_proof in merkle_proofs.items()
+            ]
+        )
+
+    def update_verification(self, transaction_id: int, status: VerificationStatus, block_height: int,
+                            attested_at, verified_at):
+        """
+        Record the outcome of verifying a transaction's proof.
+
+        Args:
+            transaction_id (int): Identifier of the verified transaction.
+            status (VerificationStatus): Verification outcome.
+            block_height (int): Attesting Bitcoin block, or None if not confirmed.
+            attested_at (datetime): Time of the attesting block, or None if not confirmed.
+            verified_at (datetime): When the verification ran.
+
+        Returns:
+            bool: True if the transaction was updated, False if it no longer exists.
+        """
+        # Update only the verification columns, without loading the transaction
+        result = db.session.query(Transactions).filter_by(id=transaction_id).update(
+            {
+                "verification_status": status,
+                "block_height": block_height,
+                "attested_at": attested_at,
+                "verified_at": verified_at
+            },
+            synchronize_session=False
+        )
+
+        return result > 0
+
+    def update_verifications(self, transaction_ids: list, status: VerificationStatus, block_height: int,
+                             attested_at, verified_at):
+        """
+        Record the same verification outcome for several transactions in a single statement.
+
+        Used for transactions whose proofs share one .ots file (a Merkle batch root).
+
+        Args:
+            transaction_ids (list[int]): Identifiers of the verified transactions.
+            status (VerificationStatus): Verification outcome.
+            block_height (int): Attesting Bitcoin block, or None if not confirmed.
+            attested_at (datetime): Time of the attesting block, or None if not confirmed.
+            verified_at (datetime): When the verification ran.
+        """
+        db.session.execute(
+            update(Transactions)
+            .where(Transactions.id.in_(transaction_ids))
+            .values(
+                verification_status=status,
+                block_height=block_height,
+                attested_at=attested_at,
+                verified_at=verified_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     def delete_transaction(self, id: int):
         """
         Delete a transaction by its ID.
@@ -64,31 +208,66 @@ class TransactionsRepository:
         """
         # Perform delete operation on matching record
         result = db.session.query(Transactions).filter_by(id=id).delete()
-        db.session.commit()
 
         # Return True if any rows were deleted
         return result > 0
     
-    def select_all_transactions(self):
+    def _select_rows(self):
+        """
+        Build the projection used by list endpoints: transaction columns plus the user's email.
+
+        Returns:
+            Select: Statement over transactions joined to their users.
+        """
+        return select(*_LIST_COLUMNS).join(Users, Transactions.user_id == Users.id)
+
+    def _select_page(self, stmt, limit: int, after: tuple = None):
+        """
+        Apply keyset pagination on (created_at, id) to a transactions statement and run it.
+
+        Args:
+            stmt (Select): Statement built by _select_rows, already filtered.
+            limit (int): Maximum number of transactions in the page.
+            after (tuple(datetime, int), optional): Key of the last transaction of the previous page.
+
+        Returns:
+            list[Row]: Up to limit + 1 transaction rows; the extra one only tells
+                       the caller that another page exists.
+        """
+        if after is not None:
+            # Resume strictly after the previous page instead of skipping rows with OFFSET
+            stmt = stmt.where(tuple_(Transactions.created_at, Transactions.id) > tuple_(*after))
+
+        stmt = stmt.order_by(Transactions.created_at, Transactions.id).limit(limit + 1)
+        return db.session.execute(stmt).all()
+
+    def select_all_transactions(self, limit: int, after: tuple = None):
         """
-        Retrieve all transactions from the database.
+        Retrieve a page of transactions as read-only rows, oldest first.
+
+        Args:
+            limit (int): Maximum number of transactions in the page.
+            after (tuple(datetime, int), optional): Key of the last transaction of the previous page.
 
         Returns:
-            list[Transactions]: List of all transaction instances.
+            list[Row]: Up to limit + 1 transaction rows.
         """
-        return db.session.query(Transactions).all()
+        return self._select_page(self._select_rows(), limit, after)
 
-    def select_transactions_by_product(self, product_id: int):
+    def select_transactions_by_product(self, product_id: int, limit: int, after: tuple = None):
         """
-        Retrieve transactions filtered by product ID.
+        Retrieve a page of transactions filtered by product ID as read-only rows, oldest first.
 
         Args:
             product_id (int): ID of the product to filter transactions by.
+            limit (int): Maximum number of transactions in the page.
+            after (tuple(datetime, int), optional): Key of the last transaction of the previous page.
 
         Returns:
-            list[Transactions]: List of matching transaction instances.
+            list[Row]: Up to limit + 1 matching transaction rows.
         """
-        return db.session.query(Transactions).filter_by(product_id=product_id).all()
+        stmt = self._select_rows().where(Transactions.product_id == product_id)
+        return self._select_page(stmt, limit, after)
 
     def select_transaction_by_id(self, transaction_id: int):
         """
@@ -100,16 +279,371 @@ class TransactionsRepository:
         Returns:
             Transactions or None: Matching transaction instance or None if not found.
         """
-        return db.session.query(Transactions).filter_by(id=transaction_id).first()
+        return db.session.query(Transactions).options(_with_user_email).filter_by(id=transaction_id).first()
 
-    def select_transactions_by_user(self, user_id: int):
+    def select_transactions_by_ids(self, transaction_ids: list):
         """
-        Retrieve transactions for a specific user.
+        Retrieve several transactions by their IDs in a single query.
+
+        Args:
+            transaction_ids (list[int]): Identifiers of the transactions.
+
+        Returns:
+            list[Transactions]: Matching transaction instances.
+        """
+        return (
+            db.session.query(Transactions)
+            .options(_with_user_email)
+            .filter(Transactions.id.in_(transaction_ids))
+            .all()
+        )
+
+    def select_transactions_by_user(self, user_id: int, limit: int, after: tuple = None):
+        """
+        Retrieve a page of transactions for a specific user as read-only rows, oldest first.
 
         Args:
             user_id (int): ID of the user whose transactions to fetch.
+            limit (int): Maximum number of transactions in the page.
+            after (tuple(datetime, int), optional): Key of the last transaction of the previous page.
+
+        Returns:
+            list[Row]: Up to limit + 1 transaction rows for the given user.
+        """
+        stmt = self._select_rows().where(Transactions.user_id == user_id)
+        return self._select_page(stmt, limit, after)
+
+    def search_transactions(self, filters: dict, limit: int, after: tuple = None):
+        """
+        Retrieve a page of transactions matching every given filter, as read-only rows, oldest first.
+
+        Args:
+            filters (dict): Optional criteria: 'product_id', 'user_id', 'type' (TransactionType),
+                            'date_from', 'date_to' (datetime), 'min_quantity', 'max_quantity' (int).
+            limit (int): Maximum number of transactions in the page.
+            after (tuple(datetime, int), optional): Key of the last transaction of the previous page.
+
+        Returns:
+            list[Row]: Up to limit + 1 matching transaction rows.
+        """
+        stmt = self._select_rows()
+
+        # Equality filters lead the composite (column, created_at, id) indexes
+        if "product_id" in filters:
+            stmt = stmt.where(Transactions.product_id == filters["product_id"])
+        if "user_id" in filters:
+            stmt = stmt.where(Transactions.user_id == filters["user_id"])
+        if "type" in filters:
+            stmt = stmt.where(Transactions.type == filters["type"])
+
+        # Time range: start inclusive, end exclusive
+        if "date_from" in filters:
+            stmt = stmt.where(Transactions.created_at >= filters["date_from"])
+        if "date_to" in filters:
+            stmt = stmt.where(Transactions.created_at < filters["date_to"])
+
+        # Quantity range: both bounds inclusive
+        if "min_quantity" in filters:
+            stmt = stmt.where(Transactions.quantity >= filters["min_quantity"])
+        if "max_quantity" in filters:
+            stmt = stmt.where(Transactions.quantity <= filters["max_quantity"])
+
+        return self._select_page(stmt, limit, after)
+
+    def iter_transactions(self, batch_size: int, product_id: int = None, user_id: int = None):
+        """
+        Stream transactions as read-only rows, oldest first, optionally filtered by product or user.
+
+        Rows are fetched through a server-side cursor in batches of batch_size, so
+        only one batch is held in memory at a time, however large the table is.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor at a time.
+            product_id (int, optional): ID of the product to filter transactions by.
+            user_id (int, optional): ID of the user to filter transactions by.
+
+        Returns:
+            Iterator[Row]: Lazily fetched transaction rows.
+        """
+        stmt = self._select_rows()
+        if product_id is not None:
+            stmt = stmt.where(Transactions.product_id == product_id)
+        if user_id is not None:
+            stmt = stmt.where(Transactions.user_id == user_id)
+
+        stmt = (
+            stmt.order_by(Transactions.created_at, Transactions.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        return db.session.execute(stmt)
+
+    def select_verification_targets(self, transaction_ids: list = None, date_from=None, date_to=None,
+                                    limit: int = None):
+        """
+        Retrieve the proof and verification columns of transactions, oldest first.
+
+        Args:
+            transaction_ids (list[int], optional): Only these transactions.
+            date_from (datetime, optional): Only transactions created at or after this time.
+            date_to (datetime, optional): Only transactions created before this time.
+            limit (int, optional): Maximum number of rows returned.
+
+        Returns:
+            list[Row]: Rows with id, blockchain_hash, hash_input, ots_filename, merkle_proof,
+                       proof_status, verification_status, block_height and attested_at.
+        """
+        stmt = select(
+            Transactions.id,
+            Transactions.blockchain_hash,
+            Transactions.hash_input,
+            Transactions.ots_filename,
+            Transactions.merkle_proof,
+            Transactions.proof_status,
+            Transactions.verification_status,
+            Transactions.block_height,
+            Transactions.attested_at,
+        )
+
+        if transaction_ids is not None:
+            stmt = stmt.where(Transactions.id.in_(transaction_ids))
+        # Time range: start inclusive, end exclusive
+        if date_from is not None:
+            stmt = stmt.where(Transactions.created_at >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(Transactions.created_at < date_to)
+
+        stmt = stmt.order_by(Transactions.created_at, Transactions.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        return db.session.execute(stmt).all()
+
+    def iter_proof_rows(self, batch_size: int, date_from=None, date_to=None, product_id: int = None):
+        """
+        Stream the proof columns of transactions, oldest first, for archiving.
+
+        Rows are fetched through a server-side cursor in batches of batch_size.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor at a time.
+            date_from (datetime, optional): Only transactions created at or after this time.
+            date_to (datetime, optional): Only transactions created before this time.
+            product_id (int, optional): Only transactions of this product.
+
+        Returns:
+            Iterator[Row]: Rows with id, product_id, created_at, blockchain_hash,
+                           ots_filename, merkle_proof and proof_status.
+        """
+        stmt = select(
+            Transactions.id,
+            Transactions.product_id,
+            Transactions.created_at,
+            Transactions.blockchain_hash,
+            Transactions.ots_filename,
+            Transactions.merkle_proof,
+            Transactions.proof_status,
+        )
+
+        # Time range: start inclusive, end exclusive
+        if date_from is not None:
+            stmt = stmt.where(Transactions.created_at >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(Transactions.created_at < date_to)
+        if product_id is not None:
+            stmt = stmt.where(Transactions.product_id == product_id)
+
+        stmt = (
+            stmt.order_by(Transactions.created_at, Transactions.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        return db.session.execute(stmt)
+
+    def select_stale_pending(self, created_before, now, limit: int, after_id: int = 0):
+        """
+        Retrieve the pending transactions that need a stamping attempt, in ID order.
+
+        These are transactions whose first attempt was never made (created before
+        created_before, no retry scheduled) and failed ones whose retry is due.
+
+        Args:
+            created_before (datetime): Never-attempted transactions must be older than this.
+            now (datetime): Current time; retries scheduled later are skipped.
+            limit (int): Maximum number of rows returned.
+            after_id (int, optional): Resume after this transaction ID.
+
+        Returns:
+            list[Row]: Rows with id and blockchain_hash.
+        """
+        stmt = (
+            select(Transactions.id, Transactions.blockchain_hash)
+            .where(
+                Transactions.proof_status == ProofStatus.PENDING,
+                or_(
+                    and_(Transactions.next_stamp_at.is_(None), Transactions.created_at < created_before),
+                    Transactions.next_stamp_at <= now
+                ),
+                Transactions.id > after_id
+            )
+            .order_by(Transactions.id)
+            .limit(limit)
+        )
+        return db.session.execute(stmt).all()
+
+    def select_stamp_attempts(self, transaction_ids: list) -> dict:
+        """
+        Read how many stamping attempts of some transactions failed.
+
+        Args:
+            transaction_ids (list[int]): Identifiers of the transactions.
+
+        Returns:
+            dict: Transaction ID -> stamp_attempts.
+        """
+        stmt = select(Transactions.id, Transactions.stamp_attempts).where(Transactions.id.in_(transaction_ids))
+        return dict(db.session.execute(stmt).all())
+
+    def record_stamp_failure(self, transaction_id: int, attempts: int, next_stamp_at):
+        """
+        Record a failed stamping attempt.
+
+        Args:
+            transaction_id (int): Identifier of the transaction.
+            attempts (int): Failed attempts so far, including this one.
+            next_stamp_at (datetime): Time of the retry, or None to give up and mark the proof failed.
+        """
+        db.session.execute(
+            update(Transactions)
+            .where(Transactions.id == transaction_id)
+            .values(
+                stamp_attempts=attempts,
+                next_stamp_at=next_stamp_at,
+                proof_status=ProofStatus.PENDING if next_stamp_at is not None else ProofStatus.FAILED
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def reset_failed_stamps(self, now) -> int:
+        """
+        Make the transactions whose stamping gave up pending again, with a retry due now.
+
+        Args:
+            now (datetime): Time of the retry.
+
+        Returns:
+            int: Number of transactions reset.
+        """
+        result = db.session.execute(
+            update(Transactions)
+            .where(Transactions.proof_status == ProofStatus.FAILED)
+            .values(proof_status=ProofStatus.PENDING, stamp_attempts=0, next_stamp_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def select_upgrade_candidates(self, now, limit: int):
+        """
+        Retrieve the stamped proof files due for an upgrade, oldest first.
+
+        Transactions of a Merkle batch share one file, which is returned once.
+
+        Args:
+            now (datetime): Current time; files whose next attempt is later are skipped.
+            limit (int): Maximum number of files returned.
+
+        Returns:
+            list[Row]: Rows with ots_filename and upgrade_attempts (the highest among its transactions).
+        """
+        stmt = (
+            select(
+                Transactions.ots_filename,
+                func.max(Transactions.upgrade_attempts).label("upgrade_attempts")
+            )
+            .where(
+                Transactions.proof_status == ProofStatus.STAMPED,
+                Transactions.ots_filename.is_not(None),
+                or_(Transactions.next_upgrade_at.is_(None), Transactions.next_upgrade_at <= now)
+            )
+            .group_by(Transactions.ots_filename)
+            .order_by(func.min(Transactions.created_at))
+            .limit(limit)
+        )
+        return db.session.execute(stmt).all()
+
+    def mark_upgraded(self, proof_hashes: dict, upgraded_at):
+        """
+        Record that proof files were upgraded with their Bitcoin attestation, in one executemany.
+
+        Args:
+            proof_hashes (dict): Mapping of upgraded .ots file to the hex SHA256 of its new content.
+            upgraded_at (datetime): When the upgrade completed.
+        """
+        table = Transactions.__table__
+        db.session.execute(
+            update(table)
+            .where(
+                table.c.ots_filename == bindparam("upgraded_filename"),
+                table.c.proof_status == ProofStatus.STAMPED
+            )
+            .values(
+                proof_status=ProofStatus.UPGRADED,
+                proof_hash=bindparam("upgraded_hash"),
+                upgraded_at=upgraded_at,
+                next_upgrade_at=None
+            ),
+            [
+                {"upgraded_filename": ots_filename, "upgraded_hash": proof_hash}
+                for ots_filename, proof_hash in proof_hashes.items()
+            ]
+        )
+
+    def schedule_upgrade_retry(self, ots_filename: str, attempts: int, next_upgrade_at):
+        """
+        Postpone the next upgrade of a proof file that is not anchored yet.
+
+        Args:
+            ots_filename (str): The .ots file.
+            attempts (int): Number of attempts made so far.
+            next_upgrade_at (datetime): Earliest time of the next attempt.
+        """
+        db.session.execute(
+            update(Transactions)
+            .where(
+                Transactions.ots_filename == ots_filename,
+                Transactions.proof_status == ProofStatus.STAMPED
+            )
+            .values(upgrade_attempts=attempts, next_upgrade_at=next_upgrade_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    def select_ots_filenames(self):
+        """
+        Retrieve every distinct proof file name referenced by transactions.
+
+        Returns:
+            list[str]: Proof file names, relative to the OTS folder.
+        """
+        stmt = (
+            select(Transactions.ots_filename)
+            .where(Transactions.ots_filename.is_not(None))
+            .distinct()
+        )
+        return db.session.execute(stmt).scalars().all()
+
+    def rename_ots_file(self, old_filename: str, new_filename: str) -> int:
+        """
+        Point every transaction using a proof file to its new name.
+
+        Args:
+            old_filename (str): Current proof file name.
+            new_filename (str): New proof file name.
 
         Returns:
-            list[Transactions]: List of transaction instances for the given user.
+            int: Number of transactions updated.
         """
-        return db.session.query(Transactions).filter(Transactions.user_id == user_id).all()
+        result = db.session.execute(
+            update(Transactions)
+            .where(Transactions.ots_filename == old_filename)
+            .values(ots_filename=new_filename)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -3,12 +3,25 @@ Users repository module.
 
 Provides database operations for Users, including CRUD and queries by email or ID,
 using SQLAlchemy session management.
+Write methods only flush their changes; the service layer commits them through
+a unit_of_work scope.
 """
 
+from sqlalchemy import select
 from app.infraDB.models.users import Users, PermissionType
 from app.infraDB.config.connection import db
 from datetime import datetime, timezone
 
+# Columns read by list endpoints; the password hash is never selected
+_LIST_COLUMNS = (
+    Users.id,
+    Users.name,
+    Users.email,
+    Users.permission,
+    Users.created_at,
+    Users.updated_at,
+)
+
 
 class UsersRepository:
     """
@@ -17,8 +30,9 @@ class UsersRepository:
     Methods:
         insert_user(name, email, password_hash, permission): Insert a new user record.
         update_user(id, name, email, password_hash, permission): Update an existing user.
+        update_password_hash(id, password_hash): Replace a user's stored password hash.
         delete_user(id): Delete a user by ID.
-        select_all_users(): Retrieve all users.
+        select_all_users(): Retrieve all users as read-only rows.
         select_user_by_email(email): Retrieve a user by email.
         select_user_by_id(id): Retrieve a user by ID.
     """
@@ -46,7 +60,7 @@ class UsersRepository:
         )
 
         db.session.add(data_insert)
-        db.session.commit()
+        db.session.flush()
         return data_insert
 
     def update_user(self, id: int, name: str = None, email: str = None, password_hash: str = None, permission: PermissionType = None):
@@ -80,9 +94,29 @@ class UsersRepository:
             user.permission = permission
 
         user.updated_at = datetime.now(timezone.utc)
-        db.session.commit()
+        db.session.flush()
         return user
 
+    def update_password_hash(self, id: int, password_hash: str):
+        """
+        Replace a user's stored password hash, e.g. after a bcrypt cost change.
+
+        Unlike update_user, this does not touch updated_at: the user's data is unchanged.
+
+        Args:
+            id (int): Identifier of the user.
+            password_hash (str): New bcrypt hash of the same password.
+
+        Returns:
+            bool: True if a user was updated, False otherwise.
+        """
+        result = (
+            db.session.query(Users)
+            .filter(Users.id == id)
+            .update({Users.password_hash: password_hash}, synchronize_session=False)
+        )
+        return result > 0
+
     def delete_user(self, id: int):
         """
         Delete a user by its ID.
@@ -96,20 +130,22 @@ class UsersRepository:
 
         # Perform delete operation on matching record
         result = db.session.query(Users).filter(Users.id == id).delete()
-        db.session.commit()
 
         # Return True if any rows were deleted
         return result > 0
 
     def select_all_users(self):
         """
-        Retrieve all users from the database.
+        Retrieve all users from the database as read-only rows.
+
+        Only the listed columns are selected and no entity is added to the
+        session, which keeps large listings cheap to load and serialize.
 
         Returns:
-            list[Users]: List of all user instances.
+            list[Row]: Rows exposing the user columns as attributes.
         """
 
-        return db.session.query(Users).all()
+        return db.session.execute(select(*_LIST_COLUMNS)).all()
     
     def select_user_by_email(self, email):
         """
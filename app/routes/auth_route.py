@@ -7,20 +7,23 @@ delegating login logic to the user_login controller.
 
 from flask import Blueprint, request
 from app.controllers.auth_controller import user_login
+from app.auth.rate_limit import rate_limit
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route('/api/login', methods=['POST'])
+@rate_limit('login')
 def login():
     """
     Handle POST requests to '/api/login' for user authentication.
 
     Expects JSON payload with 'email' and 'password'.
+    Rate-limited per client address, since every attempt costs a bcrypt check.
     Delegates validation and token generation to user_login.
 
     Returns:
         Response: JSON response from user_login (access token and user info,
-                  or error messages).
+                  or error messages), or HTTP 429 when rate-limited.
     """
 
     # Extract JSON body and delegate to the authentication controller
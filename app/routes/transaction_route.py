@@ -9,15 +9,22 @@ from flask import Blueprint
 from app.controllers.transaction_controller import (
     create_entry_controller,
     create_exit_controller,
+    create_batch_controller,
     get_all_transactions_controller,
     get_transactions_by_product_controller,
+    search_transactions_controller,
     delete_transaction_controller,
     get_transaction_by_id_controller,
     get_transactions_by_user_controller,
     verify_transaction_controller,
-    download_ots_controller
+    verify_batch_controller,
+    download_ots_controller,
+    proof_links_controller,
+    proof_archive_controller,
+    signed_proof_download_controller
 )
 from app.auth.permissions import permission_required
+from app.auth.rate_limit import rate_limit
 
 transaction_bp = Blueprint('transaction', __name__)
 
@@ -28,11 +35,13 @@ def create_entry():
     Handle POST /api/transactions/entry to create an entry transaction for a product.
 
     Requires 'operator' permission.
-    Delegates to create_entry_controller which validates input and decodes JWT.
+    Delegates to create_entry_controller which validates input and reads the token claims.
+    An optional Idempotency-Key header makes retries safe: a repeated request
+    replays the stored response instead of changing stock again.
 
     Returns:
-        Response: JSON-formatted transaction and HTTP 201 on success,
-                  or error messages with appropriate status codes.
+        Response: JSON-formatted transaction and HTTP 201 on success (replayed for a
+                  repeated Idempotency-Key), or error messages with appropriate status codes.
     """
     return create_entry_controller()
 
@@ -43,14 +52,42 @@ def create_exit():
     Handle POST /api/transactions/exit to create an exit transaction for a product.
 
     Requires 'operator' permission.
-    Delegates to create_exit_controller which validates input and decodes JWT.
+    Delegates to create_exit_controller which validates input and reads the token claims.
+    An optional Idempotency-Key header makes retries safe: a repeated request
+    replays the stored response instead of changing stock again.
 
     Returns:
-        Response: JSON-formatted transaction and HTTP 201 on success,
-                  or error messages with appropriate status codes.
+        Response: JSON-formatted transaction and HTTP 201 on success (replayed for a
+                  repeated Idempotency-Key), or error messages with appropriate status codes.
     """
     return create_exit_controller()
 
+@transaction_bp.route('/api/transactions/batch', methods=['POST'])  # Endpoint to create a batch of transactions
+@permission_required('operator')
+@rate_limit('batch')
+def create_batch():
+    """
+    Handle POST /api/transactions/batch to apply a batch of entry and exit transactions.
+
+    Requires 'operator' permission; rate-limited per user.
+    Delegates to create_batch_controller which validates input and reads the token claims.
+    Accepts an optional Idempotency-Key header, like single transactions.
+
+    Request JSON:
+        {
+            "mode": "atomic",  # or "best_effort"
+            "items": [
+                {"product_id": 1, "quantity": 5, "type": "entry"},
+                {"product_id": 2, "quantity": 1, "type": "exit"}
+            ]
+        }
+
+    Returns:
+        Response: JSON with per-item results and HTTP 201/207 on success,
+                  or error messages with appropriate status codes.
+    """
+    return create_batch_controller()
+
 @transaction_bp.route('/api/transactions', methods=['GET'])  # Endpoint to list all transactions
 @permission_required('viewer')
 def get_all_transactions():
@@ -82,20 +119,37 @@ def get_transactions_by_product(product_id):
     """
     return get_transactions_by_product_controller(product_id)
 
+@transaction_bp.route('/api/transactions/search', methods=['GET'])  # Search transactions by combined filters
+@permission_required('viewer')
+def search_transactions_route():
+    """
+    Handle GET /api/transactions/search to retrieve transactions matching combined filters.
+
+    Requires 'viewer' permission.
+
+    Query parameters:
+        product_id, user_id, type, from, to, min_quantity, max_quantity, limit, cursor.
+
+    Returns:
+        Response: JSON page of transactions and HTTP 200 on success,
+                  or error message with HTTP 400/500 on failure.
+    """
+    return search_transactions_controller()
+
 @transaction_bp.route('/api/transactions/delete/<int:id>', methods=['DELETE'])  # Endpoint to delete a transaction
 @permission_required('admin')
 def delete_transaction(id):
     """
     Handle DELETE /api/transactions/<id> to remove a transaction by its ID.
 
-    Requires 'admin' permission.
+    Requires 'admin' permission. Transactions in the hash chain cannot be deleted.
 
     Args:
         id (int): Identifier of the transaction to delete.
 
     Returns:
-        Response: Success message and HTTP 200 on success,
-                  or error message with HTTP 404 if not found.
+        Response: Success message and HTTP 200 on success, error message with
+                  HTTP 404 if not found, or HTTP 409 if the transaction is chained.
     """
     return delete_transaction_controller(id)
 
@@ -123,7 +177,7 @@ def get_transactions_by_user():
     Handle GET /api/user/transactions to retrieve transactions of the authenticated user.
 
     Requires 'viewer' permission.
-    Delegates JWT decoding and retrieval to controller.
+    Delegates retrieval to controller, which reads the user from the token claims.
 
     Returns:
         Response: JSON list of user transactions and HTTP 200 on success,
@@ -133,16 +187,18 @@ def get_transactions_by_user():
 
 @transaction_bp.route('/api/transactions/verify', methods=['POST'])
 @permission_required('viewer')
+@rate_limit('verify')
 def verify_transaction():
     """
     Handle POST /api/transactions/verify to validate the integrity of a transaction
     by checking its OTS file.
 
-    Requires 'viewer' permission.
+    Requires 'viewer' permission; rate-limited per user, since each call runs 'ots verify'.
 
-    Request JSON:
+    Request JSON (either field; 'transaction_id' also checks Merkle-batched proofs):
         {
-            "ots_filename": "transacao_4_4_entry_admin_at_email_com_20250515T183422.bin.ots"
+            "transaction_id": 42,
+            "ots_filename": "3f/a2/3fa2...c9.ots"
         }
 
     Returns:
@@ -150,18 +206,92 @@ def verify_transaction():
     """
     return verify_transaction_controller()
 
+@transaction_bp.route('/api/transactions/verify/batch', methods=['POST'])
+@permission_required('viewer')
+@rate_limit('verify')
+def verify_batch():
+    """
+    Handle POST /api/transactions/verify/batch to verify the proofs of many transactions.
+
+    Requires 'viewer' permission; rate-limited per user like single verifications.
+
+    Request JSON (either field):
+        {
+            "transaction_ids": [1, 2, 3],
+            "from": "2025-05-01T00:00:00", "to": "2025-06-01T00:00:00"
+        }
+
+    Returns:
+        Response: NDJSON stream with one verification result per transaction.
+    """
+    return verify_batch_controller()
+
 @transaction_bp.route('/api/transactions/<int:transaction_id>/ots', methods=['GET'])
 @permission_required('viewer')
 def download_ots_file(transaction_id):
     """
     Handle GET /api/transactions/<id>/ots to download the .ots file associated with a transaction.
 
-    Requires 'viewer' permission.
+    Requires 'viewer' permission. Supports conditional requests (ETag / If-None-Match)
+    and byte ranges.
 
     Args:
         transaction_id (int): ID of the transaction.
 
     Returns:
-        Response: .ots file for download or 404 if not found.
+        Response: .ots file for download, 206 for a range, 304 if the client's copy
+        is current, or 404 if not found.
     """
     return download_ots_controller(transaction_id)
+
+@transaction_bp.route('/api/transactions/ots/links', methods=['POST'])
+@permission_required('viewer')
+@rate_limit('batch')
+def issue_proof_links():
+    """
+    Handle POST /api/transactions/ots/links to issue signed download links for proofs.
+
+    Requires 'viewer' permission. Each link downloads one proof without a token
+    until it expires (OTS_LINK_TTL seconds).
+
+    Request JSON:
+        {
+            "transaction_ids": [1, 2, 3]
+        }
+
+    Returns:
+        Response: JSON with 'expires_at', one 'url' per available proof and per-transaction 'errors'.
+    """
+    return proof_links_controller()
+
+@transaction_bp.route('/api/transactions/ots/archive', methods=['GET'])
+@permission_required('viewer')
+@rate_limit('batch')
+def proof_archive():
+    """
+    Handle GET /api/transactions/ots/archive?from=..&to=..&product_id=.. to download many proofs at once.
+
+    Requires 'viewer' permission. Select the transactions by product, by creation
+    time range ('from' inclusive, 'to' exclusive), or both.
+
+    Returns:
+        Response: Streamed ZIP with one .ots per stamped transaction and a manifest.csv,
+                  or error messages with HTTP 400.
+    """
+    return proof_archive_controller()
+
+@transaction_bp.route('/api/ots/<path:ots_filename>', methods=['GET'])
+def signed_proof_download(ots_filename):
+    """
+    Handle GET /api/ots/<ots_filename>?tx=..&expires=..&sig=.. to download a proof through a signed link.
+
+    No token is required: the link's HMAC signature and expiry are checked instead,
+    without a database lookup.
+
+    Args:
+        ots_filename (str): Name of the proof in the proof store.
+
+    Returns:
+        Response: .ots file for download, 403 for an invalid or expired link, or 404 if not found.
+    """
+    return signed_proof_download_controller(ots_filename)
@@ -14,11 +14,13 @@ from app.controllers.user_controller import (
     delete_user_controller
 )
 from app.auth.permissions import permission_required
+from app.auth.rate_limit import rate_limit
 
 user_bp = Blueprint("user", __name__)
 
 @user_bp.route("/api/users/create", methods=["POST"])
 @permission_required("admin")
+@rate_limit("password")
 def create_user():
     """
     Handle POST /api/users/create to create a new user.
@@ -29,7 +31,7 @@ def create_user():
 
     Returns:
         Response: JSON-formatted created user and HTTP 201 on success,
-                  or error messages with HTTP 400/409/500 on failure.
+                  or error messages with HTTP 400/409/429/500 on failure.
     """
     return create_user_controller()
 
@@ -67,6 +69,7 @@ def get_user_by_id(id):
 
 @user_bp.route("/api/users/update/<int:id>", methods=["PUT"])
 @permission_required("admin")
+@rate_limit("password")
 def update_user(id):
     """
     Handle PUT /api/users/<id> to update an existing user.
@@ -80,7 +83,7 @@ def update_user(id):
 
     Returns:
         Response: JSON-formatted updated user and HTTP 200 on success,
-                  or error messages with HTTP 400/404/500 on failure.
+                  or error messages with HTTP 400/404/429/500 on failure.
     """
     return update_user_controller(id)
 
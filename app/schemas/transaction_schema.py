@@ -1,11 +1,14 @@
 """
 Transaction input schema module.
 
-Defines input validation schema for transactions using Marshmallow,
-validating required product ID and quantity fields.
+Defines input validation schemas for transactions using Marshmallow,
+validating required product ID and quantity fields, batches of typed items,
+the query parameters of the transaction search, and single and batch
+verification requests.
 """
 
-from marshmallow import Schema, fields, validate
+from datetime import timezone
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError, EXCLUDE
 
 
 class TransactionInputSchema(Schema):
@@ -15,6 +18,8 @@ class TransactionInputSchema(Schema):
     Fields:
         product_id (int): ID of the product for the transaction; must be provided.
         quantity (int): Quantity of product to move; must be greater than zero.
+
+    The movement type comes from the endpoint, so a 'type' field is rejected as unknown.
     """
     # Product ID field: required integer
     product_id = fields.Int(
@@ -31,3 +36,245 @@ class TransactionInputSchema(Schema):
         ),
         error_messages={"required": "Quantity is required."}
     )
+
+
+class TransactionBatchItemSchema(TransactionInputSchema):
+    """
+    Schema for validating one item of a batch transaction payload.
+
+    Fields:
+        product_id (int): ID of the product for the transaction; must be provided.
+        quantity (int): Quantity of product to move; must be greater than zero.
+        type (str): 'entry' or 'exit'; must be provided.
+    """
+    # Type field: required, a batch mixes entries and exits
+    type = fields.Str(
+        required=True,
+        validate=validate.OneOf(
+            ["entry", "exit"],
+            error="Type must be 'entry' or 'exit'."
+        ),
+        error_messages={"required": "Type is required."}
+    )
+
+
+class TransactionBatchSchema(Schema):
+    """
+    Schema for validating batch transaction payloads.
+
+    Fields:
+        items (list[dict]): Movements validated by TransactionBatchItemSchema(many=True).
+        mode (str): 'atomic' (all-or-nothing) or 'best_effort' (each item applied independently).
+    """
+    # Items field: required, non-empty list of typed transaction inputs
+    items = fields.Nested(
+        TransactionBatchItemSchema,
+        many=True,
+        required=True,
+        validate=validate.Length(
+            min=1,
+            error="Items must not be empty."
+        ),
+        error_messages={"required": "Items are required."}
+    )
+
+    # Mode field: optional, defaults to all-or-nothing
+    mode = fields.Str(
+        load_default="atomic",
+        validate=validate.OneOf(
+            ["atomic", "best_effort"],
+            error="Mode must be 'atomic' or 'best_effort'."
+        )
+    )
+
+
+class TransactionSearchSchema(Schema):
+    """
+    Schema for validating transaction search query parameters.
+
+    Every filter is optional and filters combine with AND. Pagination parameters
+    ('limit', 'cursor') are read separately and ignored here.
+
+    Fields:
+        product_id (int, optional): Only transactions of this product.
+        user_id (int, optional): Only transactions performed by this user.
+        type (str, optional): 'entry' or 'exit'.
+        from (datetime, optional): Only transactions created at or after this ISO 8601 timestamp
+            (UTC when it has no offset).
+        to (datetime, optional): Only transactions created before this ISO 8601 timestamp
+            (UTC when it has no offset).
+        min_quantity (int, optional): Smallest quantity moved, inclusive.
+        max_quantity (int, optional): Largest quantity moved, inclusive.
+    """
+    class Meta:
+        # Leave pagination parameters to the pagination helpers
+        unknown = EXCLUDE
+
+    product_id = fields.Int()
+    user_id = fields.Int()
+
+    # Type field: optional, restricted to the known transaction types
+    type = fields.Str(
+        validate=validate.OneOf(
+            ["entry", "exit"],
+            error="Type must be 'entry' or 'exit'."
+        )
+    )
+
+    # Time range: 'from' is a Python keyword, so both bounds are renamed on load.
+    # Times without an offset are read as UTC, so bounds always compare with each other
+    # and with the timezone-aware created_at column
+    date_from = fields.AwareDateTime(data_key="from", default_timezone=timezone.utc)
+    date_to = fields.AwareDateTime(data_key="to", default_timezone=timezone.utc)
+
+    # Quantity range: both bounds inclusive
+    min_quantity = fields.Int(
+        validate=validate.Range(
+            min=1,
+            error="Minimum quantity must be greater than 0."
+        )
+    )
+    max_quantity = fields.Int(
+        validate=validate.Range(
+            min=1,
+            error="Maximum quantity must be greater than 0."
+        )
+    )
+
+    @validates_schema
+    def validate_ranges(self, data, **kwargs):
+        """
+        Ensure the lower bound of each range does not exceed its upper bound.
+        """
+        if "date_from" in data and "date_to" in data and data["date_from"] > data["date_to"]:
+            raise ValidationError("'from' must not be after 'to'.", "from")
+        if "min_quantity" in data and "max_quantity" in data and data["min_quantity"] > data["max_quantity"]:
+            raise ValidationError("Minimum quantity must not exceed maximum quantity.", "min_quantity")
+
+
+class TransactionVerifySchema(Schema):
+    """
+    Schema for validating single proof verification payloads.
+
+    Either a transaction ID or an .ots file name must be given.
+
+    Fields:
+        transaction_id (int, optional): Transaction whose proof should be verified.
+        ots_filename (str, optional): Proof file to verify as is.
+    """
+    # Transaction ID field: optional, strictly an integer (no strings or floats)
+    transaction_id = fields.Int(strict=True)
+
+    # Proof file name field: optional, non-empty string
+    ots_filename = fields.Str(
+        validate=validate.Length(
+            min=1,
+            error="OTS file name must not be empty."
+        )
+    )
+
+    @validates_schema
+    def validate_selection(self, data, **kwargs):
+        """
+        Ensure a transaction ID or a proof file name selects the proof.
+        """
+        if "transaction_id" not in data and "ots_filename" not in data:
+            raise ValidationError("transaction_id or ots_filename is required.")
+
+
+class TransactionVerifyBatchSchema(Schema):
+    """
+    Schema for validating batch proof verification payloads.
+
+    Either a list of transaction IDs or a creation time range must be given, not both.
+
+    Fields:
+        transaction_ids (list[int], optional): Transactions to verify.
+        from (datetime, optional): Verify transactions created at or after this ISO 8601 timestamp
+            (UTC when it has no offset).
+        to (datetime, optional): Verify transactions created before this ISO 8601 timestamp
+            (UTC when it has no offset).
+    """
+    # Transaction IDs field: optional, non-empty list of integers
+    transaction_ids = fields.List(
+        fields.Int(),
+        validate=validate.Length(
+            min=1,
+            error="Transaction IDs must not be empty."
+        )
+    )
+
+    # Time range: 'from' is a Python keyword, so both bounds are renamed on load;
+    # times without an offset are read as UTC
+    date_from = fields.AwareDateTime(data_key="from", default_timezone=timezone.utc)
+    date_to = fields.AwareDateTime(data_key="to", default_timezone=timezone.utc)
+
+    @validates_schema
+    def validate_selection(self, data, **kwargs):
+        """
+        Ensure exactly one way of selecting transactions is used, with a complete range.
+        """
+        has_ids = "transaction_ids" in data
+        has_range = "date_from" in data or "date_to" in data
+
+        if has_ids == has_range:
+            raise ValidationError("Provide either 'transaction_ids' or a 'from'/'to' range.")
+        if has_range and not ("date_from" in data and "date_to" in data):
+            raise ValidationError("Both 'from' and 'to' are required for a range.", "from")
+        if has_range and data["date_from"] > data["date_to"]:
+            raise ValidationError("'from' must not be after 'to'.", "from")
+
+
+class ProofLinksSchema(Schema):
+    """
+    Schema for validating signed proof link requests.
+
+    Fields:
+        transaction_ids (list[int]): Transactions whose proofs should be downloadable.
+    """
+    # Transaction IDs field: required, non-empty list of integers
+    transaction_ids = fields.List(
+        fields.Int(),
+        required=True,
+        validate=validate.Length(
+            min=1,
+            error="Transaction IDs must not be empty."
+        ),
+        error_messages={"required": "Transaction IDs are required."}
+    )
+
+
+class ProofArchiveSchema(Schema):
+    """
+    Schema for validating proof archive query parameters.
+
+    A product, a creation time range, or both must be given, so an archive never
+    covers the whole ledger by accident.
+
+    Fields:
+        product_id (int, optional): Only transactions of this product.
+        from (datetime, optional): Only transactions created at or after this ISO 8601 timestamp
+            (UTC when it has no offset).
+        to (datetime, optional): Only transactions created before this ISO 8601 timestamp
+            (UTC when it has no offset).
+    """
+    product_id = fields.Int()
+
+    # Time range: 'from' is a Python keyword, so both bounds are renamed on load;
+    # times without an offset are read as UTC
+    date_from = fields.AwareDateTime(data_key="from", default_timezone=timezone.utc)
+    date_to = fields.AwareDateTime(data_key="to", default_timezone=timezone.utc)
+
+    @validates_schema
+    def validate_selection(self, data, **kwargs):
+        """
+        Ensure a product or a complete, ordered time range selects the transactions.
+        """
+        has_range = "date_from" in data or "date_to" in data
+
+        if not has_range and "product_id" not in data:
+            raise ValidationError("Provide a 'product_id', a 'from'/'to' range, or both.")
+        if has_range and not ("date_from" in data and "date_to" in data):
+            raise ValidationError("Both 'from' and 'to' are required for a range.", "from")
+        if has_range and data["date_from"] > data["date_to"]:
+            raise ValidationError("'from' must not be after 'to'.", "from")
@@ -0,0 +1,108 @@
+"""
+Archive service module.
+
+Builds ZIP archives of transaction proofs for audits. The archive is produced
+while the response is sent: transactions are read through a server-side cursor,
+each proof is added as soon as it is read, and the manifest listing every
+transaction is spooled to a temporary file and appended last. Memory use does
+not depend on the number of transactions archived.
+"""
+
+import csv
+import io
+import tempfile
+import zlib
+from app.infraDB.repositories.transactions_repositorie import TransactionsRepository
+from app.infraDB.models.transactions import ProofStatus
+from app.utils.ots_handler import build_inclusion_timestamp, read_proof
+from app.utils.zip_stream import ZipStream
+
+# Columns of manifest.csv, one row per transaction in the archive's selection
+MANIFEST_COLUMNS = ("transaction_id", "created_at", "product_id", "blockchain_hash", "proof_file", "ots_filename", "status")
+# Manifest bytes kept in memory before spilling to disk
+_MANIFEST_SPOOL_SIZE = 1024 * 1024
+
+
+def _read_archived_proof(row):
+    """
+    Read the proof of one archived transaction.
+
+    Returns:
+        bytes or None: The proof (an inclusion proof for Merkle-batched transactions),
+                       or None if it is missing or unreadable.
+    """
+    try:
+        if row.merkle_proof:
+            return build_inclusion_timestamp(row.ots_filename, row.merkle_proof)
+        return read_proof(row.ots_filename)
+    except (OSError, ValueError):
+        return None
+
+
+def stream_proof_archive(batch_size: int, date_from=None, date_to=None, product_id: int = None):
+    """
+    Stream a ZIP archive with the proofs of the selected transactions and a manifest.
+
+    Proofs are stored as 'proofs/transaction_<id>.ots'. 'manifest.csv' has one row
+    per selected transaction with its hash, the archived proof file and a status:
+    'included', 'pending' (not stamped yet), 'failed' (stamping gave up) or 'missing'
+    (proof not found on server).
+
+    The returned iterator reads from the database lazily, so it must be consumed
+    inside the application context that created it.
+
+    Args:
+        batch_size (int): Number of rows fetched from the database at a time.
+        date_from (datetime, optional): Only transactions created at or after this time.
+        date_to (datetime, optional): Only transactions created before this time.
+        product_id (int, optional): Only transactions of this product.
+
+    Yields:
+        bytes: Consecutive chunks of the ZIP archive.
+    """
+    repo = TransactionsRepository()
+    archive = ZipStream()
+    line = io.StringIO()
+    writer = csv.writer(line, lineterminator="\n")
+
+    with tempfile.SpooledTemporaryFile(max_size=_MANIFEST_SPOOL_SIZE) as manifest:
+        manifest_size, manifest_crc = 0, 0
+
+        def write_manifest_row(values):
+            nonlocal manifest_size, manifest_crc
+            line.seek(0)
+            line.truncate()
+            writer.writerow(values)
+            data = line.getvalue().encode()
+            manifest.write(data)
+            manifest_size += len(data)
+            manifest_crc = zlib.crc32(data, manifest_crc)
+
+        write_manifest_row(MANIFEST_COLUMNS)
+
+        for row in repo.iter_proof_rows(batch_size, date_from, date_to, product_id):
+            proof_file, status = "", "pending"
+            if row.proof_status == ProofStatus.FAILED:
+                status = "failed"
+            elif row.ots_filename and row.proof_status != ProofStatus.PENDING:
+                content = _read_archived_proof(row)
+                if content is None:
+                    status = "missing"
+                else:
+                    proof_file, status = f"proofs/transaction_{row.id}.ots", "included"
+                    yield archive.add(proof_file, content, modified=row.created_at)
+
+            write_manifest_row((
+                row.id,
+                row.created_at.isoformat() if row.created_at else "",
+                row.product_id,
+                row.blockchain_hash,
+                proof_file,
+                row.ots_filename or "",
+                status
+            ))
+
+        manifest.seek(0)
+        yield from archive.add_file("manifest.csv", manifest, manifest_size, manifest_crc)
+
+    yield from archive.finish()
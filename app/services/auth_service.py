@@ -2,12 +2,15 @@
 Authentication service module.
 
 Provides logic to authenticate users by verifying credentials against stored hashes
-and generating JWT tokens upon successful authentication.
+and generating JWT tokens upon successful authentication. Hashes made with an outdated
+bcrypt cost factor are replaced on successful login.
 """
 
-import bcrypt
+from flask import current_app
+from app.infraDB.config.unit_of_work import unit_of_work
 from app.infraDB.repositories.users_repository import UsersRepository
 from app.services.jwt_service import generate_jwt
+from app.utils.security import PasswordHasherBusy, check_password, hash_password, needs_rehash
 
 
 def authenticate_user(email: str, senha: str):
@@ -22,6 +25,9 @@ def authenticate_user(email: str, senha: str):
         tuple(str, Users) or None:
             On success, returns a tuple of (JWT token string, user object).
             On failure (invalid credentials), returns None.
+
+    Raises:
+        PasswordHasherBusy: If the password hashing pool is saturated.
     """
     # Instantiate repository to access user records
     repo = UsersRepository()
@@ -29,10 +35,19 @@ def authenticate_user(email: str, senha: str):
     user = repo.select_user_by_email(email=email)
 
     # Verify user exists and password matches stored hash
-    if not user or not bcrypt.checkpw(senha.encode(), user.password_hash.encode()):
+    if not user or not check_password(senha, user.password_hash):
         # Authentication failed: invalid email or password
         return None
 
+    # Upgrade the stored hash when the configured cost factor has changed
+    if needs_rehash(user.password_hash):
+        try:
+            with unit_of_work():
+                repo.update_password_hash(user.id, hash_password(senha))
+        except PasswordHasherBusy:
+            # The login itself succeeded; the rehash is retried on a later login
+            current_app.logger.info("Skipped password rehash for user %s: hasher busy", user.id)
+
     # Generate JWT token using user information
     token = generate_jwt(user)
     # Return both token and user object for further use
@@ -0,0 +1,136 @@
+"""
+Idempotency service module.
+
+Lets clients retry transaction-creating requests safely. A request carrying an
+Idempotency-Key is looked up with one probe of a unique index before any stock
+is touched: a completed request's stored response is replayed, without changing
+stock or stamping again. Otherwise the key is reserved inside the same database
+transaction as the stock change, so of two concurrent requests with the same key
+only one can commit. The response is written to the key in that same database
+transaction, before it commits and before stamping starts, so a committed
+movement always has a response to replay.
+
+Keys are scoped per user and expire after IDEMPOTENCY_KEY_TTL seconds.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app.infraDB.config.unit_of_work import unit_of_work
+from app.infraDB.repositories.idempotency_repositorie import IdempotencyRepository
+
+
+class IdempotencyConflict(Exception):
+    """
+    Raised when another request already holds the Idempotency-Key being reserved.
+    """
+
+
+def fingerprint_request(method: str, path: str, body: bytes) -> str:
+    """
+    Hash what identifies a request, so a key reused for another request can be rejected.
+
+    Args:
+        method (str): HTTP method.
+        path (str): Path with its query string.
+        body (bytes): Raw request body.
+
+    Returns:
+        str: Hex SHA256 of the method, path and body.
+    """
+    return hashlib.sha256(f"{method} {path}\n".encode() + body).hexdigest()
+
+
+def _expired(record, now) -> bool:
+    """
+    Tell whether a key has expired (naive timestamps, as returned by SQLite, are UTC).
+    """
+    expires_at = record.expires_at
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at <= now
+
+
+def find_idempotent_response(user_id: int, key: str, request_hash: str):
+    """
+    Look up an Idempotency-Key before a request is processed.
+
+    An expired key is removed and treated as unused.
+
+    Args:
+        user_id (int): User sending the request.
+        key (str): Value of the Idempotency-Key header.
+        request_hash (str): Fingerprint of the request (see fingerprint_request).
+
+    Returns:
+        dict or None: None if the key is unused. Otherwise 'state' is 'completed'
+                      (with the stored 'status' and 'body'), or 'mismatch' if the
+                      key was used for a different request.
+    """
+    repo = IdempotencyRepository()
+    record = repo.select_key(user_id, key)
+    if record is None:
+        return None
+
+    if _expired(record, datetime.now(timezone.utc)):
+        with unit_of_work():
+            repo.delete_key(record)
+        return None
+
+    if record.request_hash != request_hash:
+        return {"state": "mismatch"}
+    return {"state": "completed", "status": record.response_status, "body": record.response_body}
+
+
+def reserve_idempotency_key(user_id: int, idempotency: dict):
+    """
+    Reserve an Idempotency-Key inside the unit of work that changes stock.
+
+    The key commits or rolls back together with the transactions it covers.
+
+    Args:
+        user_id (int): User sending the request.
+        idempotency (dict): 'key', 'request_hash' and 'ttl' (seconds).
+
+    Returns:
+        IdempotencyKey: The staged key, to record the response on.
+
+    Raises:
+        IdempotencyConflict: If another request reserved the key first.
+    """
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=idempotency["ttl"])
+    try:
+        return IdempotencyRepository().insert_key(user_id, idempotency["key"], idempotency["request_hash"], expires_at)
+    except IntegrityError as e:
+        raise IdempotencyConflict("A request with this Idempotency-Key is already being processed.") from e
+
+
+def record_idempotent_response(record, body, status: int) -> str:
+    """
+    Record the response of a request on its reserved Idempotency-Key, in the same
+    unit of work, so it commits together with the movement.
+
+    Args:
+        record (IdempotencyKey): Key returned by reserve_idempotency_key.
+        body (dict): JSON-serializable response body.
+        status (int): HTTP status of the response.
+
+    Returns:
+        str: The stored body, to send the first time too, so replays are identical to it.
+    """
+    # Rendered exactly as jsonify renders it
+    rendered = current_app.json.response(body).get_data(as_text=True)
+    IdempotencyRepository().store_response(record, status, rendered)
+    return rendered
+
+
+def purge_expired_keys() -> int:
+    """
+    Remove every expired Idempotency-Key.
+
+    Returns:
+        int: Number of keys removed.
+    """
+    with unit_of_work():
+        return IdempotencyRepository().delete_expired(datetime.now(timezone.utc))
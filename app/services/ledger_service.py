@@ -0,0 +1,170 @@
+"""
+Ledger service module.
+
+Verifies the transaction hash chain in one sequential pass over the
+transactions, in ID order. Each row's chain hash is recomputed from its record
+and the previous row's chain hash; where a hash input is stored, the row's hash
+is recomputed from it too. The first mismatch is reported, since every later
+link depends on it.
+
+A successful pass leaves a checkpoint, and the next run can resume from it
+instead of re-reading the whole ledger.
+
+Transaction hashes can also be recomputed in bulk from their canonical records,
+on a pool of processes, to flag rows whose columns no longer match their hash.
+"""
+
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from app.infraDB.config.unit_of_work import unit_of_work
+from app.infraDB.repositories.ledger_repositorie import LedgerRepository
+from app.utils.hash_generator import canonical_transaction_record, hash_transaction_record, is_canonical_record
+from app.utils.ledger import GENESIS_HASH, link_hash
+
+
+def _broken(checked: int, transaction_id, reason: str) -> dict:
+    """
+    Shape the result of a verification that found a broken link.
+    """
+    return {"valid": False, "checked": checked, "transaction_id": transaction_id, "reason": reason}
+
+
+def verify_ledger(batch_size: int, resume: bool = False) -> dict:
+    """
+    Verify the transaction hash chain up to its current head.
+
+    Transactions recorded while the verification runs are left for the next one.
+
+    Args:
+        batch_size (int): Number of rows fetched from the database at a time.
+        resume (bool, optional): Start after the last checkpoint instead of the first transaction.
+
+    Returns:
+        dict: 'valid', 'checked' (transactions verified), and either the verified head
+              ('transaction_id', 'chain_hash') or the first broken link ('transaction_id', 'reason').
+    """
+    repo = LedgerRepository()
+
+    # Fix the end of the pass first: rows up to the head are committed together with it
+    head = repo.select_head()
+    head_id = head.transaction_id if head else None
+    head_hash = head.chain_hash if head else GENESIS_HASH
+
+    after_id, chain_hash = None, GENESIS_HASH
+    if resume:
+        checkpoint = repo.select_last_checkpoint()
+        if checkpoint is not None:
+            # The checkpointed row must still carry the hash that was verified
+            if repo.select_chain_hash(checkpoint.transaction_id) != checkpoint.chain_hash:
+                return _broken(0, checkpoint.transaction_id, "checkpointed transaction was changed or deleted")
+            after_id, chain_hash = checkpoint.transaction_id, checkpoint.chain_hash
+
+    checked = 0
+    last_id = after_id
+    if head_id is not None:
+        for row in repo.iter_chain(batch_size, after_id=after_id, until_id=head_id):
+            if row.hash_input is not None and hashlib.sha256(row.hash_input.encode()).hexdigest() != row.blockchain_hash:
+                return _broken(checked, row.id, "blockchain_hash does not match its hash input")
+
+            expected = link_hash(chain_hash, row)
+            if row.chain_hash != expected:
+                return _broken(checked, row.id, "chain hash does not match the previous transaction and this record")
+
+            chain_hash, last_id = expected, row.id
+            checked += 1
+
+    # Rows removed from the end of the ledger leave the head pointing past the last link
+    if last_id != head_id or chain_hash != head_hash:
+        return _broken(checked, head_id, "ledger head does not match the last transaction")
+
+    if checked:
+        with unit_of_work():
+            repo.insert_checkpoint(last_id, chain_hash)
+
+    return {"valid": True, "checked": checked, "transaction_id": last_id, "chain_hash": chain_hash}
+
+
+def _rehash_batch(rows: list) -> tuple:
+    """
+    Recompute the hashes of a batch of transactions (runs in a worker process).
+
+    Args:
+        rows (list[tuple]): (id, product_id, quantity, type, user_id, created_at,
+            hash_input, blockchain_hash) per transaction.
+
+    Returns:
+        tuple(dict, list[tuple]): Counts per outcome, and (transaction_id, reason) per mismatch.
+    """
+    counts = {"canonical": 0, "legacy": 0, "mismatch": 0}
+    mismatches = []
+
+    for transaction_id, product_id, quantity, transaction_type, user_id, created_at, hash_input, blockchain_hash in rows:
+        if hash_input is None:
+            # Recorded before hash inputs were kept: nothing to recompute from
+            counts["legacy"] += 1
+        elif hash_transaction_record(hash_input).hex() != blockchain_hash:
+            counts["mismatch"] += 1
+            mismatches.append((transaction_id, "blockchain_hash does not match its hash input"))
+        elif not is_canonical_record(hash_input):
+            counts["legacy"] += 1
+        elif canonical_transaction_record(product_id, quantity, transaction_type, user_id, created_at) != hash_input:
+            counts["mismatch"] += 1
+            mismatches.append((transaction_id, "row no longer matches its hashed record"))
+        else:
+            counts["canonical"] += 1
+
+    return counts, mismatches
+
+
+def rehash_transactions(batch_size: int, workers: int, on_mismatch=None) -> dict:
+    """
+    Recompute every transaction hash from its stored input and canonical record.
+
+    Rows are streamed from the database and checked in batches on a pool of
+    worker processes; at most two batches per worker are in flight, so memory
+    use does not grow with the ledger. Hashes are never rewritten: proofs and
+    the hash chain commit to them.
+
+    Args:
+        batch_size (int): Number of rows per batch.
+        workers (int): Number of worker processes.
+        on_mismatch (callable, optional): Called with (transaction_id, reason) per mismatch, in ID order.
+
+    Returns:
+        dict: Number of transactions 'checked', and per outcome: 'canonical' (hash recomputed
+              from the row), 'legacy' (recorded without a canonical record) and 'mismatch'.
+    """
+    repo = LedgerRepository()
+    rows = (
+        (row.id, row.product_id, row.quantity, row.type.value, row.user_id, row.created_at,
+         row.hash_input, row.blockchain_hash)
+        for row in repo.iter_chain(batch_size)
+    )
+    totals = {"checked": 0, "canonical": 0, "legacy": 0, "mismatch": 0}
+
+    def collect(future):
+        counts, mismatches = future.result()
+        for key, value in counts.items():
+            totals[key] += value
+            totals["checked"] += value
+        for transaction_id, reason in mismatches:
+            if on_mismatch:
+                on_mismatch(transaction_id, reason)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            in_flight.append(pool.submit(_rehash_batch, batch))
+            # Bound the batches waiting for a worker; results are collected in ID order
+            if len(in_flight) >= 2 * workers:
+                collect(in_flight.popleft())
+
+        while in_flight:
+            collect(in_flight.popleft())
+
+    return totals
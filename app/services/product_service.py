@@ -4,8 +4,10 @@ Product service module.
 Contains business logic for product operations, including creation, retrieval,
 update, and deletion, interacting with ProductsRepository for persistence and
 applying domain rules such as uniqueness checks and data normalization.
+Each write operation runs in a single unit of work.
 """
 
+from app.infraDB.config.unit_of_work import unit_of_work
 from app.infraDB.repositories.products_repositorie import ProductsRepository
 
 
@@ -42,8 +44,9 @@ def create_product(data):
     if existing:
         raise ValueError("A product with this name already exists.")
 
-    # Delegate insertion to repository
-    produto = repo.insert_product(data)
+    # Delegate insertion to repository and commit it
+    with unit_of_work():
+        produto = repo.insert_product(data)
     return produto
 
 
@@ -56,7 +59,8 @@ def get_all_products(name=None, code=None):
         code (str, optional): Exact product code to filter.
 
     Returns:
-        list[Products]: List of matching product instances (empty if none found).
+        list[Products] or list[Row]: Matching product instances (empty if none found),
+                                     or read-only rows when listing every product.
     """
     repo = ProductsRepository()
 
@@ -126,14 +130,16 @@ def update_product(id: int, data: dict):
     if data.get("current_stock") is not None and data.get("add_stock") is not None:
         raise ValueError("Use only current_stock OR add_stock")
 
-    # Delegate update to repository with validated fields
-    return repo.update_product(
-        id=id,
-        name=data.get("name"),
-        category=data.get("category"),
-        current_stock=data.get("current_stock"),
-        add_stock=data.get("add_stock")
-    )
+    # Delegate update to repository with validated fields and commit it
+    with unit_of_work():
+        product = repo.update_product(
+            id=id,
+            name=data.get("name"),
+            category=data.get("category"),
+            current_stock=data.get("current_stock"),
+            add_stock=data.get("add_stock")
+        )
+    return product
 
 
 def delete_product(id: int):
@@ -151,7 +157,8 @@ def delete_product(id: int):
     """
     repo = ProductsRepository()
     # Attempt deletion; repository returns True if deleted
-    deleted = repo.delete_product(id)
+    with unit_of_work():
+        deleted = repo.delete_product(id)
     if not deleted:
         # No record deleted implies non-existence
         raise ValueError("Product not found")
\ No newline at end of file
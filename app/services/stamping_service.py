@@ -0,0 +1,381 @@
+"""
+Stamping service module.
+
+Runs OpenTimestamps stamping off the request path: transactions are committed
+with a pending proof, and a pool of background workers creates the .ots files
+and records the outcome on the transaction afterwards.
+
+In 'batch' mode, workers collect hashes over a time window, build a Merkle tree,
+stamp only its root and store each transaction's inclusion proof.
+
+Queued jobs only live in memory, so a process that dies loses them and their
+transactions stay pending. A recovery sweep submits such transactions again once
+they have been pending for OTS_STAMP_RECOVER_AFTER seconds. A failed attempt
+(calendars unreachable, ...) keeps the proof pending and schedules a retry with
+exponential backoff; the proof only becomes failed after OTS_STAMP_MAX_ATTEMPTS.
+"""
+
+import atexit
+import hashlib
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from app.infraDB.config.unit_of_work import unit_of_work
+from app.infraDB.models.transactions import ProofStatus
+from app.infraDB.repositories.transactions_repositorie import TransactionsRepository
+from app.utils.merkle import build_merkle_tree
+from app.utils.ots_handler import create_timestamp_file
+
+# Marker placed on the queue to tell a worker to exit
+_STOP = object()
+
+
+class StampingQueue:
+    """
+    Queue of pending stamping jobs served by a pool of worker threads.
+
+    Workers are started lazily on the first submitted job, so CLI commands
+    such as 'flask db upgrade' never spawn threads. On interpreter exit the
+    queue is drained before the workers are stopped. When OTS_STAMP_RECOVER_INTERVAL
+    is positive, a recovery thread started with the first request served re-submits
+    stale pending transactions at that interval, beginning at start-up.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._queue = None
+        self._workers = []
+        self._num_workers = 0
+        self._batch_mode = False
+        self._batch_window = 0
+        self._batch_max_size = 1
+        self._recover_after = 600
+        self._recover_interval = 0
+        self._max_attempts = 8
+        self._backoff_base = 60
+        self._backoff_max = 3600
+        self._recovery_thread = None
+        self._stop = threading.Event()
+        # Transactions submitted by this process and not stamped yet
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._collect_lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Bind the queue to a Flask application and read its configuration.
+
+        Args:
+            app (Flask): The application whose context workers run in.
+        """
+        self._app = app
+        self._num_workers = app.config["OTS_STAMP_WORKERS"]
+        self._batch_mode = app.config["OTS_STAMP_MODE"] == "batch"
+        self._batch_window = app.config["OTS_BATCH_WINDOW_MS"] / 1000
+        self._batch_max_size = max(1, app.config["OTS_BATCH_MAX_SIZE"])
+        self._queue = queue.Queue(maxsize=app.config["OTS_STAMP_QUEUE_SIZE"])
+        self._recover_after = app.config["OTS_STAMP_RECOVER_AFTER"]
+        self._recover_interval = app.config["OTS_STAMP_RECOVER_INTERVAL"]
+        self._max_attempts = max(1, app.config["OTS_STAMP_MAX_ATTEMPTS"])
+        self._backoff_base = max(1, app.config["OTS_STAMP_BACKOFF_BASE"])
+        self._backoff_max = app.config["OTS_STAMP_BACKOFF_MAX"]
+        app.extensions["stamping_queue"] = self
+        atexit.register(self.shutdown)
+
+        if self._recover_interval > 0:
+            app.before_request(self.start_recovery)
+
+    def submit(self, transaction_id: int, hash_bytes: bytes):
+        """
+        Schedule a transaction hash for stamping.
+
+        Blocks while the queue is full, which applies backpressure to producers.
+        With OTS_STAMP_WORKERS set to 0, the hash is stamped inline instead.
+
+        Args:
+            transaction_id (int): Identifier of the committed transaction.
+            hash_bytes (bytes): Transaction hash to be timestamped.
+        """
+        job = (transaction_id, hash_bytes)
+        with self._lock:
+            self._in_flight.add(transaction_id)
+
+        if self._num_workers <= 0:
+            if self._batch_mode:
+                self._stamp_batch([job])
+            else:
+                self._stamp(job)
+            return
+
+        self._ensure_started()
+        self._queue.put(job)
+
+    def wait_idle(self):
+        """
+        Block until every queued job has been processed.
+        """
+        if self._num_workers > 0:
+            self._queue.join()
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Delay before retrying a transaction whose stamping failed.
+
+        Args:
+            attempts (int): Failed attempts so far, including the one that just failed.
+
+        Returns:
+            float: Seconds to wait, doubling per attempt up to OTS_STAMP_BACKOFF_MAX.
+        """
+        return min(self._backoff_max, self._backoff_base * 2 ** max(0, attempts - 1))
+
+    def recover(self, older_than: float = None, batch_size: int = 500, include_failed: bool = False) -> int:
+        """
+        Submit again the transactions whose proof is pending and needs an attempt.
+
+        These are transactions pending for too long without any attempt, whose job
+        was lost with the process that queued it (crash, kill, deploy), and those
+        whose failed attempt is due for a retry. Transactions this process still
+        has queued are skipped; another process re-submitting a live job only
+        stamps the same hash twice, and the last proof written wins.
+
+        Args:
+            older_than (float, optional): Seconds a proof must have been pending;
+                defaults to OTS_STAMP_RECOVER_AFTER.
+            batch_size (int, optional): Transactions read per query.
+            include_failed (bool, optional): Also retry the proofs whose stamping gave up.
+
+        Returns:
+            int: Number of transactions submitted.
+        """
+        if older_than is None:
+            older_than = self._recover_after
+        now = datetime.now(timezone.utc)
+        created_before = now - timedelta(seconds=older_than)
+
+        if include_failed:
+            with self._app.app_context(), unit_of_work():
+                TransactionsRepository().reset_failed_stamps(now)
+
+        submitted, after_id = 0, 0
+        while not self._stop.is_set():
+            with self._app.app_context():
+                rows = TransactionsRepository().select_stale_pending(created_before, now, batch_size, after_id)
+            if not rows:
+                break
+
+            for row in rows:
+                with self._lock:
+                    queued = row.id in self._in_flight
+                if not queued:
+                    self.submit(row.id, bytes.fromhex(row.blockchain_hash))
+                    submitted += 1
+            after_id = rows[-1].id
+
+        return submitted
+
+    def start_recovery(self):
+        """
+        Start the recovery thread, which sweeps every OTS_STAMP_RECOVER_INTERVAL seconds.
+        """
+        if self._recovery_thread is not None:
+            return
+
+        with self._lock:
+            if self._recovery_thread is None:
+                self._recovery_thread = threading.Thread(target=self._run_recovery, name="ots-recover", daemon=True)
+                self._recovery_thread.start()
+
+    def _run_recovery(self):
+        """
+        Recovery loop: re-submit stale pending transactions, then sleep until the next sweep.
+        """
+        while not self._stop.is_set():
+            try:
+                submitted = self.recover()
+                if submitted:
+                    self._app.logger.warning("Re-submitted %d stale pending transaction(s) for stamping", submitted)
+            except Exception:
+                # A failing sweep must never take the recovery thread down with it
+                self._app.logger.exception("Stamping recovery sweep failed")
+            self._stop.wait(self._recover_interval)
+
+    def shutdown(self, timeout: float = None):
+        """
+        Stop the recovery thread, then the workers after every queued job has been processed.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for each worker.
+        """
+        self._stop.set()
+        with self._lock:
+            workers, self._workers = self._workers, []
+
+        # Sentinels are queued behind pending jobs, so the queue drains first
+        for _ in workers:
+            self._queue.put(_STOP)
+        for worker in workers:
+            worker.join(timeout)
+
+    def _ensure_started(self):
+        """
+        Start the worker pool if it is not running yet.
+        """
+        with self._lock:
+            if self._workers:
+                return
+            for index in range(self._num_workers):
+                worker = threading.Thread(
+                    target=self._run_batches if self._batch_mode else self._run,
+                    name=f"ots-stamper-{index}",
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def _run(self):
+        """
+        Worker loop: stamp jobs until a stop marker is received.
+        """
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._stamp(job)
+            except Exception:
+                # A failing job must never take the worker down with it
+                self._app.logger.exception("Stamping job %s could not be processed", job[0])
+            finally:
+                self._queue.task_done()
+
+    def _run_batches(self):
+        """
+        Worker loop for batch mode: group jobs into windows and stamp each window once.
+
+        A window opens with the first job received and closes after OTS_BATCH_WINDOW_MS
+        or OTS_BATCH_MAX_SIZE jobs. A stop marker closes the window and ends the loop
+        once the collected jobs are stamped.
+        """
+        stopping = False
+        while not stopping:
+            # One worker collects a window at a time; the others stamp earlier windows
+            with self._collect_lock:
+                batch = [self._queue.get()]
+                if batch[0] is _STOP:
+                    self._queue.task_done()
+                    return
+
+                deadline = time.monotonic() + self._batch_window
+                while len(batch) < self._batch_max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        job = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if job is _STOP:
+                        stopping = True
+                        self._queue.task_done()
+                        break
+                    batch.append(job)
+
+            try:
+                self._stamp_batch(batch)
+            except Exception:
+                # A failing batch must never take the worker down with it
+                self._app.logger.exception("Stamping batch of %s jobs could not be processed", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _stamp(self, job):
+        """
+        Stamp a single transaction hash and persist the resulting proof status.
+
+        Args:
+            job (tuple): (transaction_id, hash_bytes) to process.
+        """
+        transaction_id, hash_bytes = job
+
+        try:
+            with self._app.app_context():
+                repo = TransactionsRepository()
+                try:
+                    ots_filename, proof_hash = create_timestamp_file(hash_bytes)
+                except Exception as e:
+                    # Keep the ledger row; only the proof is missing, until a retry succeeds
+                    self._app.logger.error("Stamping transaction %s failed: %s", transaction_id, e)
+                    self._record_failure(repo, [transaction_id])
+                    return
+
+                with unit_of_work():
+                    repo.update_proof(transaction_id, ots_filename, ProofStatus.STAMPED, proof_hash)
+        finally:
+            self._settled([transaction_id])
+
+    def _stamp_batch(self, jobs):
+        """
+        Stamp the Merkle root of a batch of transaction hashes and persist every inclusion proof.
+
+        Leaves are the SHA256 of each transaction hash, i.e. the digest a per-transaction
+        .ots proof would commit to, so each inclusion proof extends into a regular proof.
+
+        Args:
+            jobs (list[tuple]): (transaction_id, hash_bytes) entries to stamp.
+        """
+        leaves = [hashlib.sha256(hash_bytes).digest() for _, hash_bytes in jobs]
+        root, proofs = build_merkle_tree(leaves)
+
+        try:
+            with self._app.app_context():
+                repo = TransactionsRepository()
+                try:
+                    root_filename, proof_hash = create_timestamp_file(root)
+                except Exception as e:
+                    # Keep the ledger rows; only the proofs are missing, until a retry succeeds
+                    self._app.logger.error("Stamping batch %s failed: %s", root.hex(), e)
+                    self._record_failure(repo, [job[0] for job in jobs])
+                    return
+
+                with unit_of_work():
+                    repo.update_batch_proofs(
+                        {job[0]: proof for job, proof in zip(jobs, proofs)},
+                        root_filename,
+                        ProofStatus.STAMPED,
+                        proof_hash
+                    )
+        finally:
+            self._settled([job[0] for job in jobs])
+
+    def _record_failure(self, repo, transaction_ids: list):
+        """
+        Schedule a retry of failed stamping attempts, or give up after OTS_STAMP_MAX_ATTEMPTS.
+
+        Args:
+            repo (TransactionsRepository): Repository used for the updates.
+            transaction_ids (list[int]): Transactions whose attempt failed.
+        """
+        now = datetime.now(timezone.utc)
+        with unit_of_work():
+            for transaction_id, attempts in repo.select_stamp_attempts(transaction_ids).items():
+                attempts += 1
+                if attempts >= self._max_attempts:
+                    self._app.logger.error("Giving up stamping transaction %s after %d attempts", transaction_id, attempts)
+                    next_stamp_at = None
+                else:
+                    next_stamp_at = now + timedelta(seconds=self.backoff(attempts))
+                repo.record_stamp_failure(transaction_id, attempts, next_stamp_at)
+
+    def _settled(self, transaction_ids: list):
+        """
+        Forget jobs that were processed, whatever their outcome.
+        """
+        with self._lock:
+            self._in_flight.difference_update(transaction_ids)
+
+
+# Shared queue instance, bound to the application in create_app
+stamping_queue = StampingQueue()
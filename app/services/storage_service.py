@@ -0,0 +1,103 @@
+"""
+Storage service module.
+
+Moves proofs written under the legacy flat layout ('transaction_..._<time>.bin.ots'
+next to its '.bin' copy of the hash) to the content-addressed layout
+('ab/cd/<sha256>.ots') and points the transactions to their new names. With
+OTS_STORAGE=packed, the same run also moves loose proof files into the segments.
+"""
+
+import os
+from app.infraDB.config.unit_of_work import unit_of_work
+from app.infraDB.repositories.transactions_repositorie import TransactionsRepository
+from app.utils.ots_handler import (
+    OTS_HEADER_MAGIC,
+    OTS_MAJOR_VERSION,
+    OTS_OP_SHA256,
+    is_storage_name,
+    ots_storage_name,
+    proof_exists,
+    proof_path,
+    write_proof,
+)
+
+
+def _read_legacy_file(ots_filename: str) -> tuple:
+    """
+    Read a proof that still sits in a file of its own.
+
+    Returns:
+        tuple(bytes, bytes): The proof, and the digest it commits to.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not a SHA256 OpenTimestamps proof.
+    """
+    with open(proof_path(ots_filename), "rb") as f:
+        content = f.read()
+
+    prefix = OTS_HEADER_MAGIC + OTS_MAJOR_VERSION + OTS_OP_SHA256
+    if not content.startswith(prefix) or len(content) < len(prefix) + 32:
+        raise ValueError("Unsupported OTS proof format")
+    return content, content[len(prefix):len(prefix) + 32]
+
+
+def migrate_proof_storage(dry_run: bool = False, logger=None) -> dict:
+    """
+    Rehome every legacy proof file under its content-addressed name, in the
+    configured proof store.
+
+    Each file is copied to the store before the transactions are updated,
+    and the legacy files are only removed once that update is committed, so an
+    interrupted run can simply be started again.
+
+    Args:
+        dry_run (bool, optional): Only count what would be moved.
+        logger (Logger, optional): Receives one line per file that cannot be moved.
+
+    Returns:
+        dict: Number of proof files 'moved', already 'current', 'missing' and 'invalid'.
+    """
+    repo = TransactionsRepository()
+    counts = {"moved": 0, "current": 0, "missing": 0, "invalid": 0}
+
+    for old_filename in repo.select_ots_filenames():
+        try:
+            if is_storage_name(old_filename) and proof_exists(old_filename):
+                counts["current"] += 1
+                continue
+            content, digest = _read_legacy_file(old_filename)
+        except FileNotFoundError:
+            counts["missing"] += 1
+            if logger:
+                logger.warning("Proof %s not found, left as is", old_filename)
+            continue
+        except (OSError, ValueError) as e:
+            counts["invalid"] += 1
+            if logger:
+                logger.warning("Proof %s not moved: %s", old_filename, e)
+            continue
+
+        counts["moved"] += 1
+        if dry_run:
+            continue
+
+        new_filename = ots_storage_name(digest)
+        old_path = proof_path(old_filename)
+
+        # Proofs of the same data are interchangeable: keep one already in place
+        if not proof_exists(new_filename):
+            write_proof(new_filename, content)
+
+        if new_filename != old_filename:
+            with unit_of_work():
+                repo.rename_ots_file(old_filename, new_filename)
+
+        # The legacy proof and its copy of the hash are no longer referenced
+        os.remove(old_path)
+        legacy_data = old_path[:-len(".ots")] if old_path.endswith(".ots") else None
+        if legacy_data and os.path.isfile(legacy_data):
+            os.remove(legacy_data)
+
+    return counts
+
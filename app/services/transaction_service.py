@@ -3,36 +3,119 @@ Transaction service module.
 
 Implements business logic for entry and exit transactions,
 including stock adjustments, hash generation, and retrieval/deletion operations,
-interacting with ProductsRepository and TransactionsRepository.
+interacting with ProductsRepository and TransactionsRepository. The stock change
+and the ledger row of a movement are committed together in one unit of work;
+OpenTimestamps stamping is handed to the background stamping queue afterwards.
 """
 
-import os
-from app.utils.ots_handler import OTS_FOLDER
+import hashlib
+import time
+from datetime import datetime, timezone
+from app.utils.ots_handler import OTS_FOLDER, build_inclusion_timestamp, proof_exists, proof_file_path, read_proof
+from app.infraDB.config.unit_of_work import unit_of_work, savepoint
 from app.infraDB.repositories.transactions_repositorie import TransactionsRepository
 from app.infraDB.repositories.products_repositorie import ProductsRepository
-from app.infraDB.models.transactions import TransactionType
-from app.utils.hash_generator import (
-    generate_transaction_hash_hex,
-    generate_transaction_hash_bytes,
-    generate_ots_filename,
-)
-from app.utils.ots_handler import create_timestamp_file
+from app.infraDB.repositories.ledger_repositorie import LedgerRepository
+from app.infraDB.models.transactions import TransactionType, ProofStatus
+from app.utils.hash_generator import canonical_transaction_record, hash_transaction_record
+from app.utils.ledger import link_hash
+from app.utils.pagination import encode_cursor
+from app.utils.signed_urls import sign_proof_link
+from app.services.stamping_service import stamping_queue
+from app.services.idempotency_service import reserve_idempotency_key, record_idempotent_response
+from app.utils.formatters import format_transaction, format_batch_results
+
+
+def _record_transaction(transaction_repo, product_id, quantity, transaction_type, user_id):
+    """
+    Generate the hash of a stock movement and stage its ledger row.
+
+    The hash is computed once, from the canonical record of the row (including the
+    created_at it is persisted with); its hex form is stored and its bytes are stamped.
+
+    Args:
+        transaction_repo (TransactionsRepository): Repository used to stage the row.
+        product_id (int): ID of the moved product.
+        quantity (int): Quantity moved.
+        transaction_type (TransactionType): ENTRY or EXIT.
+        user_id (int): ID of the user performing the transaction.
+
+    Returns:
+        tuple(Transactions, bytes): The staged transaction and the hash to stamp.
+    """
+    # Fix the creation time first: it is part of the hashed record
+    created_at = datetime.now(timezone.utc)
+    hash_input = canonical_transaction_record(product_id, quantity, transaction_type.value, user_id, created_at)
+    hash_bytes = hash_transaction_record(hash_input)
 
+    # Save transaction with hash; its proof stays pending until stamped
+    transaction = transaction_repo.insert_transaction(
+        product_id=product_id,
+        type=transaction_type,
+        quantity=quantity,
+        blockchain_hash=hash_bytes.hex(),
+        hash_input=hash_input,
+        user_id=user_id,
+        created_at=created_at
+    )
+
+    return transaction, hash_bytes
 
-def create_entry_transaction(data, user_id, user_email):
+
+def _link_transactions(ledger_repo, head, transactions):
     """
-    Process an entry transaction: increase stock, generate hash, and record transaction.
+    Chain newly recorded transactions to the ledger, in ID order.
+
+    Args:
+        ledger_repo (LedgerRepository): Repository that moves the chain head.
+        head (LedgerHead): Chain head locked before the transactions were inserted.
+        transactions (list[Transactions]): Flushed transactions to link.
+    """
+    chain_hash = head.chain_hash
+    last = None
+    for transaction in sorted(transactions, key=lambda t: t.id):
+        chain_hash = link_hash(chain_hash, transaction)
+        transaction.chain_hash = chain_hash
+        last = transaction
+
+    if last is not None:
+        ledger_repo.advance_head(head, last.id, chain_hash)
+
+
+def _stock_error(product_repo, product_id):
+    """
+    Explain why a conditional stock update matched no row.
+
+    Args:
+        product_repo (ProductsRepository): Repository used for the existence probe.
+        product_id (int): ID of the product whose update failed.
+
+    Returns:
+        str: 'Product not found' or 'Insufficient stock for transaction'.
+    """
+    if not product_repo.product_exists(product_id):
+        return "Product not found"
+    return "Insufficient stock for transaction"
+
+
+def create_entry_transaction(data, user_id, idempotency=None):
+    """
+    Process an entry transaction: increase stock, generate hash, record transaction,
+    and schedule its OpenTimestamps proof.
 
     Args:
         data (dict): Input data with 'product_id' and 'quantity'.
         user_id (int): ID of the user performing the transaction.
-        user_email (str): Email of the user performing the transaction.
+        idempotency (dict, optional): Idempotency-Key to reserve with the stock change
+            ('key', 'request_hash', 'ttl'); see idempotency_service. Its stored response
+            body is set as 'response'.
 
     Returns:
-        Transactions: The created entry transaction instance.
+        Transactions: The created entry transaction instance, with a pending proof.
 
     Raises:
         ValueError: If the product is not found.
+        IdempotencyConflict: If another request holds the same Idempotency-Key.
     """
     # Extract relevant fields from input
     product_id = data["product_id"]
@@ -41,47 +124,53 @@ def create_entry_transaction(data, user_id, user_email):
     # Initialize repositories
     product_repo = ProductsRepository()
     transaction_repo = TransactionsRepository()
+    ledger_repo = LedgerRepository()
 
-    # Add stock to product; returns None if product does not exist
-    product = product_repo.add_stock(product_id, quantity)
-    if not product:
-        raise ValueError("Product not found")
+    # Stock change and ledger row are committed together, or not at all
+    with unit_of_work():
+        # A retry of this request cannot commit alongside it
+        reservation = reserve_idempotency_key(user_id, idempotency) if idempotency else None
 
-    # Generate hash (hex and binary) and filename
-    hash_bytes = generate_transaction_hash_bytes(product_id, quantity, "entry", user_email)
-    hash_hex = generate_transaction_hash_hex(product_id, quantity, "entry", user_email)
-    ots_filename = generate_ots_filename(product_id, quantity, "entry", user_email)
+        # Add stock to product; returns None if product does not exist
+        product = product_repo.add_stock(product_id, quantity)
+        if not product:
+            raise ValueError("Product not found")
 
-    # Create the .ots
-    create_timestamp_file(hash_bytes, ots_filename)
+        # Lock the chain head last, only for inserting and linking the row
+        head = ledger_repo.lock_head()
+        transaction, hash_bytes = _record_transaction(
+            transaction_repo, product_id, quantity, TransactionType.ENTRY, user_id
+        )
+        _link_transactions(ledger_repo, head, [transaction])
 
-    # Save transaction with hash and .ots name
-    transaction = transaction_repo.insert_transaction(
-        product_id=product_id,
-        type=TransactionType.ENTRY,
-        quantity=quantity,
-        blockchain_hash=hash_hex,
-        user_id=user_id,
-        ots_filename=ots_filename + ".ots"
-    )
+        # The response to replay commits with the movement, before stamping starts
+        if reservation is not None:
+            idempotency["response"] = record_idempotent_response(reservation, format_transaction(transaction), 201)
+
+    # Create the .ots in the background, once the transaction is committed
+    stamping_queue.submit(transaction.id, hash_bytes)
 
     return transaction
 
 
-def create_exit_transaction(data, user_email, user_id):
+def create_exit_transaction(data, user_id, idempotency=None):
     """
-    Process an exit transaction: verify stock, decrease stock, generate hash, and record transaction.
+    Process an exit transaction: atomically check and decrease stock, generate hash,
+    record transaction, and schedule its OpenTimestamps proof.
 
     Args:
         data (dict): Input data with 'product_id' and 'quantity'.
-        user_email (str): Email of the user performing the transaction.
         user_id (int): ID of the user performing the transaction.
+        idempotency (dict, optional): Idempotency-Key to reserve with the stock change
+            ('key', 'request_hash', 'ttl'); see idempotency_service. Its stored response
+            body is set as 'response'.
 
     Returns:
-        Transactions: The created exit transaction instance.
+        Transactions: The created exit transaction instance, with a pending proof.
 
     Raises:
         ValueError: If the product is not found or stock is insufficient.
+        IdempotencyConflict: If another request holds the same Idempotency-Key.
     """
     # Extract relevant fields from input
     product_id = data["product_id"]
@@ -90,77 +179,252 @@ def create_exit_transaction(data, user_email, user_id):
     # Initialize repositories
     product_repo = ProductsRepository()
     transaction_repo = TransactionsRepository()
+    ledger_repo = LedgerRepository()
 
-    # Fetch product to check availability
-    product = product_repo.select_product_by_id(product_id)
-    if not product:
-        raise ValueError("Product not found")
+    # Stock change and ledger row are committed together, or not at all
+    with unit_of_work():
+        # A retry of this request cannot commit alongside it
+        reservation = reserve_idempotency_key(user_id, idempotency) if idempotency else None
 
-    # Ensure sufficient stock exists for exit transaction
-    if product.current_stock < quantity:
-        raise ValueError("Insufficient stock for transaction")
+        # Check and remove stock in a single conditional UPDATE
+        product = product_repo.remove_stock(product_id, quantity)
+        if not product:
+            # No row matched: tell a missing product apart from insufficient stock
+            raise ValueError(_stock_error(product_repo, product_id))
 
-    # Remove stock from product
-    product_repo.remove_stock(product_id, quantity)
+        # Lock the chain head last, only for inserting and linking the row
+        head = ledger_repo.lock_head()
+        transaction, hash_bytes = _record_transaction(
+            transaction_repo, product_id, quantity, TransactionType.EXIT, user_id
+        )
+        _link_transactions(ledger_repo, head, [transaction])
 
-    # Generate hash (hex and binary) and filename
-    hash_bytes = generate_transaction_hash_bytes(product_id, quantity, "exit", user_email)
-    hash_hex = generate_transaction_hash_hex(product_id, quantity, "exit", user_email)
-    ots_filename = generate_ots_filename(product_id, quantity, "exit", user_email)
+        # The response to replay commits with the movement, before stamping starts
+        if reservation is not None:
+            idempotency["response"] = record_idempotent_response(reservation, format_transaction(transaction), 201)
 
-    # Create the .ots
-    create_timestamp_file(hash_bytes, ots_filename)
-
-    # Save transaction with hash and .ots name
-    transaction = transaction_repo.insert_transaction(
-        product_id=product_id,
-        type=TransactionType.EXIT,
-        quantity=quantity,
-        blockchain_hash=hash_hex,
-        user_id=user_id,
-        ots_filename=ots_filename + ".ots"
-    )
+    # Create the .ots in the background, once the transaction is committed
+    stamping_queue.submit(transaction.id, hash_bytes)
 
     return transaction
 
 
-def get_all_transactions_service():
+def create_batch_transactions(items, user_id, mode="atomic", idempotency=None):
+    """
+    Process a batch of entry and exit transactions in a single database transaction.
+
+    In 'atomic' mode, the quantities of all items are summed per product and each
+    product's stock is changed once, in product ID order; if any product is missing
+    or would end with negative stock, nothing is applied. In 'best_effort' mode,
+    items are applied one by one (grouped per product) inside their own savepoint,
+    so a failing item is rolled back without affecting the others.
+
+    Args:
+        items (list[dict]): Items with 'product_id', 'quantity' and 'type' ('entry' or 'exit').
+        user_id (int): ID of the user performing the transactions.
+        mode (str, optional): 'atomic' (default) or 'best_effort'.
+        idempotency (dict, optional): Idempotency-Key to reserve with the stock change
+            ('key', 'request_hash', 'ttl'); see idempotency_service. Its stored response
+            body is set as 'response'.
+
+    Returns:
+        list[dict]: One result per item, in input order, with 'index', 'status'
+        ('created' or 'failed') and either 'transaction' or 'error'.
+
+    Raises:
+        ValueError: In 'atomic' mode, if any product is not found or has insufficient stock.
+        IdempotencyConflict: If another request holds the same Idempotency-Key.
+    """
+    product_repo = ProductsRepository()
+    transaction_repo = TransactionsRepository()
+    ledger_repo = LedgerRepository()
+
+    results = [None] * len(items)
+    applied = []
+    stamps = []
+    created = []
+
+    with unit_of_work():
+        # A retry of this request cannot commit alongside it
+        reservation = reserve_idempotency_key(user_id, idempotency) if idempotency else None
+
+        if mode == "atomic":
+            # Net stock change per product; sorted IDs keep row lock order consistent
+            deltas = {}
+            for item in items:
+                sign = 1 if item["type"] == TransactionType.ENTRY.value else -1
+                deltas[item["product_id"]] = deltas.get(item["product_id"], 0) + sign * item["quantity"]
+
+            for product_id in sorted(deltas):
+                if not product_repo.adjust_stock(product_id, deltas[product_id]):
+                    raise ValueError(f"{_stock_error(product_repo, product_id)} (product {product_id})")
+
+            applied = list(range(len(items)))
+
+        else:
+            # Stable sort: items of a product keep their relative order
+            for index in sorted(range(len(items)), key=lambda i: items[i]["product_id"]):
+                item = items[index]
+                transaction_type = TransactionType(item["type"])
+                delta = item["quantity"] if transaction_type == TransactionType.ENTRY else -item["quantity"]
+
+                try:
+                    with savepoint():
+                        if not product_repo.adjust_stock(item["product_id"], delta):
+                            raise ValueError(_stock_error(product_repo, item["product_id"]))
+                except ValueError as ve:
+                    results[index] = {"index": index, "status": "failed", "error": str(ve)}
+                    continue
+
+                applied.append(index)
+
+        # Lock the chain head last, only for inserting and linking the rows of the
+        # applied items (items rolled back by their savepoint get no row)
+        head = ledger_repo.lock_head()
+        for index in sorted(applied):
+            item = items[index]
+            transaction, hash_bytes = _record_transaction(
+                transaction_repo, item["product_id"], item["quantity"],
+                TransactionType(item["type"]), user_id
+            )
+            results[index] = {"index": index, "status": "created", "transaction": transaction}
+            stamps.append((transaction.id, hash_bytes))
+            created.append(transaction)
+
+        _link_transactions(ledger_repo, head, created)
+
+        # The response to replay commits with the batch, before stamping starts
+        if reservation is not None:
+            idempotency["response"] = record_idempotent_response(reservation, *format_batch_results(mode, results))
+
+    # Create the .ots files in the background, once the batch is committed
+    for transaction_id, hash_bytes in stamps:
+        stamping_queue.submit(transaction_id, hash_bytes)
+
+    # Refresh the committed (expired) transactions with one query instead of one per item
+    if stamps:
+        transaction_repo.select_transactions_by_ids([transaction_id for transaction_id, _ in stamps])
+
+    return results
+
+
+def _page(transactions: list, limit: int) -> tuple:
+    """
+    Split a keyset query result into the page and the cursor of the next one.
+
+    Args:
+        transactions (list[Row]): Up to limit + 1 transactions, in (created_at, id) order.
+        limit (int): Requested page size.
+
+    Returns:
+        tuple(list[Row], str or None): The page, and the cursor of the next
+                                       page or None on the last page.
+    """
+    if len(transactions) <= limit:
+        return transactions, None
+
+    page = transactions[:limit]
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
+
+
+def get_all_transactions_service(limit: int, after: tuple = None):
     """
-    Retrieve all transactions.
+    Retrieve a page of transactions.
+
+    Args:
+        limit (int): Maximum number of transactions in the page.
+        after (tuple(datetime, int), optional): Decoded cursor of the previous page.
 
     Returns:
-        list[Transactions]: List of all transaction instances.
+        tuple(list[Row], str or None): The transactions and the next page cursor.
     """
     repo = TransactionsRepository()
-    return repo.select_all_transactions()
+    return _page(repo.select_all_transactions(limit, after), limit)
 
 
-def get_transactions_by_product(product_id: int):
+def get_transactions_by_product(product_id: int, limit: int, after: tuple = None):
     """
-    Retrieve transactions filtered by product ID.
+    Retrieve a page of transactions filtered by product ID.
 
     Args:
         product_id (int): ID of the product to filter transactions.
+        limit (int): Maximum number of transactions in the page.
+        after (tuple(datetime, int), optional): Decoded cursor of the previous page.
 
     Returns:
-        list[Transactions]: List of matching transaction instances.
+        tuple(list[Row], str or None): The matching transactions and the next page cursor.
     """
     transaction_repo = TransactionsRepository()
-    return transaction_repo.select_transactions_by_product(product_id)
+    return _page(transaction_repo.select_transactions_by_product(product_id, limit, after), limit)
+
+
+def search_transactions(filters: dict, limit: int, after: tuple = None):
+    """
+    Retrieve a page of transactions matching a combination of filters.
+
+    Args:
+        filters (dict): Criteria loaded by TransactionSearchSchema; 'type' is 'entry' or 'exit'.
+        limit (int): Maximum number of transactions in the page.
+        after (tuple(datetime, int), optional): Decoded cursor of the previous page.
+
+    Returns:
+        tuple(list[Row], str or None): The matching transactions and the next page cursor.
+    """
+    filters = dict(filters)
+    if "type" in filters:
+        filters["type"] = TransactionType(filters["type"])
+
+    repo = TransactionsRepository()
+    return _page(repo.search_transactions(filters, limit, after), limit)
+
+
+def stream_transactions(batch_size: int, product_id: int = None, user_id: int = None):
+    """
+    Stream every transaction, optionally filtered by product or user.
+
+    The returned iterator reads from the database lazily, so it must be consumed
+    inside the application context that created it.
+
+    Args:
+        batch_size (int): Number of rows fetched from the database at a time.
+        product_id (int, optional): ID of the product to filter transactions.
+        user_id (int, optional): ID of the user whose transactions to fetch.
+
+    Returns:
+        Iterator[Row]: Transaction rows in (created_at, id) order.
+    """
+    repo = TransactionsRepository()
+    return iter(repo.iter_transactions(batch_size, product_id=product_id, user_id=user_id))
 
 
 def delete_transaction_by_id(id: int) -> bool:
     """
-    Delete a transaction by its ID.
+    Delete a transaction by its ID, unless it is part of the hash chain.
+
+    A chained transaction cannot be deleted without breaking every later link;
+    a movement recorded by mistake is reversed with a compensating entry or exit.
 
     Args:
         id (int): Identifier of the transaction to delete.
 
     Returns:
-        bool: True if deletion occurred, False otherwise.
+        bool: True if deletion occurred, False if the transaction was not found.
+
+    Raises:
+        ValueError: If the transaction is chained in the ledger.
     """
     transaction_repo = TransactionsRepository()
-    return transaction_repo.delete_transaction(id)
+    ledger_repo = LedgerRepository()
+    with unit_of_work():
+        chain_hash = ledger_repo.select_chain_hash(id)
+        if chain_hash is not None:
+            raise ValueError(
+                "Transactions in the hash chain cannot be deleted; "
+                "record a compensating entry or exit instead"
+            )
+        deleted = transaction_repo.delete_transaction(id)
+    return deleted
 
 
 def get_transaction_by_id(transaction_id: int):
@@ -183,28 +447,59 @@ def get_transaction_by_id(transaction_id: int):
     return transaction
 
 
-def get_transactions_by_user(user_id):
+def get_transactions_by_user(user_id, limit: int, after: tuple = None):
     """
-    Retrieve transactions performed by a specific user.
+    Retrieve a page of transactions performed by a specific user.
 
     Args:
         user_id (int): ID of the user whose transactions to fetch.
+        limit (int): Maximum number of transactions in the page.
+        after (tuple(datetime, int), optional): Decoded cursor of the previous page.
 
     Returns:
-        list[Transactions]: List of transaction instances for the given user.
+        tuple(list[Row], str or None): The user's transactions and the next page cursor.
     """
     repo = TransactionsRepository()
-    return repo.select_transactions_by_user(user_id)
+    return _page(repo.select_transactions_by_user(user_id, limit, after), limit)
+
+def _proof_etag(transaction) -> str:
+    """
+    Build the strong ETag of the proof a transaction downloads.
+
+    The validator combines the proof name, the Merkle inclusion path of batched
+    transactions and the hash of the stored proof's content, which is recorded when
+    the proof is stamped and again when it is upgraded. All three are in the row, so
+    the validator is known without reading the proof. Proofs stored before the hash
+    was kept fall back to their upgrade time.
+
+    Args:
+        transaction (Transactions): A transaction with a stamped proof.
+
+    Returns:
+        str: The ETag value, without quotes.
+    """
+    if transaction.proof_hash:
+        version = transaction.proof_hash
+    else:
+        version = transaction.upgraded_at.isoformat() if transaction.upgraded_at else "stamped"
+    parts = (transaction.ots_filename, transaction.merkle_proof or "", version)
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
 
 def get_ots_file_by_transaction_id(transaction_id: int) -> dict:
     """
-    Retrieve the .ots file metadata associated with a transaction.
+    Retrieve the .ots proof metadata associated with a transaction.
+
+    Only the transaction row is read, so conditional requests can be answered
+    before the proof is looked up; read_ots_file loads it afterwards.
 
     Args:
         transaction_id (int): The transaction ID.
 
     Returns:
-        dict: A response with 'success', and either 'message' or 'directory'/'filename'.
+        dict: A response with 'success', and either 'message', or 'ots_filename',
+              'merkle_proof', 'etag', 'final' (the proof was upgraded and no longer
+              changes) and 'filename', the name the client downloads the proof as.
     """
     transaction_repo = TransactionsRepository()
     transaction = transaction_repo.select_transaction_by_id(transaction_id)
@@ -212,16 +507,88 @@ def get_ots_file_by_transaction_id(transaction_id: int) -> dict:
     if not transaction:
         return {"success": False, "message": "Transaction not found"}
 
+    if transaction.proof_status == ProofStatus.PENDING:
+        return {"success": False, "message": "OTS proof is still being generated"}
+
     if not transaction.ots_filename:
         return {"success": False, "message": "OTS file not associated with this transaction"}
 
-    ots_path = os.path.join(OTS_FOLDER, transaction.ots_filename)
-
-    if not os.path.isfile(ots_path):
-        return {"success": False, "message": "OTS file not found on server"}
-
     return {
         "success": True,
-        "directory": OTS_FOLDER,
-        "filename": transaction.ots_filename
+        "ots_filename": transaction.ots_filename,
+        "merkle_proof": transaction.merkle_proof,
+        "etag": _proof_etag(transaction),
+        "final": transaction.proof_status == ProofStatus.UPGRADED,
+        "filename": f"transaction_{transaction.id}.ots"
     }
+
+
+def read_ots_file(proof: dict) -> dict:
+    """
+    Locate or load a proof described by get_ots_file_by_transaction_id.
+
+    Args:
+        proof (dict): A successful result of get_ots_file_by_transaction_id.
+
+    Returns:
+        dict: A response with 'success', and either 'message', 'directory'/'path' of the
+              proof file, or, for Merkle-batched transactions and packed proof storage,
+              the proof bytes in 'content'.
+    """
+    try:
+        if not proof_exists(proof["ots_filename"]):
+            return {"success": False, "message": "OTS file not found on server"}
+        path = proof_file_path(proof["ots_filename"])
+    except ValueError:
+        return {"success": False, "message": "OTS file not found on server"}
+
+    # Batched transactions get a proof built from their Merkle path and the root's proof
+    if proof["merkle_proof"]:
+        return {
+            "success": True,
+            "content": build_inclusion_timestamp(proof["ots_filename"], proof["merkle_proof"])
+        }
+
+    # Packed proofs have no file of their own: serve their bytes
+    if path is None:
+        return {"success": True, "content": bytes(read_proof(proof["ots_filename"]))}
+
+    return {"success": True, "directory": OTS_FOLDER, "path": proof["ots_filename"]}
+
+
+def issue_proof_links(transaction_ids: list, secret: str, ttl: int) -> tuple:
+    """
+    Sign short-lived download links for the proofs of several transactions.
+
+    Args:
+        transaction_ids (list[int]): Transactions whose proofs are requested.
+        secret (str): Signing secret (OTS_LINK_SECRET).
+        ttl (int): Seconds the links stay valid.
+
+    Returns:
+        tuple(int, list[dict], list[dict]): The expiry time in Unix seconds; one link
+        per available proof, with 'transaction_id', 'ots_filename', 'merkle_proof' and
+        'signature'; and one error per other transaction, with 'transaction_id' and 'message'.
+    """
+    transaction_repo = TransactionsRepository()
+    rows = {row.id: row for row in transaction_repo.select_verification_targets(transaction_ids)}
+    expires = int(time.time()) + ttl
+
+    links, errors = [], []
+    for transaction_id in transaction_ids:
+        row = rows.get(transaction_id)
+        if row is None:
+            errors.append({"transaction_id": transaction_id, "message": "Transaction not found"})
+        elif row.proof_status == ProofStatus.FAILED:
+            errors.append({"transaction_id": transaction_id, "message": "OTS proof could not be created"})
+        elif row.proof_status == ProofStatus.PENDING or not row.ots_filename:
+            errors.append({"transaction_id": transaction_id, "message": "OTS proof is still being generated"})
+        else:
+            links.append({
+                "transaction_id": transaction_id,
+                "ots_filename": row.ots_filename,
+                "merkle_proof": row.merkle_proof,
+                "signature": sign_proof_link(secret, row.ots_filename, transaction_id, row.merkle_proof, expires)
+            })
+
+    return expires, links, errors
@@ -0,0 +1,200 @@
+"""
+Upgrade service module.
+
+Freshly stamped .ots files only hold calendar commitments, so verifying them
+means asking the calendars again every time. This service upgrades stamped
+proofs with their Bitcoin attestation once the calendars have it, and rewrites
+the files so they verify offline afterwards.
+
+Due proofs are selected in batches, upgraded in parallel and their outcome
+recorded on the transactions. Proofs that are not anchored yet are retried with
+exponential backoff. Batches run from the 'flask ots upgrade' command or from an
+in-process scheduler thread. With packed proof storage, every rewrite leaves the
+previous version behind in its segment, so a run that upgraded proofs ends with
+a compaction once enough segment bytes are dead.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from app.infraDB.config.unit_of_work import unit_of_work
+from app.infraDB.repositories.transactions_repositorie import TransactionsRepository
+from app.utils.ots_handler import compact_proofs, upgrade_ots_file
+
+
+class UpgradeWorker:
+    """
+    Upgrades pending proofs in batches, on demand or from a scheduler thread.
+
+    The scheduler only runs when OTS_UPGRADE_INTERVAL is positive, and starts with
+    the first request served, so CLI commands such as 'flask db upgrade' never spawn
+    it. Enable it in a single process, or run 'flask ots upgrade' from cron instead.
+    """
+
+    def __init__(self):
+        self._app = None
+        self._batch_size = 100
+        self._workers = 4
+        self._interval = 0
+        self._backoff_base = 600
+        self._backoff_max = 86400
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Read the upgrade configuration of a Flask application.
+
+        Args:
+            app (Flask): The application whose OTS_UPGRADE_* settings apply.
+        """
+        self._app = app
+        self._batch_size = max(1, app.config["OTS_UPGRADE_BATCH_SIZE"])
+        self._workers = max(1, app.config["OTS_UPGRADE_WORKERS"])
+        self._interval = app.config["OTS_UPGRADE_INTERVAL"]
+        self._backoff_base = max(1, app.config["OTS_UPGRADE_BACKOFF_BASE"])
+        self._backoff_max = app.config["OTS_UPGRADE_BACKOFF_MAX"]
+        app.extensions["upgrade_worker"] = self
+
+        if self._interval > 0:
+            app.before_request(self.start)
+
+    def start(self):
+        """
+        Start the scheduler thread, which runs a batch every OTS_UPGRADE_INTERVAL seconds.
+        """
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._schedule, name="ots-upgrade", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """
+        Ask the scheduler thread to exit after its current batch.
+        """
+        self._stop.set()
+
+    def _schedule(self):
+        """
+        Scheduler loop: drain the due proofs, then sleep until the next run.
+        """
+        while not self._stop.is_set():
+            try:
+                self.run(drain=True)
+            except Exception:
+                # A failing run must never take the scheduler down with it
+                self._app.logger.exception("OTS upgrade run failed")
+            self._stop.wait(self._interval)
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Delay before the next upgrade attempt of a proof that is not anchored yet.
+
+        Args:
+            attempts (int): Attempts made so far, including the one that just failed.
+
+        Returns:
+            float: Seconds to wait, doubling per attempt up to OTS_UPGRADE_BACKOFF_MAX.
+        """
+        return min(self._backoff_max, self._backoff_base * 2 ** max(0, attempts - 1))
+
+    def run(self, drain: bool = False, batch_size: int = None) -> dict:
+        """
+        Upgrade the proofs that are due.
+
+        Args:
+            drain (bool, optional): Keep running batches until no proof is due.
+            batch_size (int, optional): Proof files per batch; defaults to OTS_UPGRADE_BATCH_SIZE.
+
+        Returns:
+            dict: Number of proof files 'upgraded', still 'pending' and 'failed'.
+        """
+        totals = {"upgraded": 0, "pending": 0, "failed": 0}
+        batch_size = batch_size or self._batch_size
+
+        with self._app.app_context():
+            while True:
+                counts, selected = self._run_batch(batch_size)
+                for key, value in counts.items():
+                    totals[key] += value
+                # Processed files are upgraded or postponed, so the next batch holds new ones
+                if not drain or selected < batch_size or self._stop.is_set():
+                    break
+
+        # Upgraded proofs were appended again: reclaim their old versions when worth it
+        if totals["upgraded"]:
+            compacted = compact_proofs()
+            if compacted:
+                self._app.logger.info("Compacted OTS segments, %d bytes reclaimed", compacted["reclaimed_bytes"])
+
+        return totals
+
+    def _run_batch(self, batch_size: int) -> tuple:
+        """
+        Upgrade one batch of due proof files and record the outcomes.
+
+        Files are upgraded on the pool; the database is only touched from this thread.
+
+        Returns:
+            tuple(dict, int): Outcome counts, and the number of files selected.
+        """
+        repo = TransactionsRepository()
+        now = datetime.now(timezone.utc)
+        candidates = repo.select_upgrade_candidates(now, batch_size)
+        if not candidates:
+            return {"upgraded": 0, "pending": 0, "failed": 0}, 0
+
+        with ThreadPoolExecutor(max_workers=min(self._workers, len(candidates)),
+                                thread_name_prefix="ots-upgrade") as pool:
+            outcomes = list(pool.map(self._upgrade_file, [c.ots_filename for c in candidates]))
+
+        counts = {"upgraded": 0, "pending": 0, "failed": 0}
+        upgraded = {}
+        with unit_of_work():
+            for candidate, (outcome, proof_hash) in zip(candidates, outcomes):
+                counts[outcome] += 1
+                if outcome == "upgraded":
+                    upgraded[candidate.ots_filename] = proof_hash
+                    continue
+
+                # Not anchored yet, or unreadable: try again later, each time waiting longer
+                attempts = candidate.upgrade_attempts + 1
+                next_upgrade_at = now + timedelta(seconds=self.backoff(attempts))
+                repo.schedule_upgrade_retry(candidate.ots_filename, attempts, next_upgrade_at)
+
+            if upgraded:
+                repo.mark_upgraded(upgraded, datetime.now(timezone.utc))
+
+        return counts, len(candidates)
+
+    def _upgrade_file(self, ots_filename: str) -> tuple:
+        """
+        Upgrade one proof file.
+
+        Runs on a pool thread, so it pushes its own application context.
+
+        Returns:
+            tuple(str, str): 'upgraded', 'pending' (not anchored yet) or 'failed' (missing or
+            invalid file), and the hex SHA256 of the upgraded proof (None unless upgraded).
+        """
+        with self._app.app_context():
+            try:
+                proof_hash = upgrade_ots_file(ots_filename)
+            except (OSError, ValueError) as e:
+                self._app.logger.error("Upgrading proof %s failed: %s", ots_filename, e)
+                return "failed", None
+
+            if proof_hash is None:
+                return "pending", None
+
+            # No cache entry to drop: results are keyed by proof content, which just changed
+            return "upgraded", proof_hash
+
+
+# Shared worker instance, bound to the application in create_app
+upgrade_worker = UpgradeWorker()
@@ -3,9 +3,11 @@ User service module.
 
 Implements business logic for user operations, including creation with password hashing,
 retrieval, update with password rehashing, and deletion, interacting with UsersRepository 
-and enforcing domain rules such as uniqueness and existence checks.
+and enforcing domain rules such as uniqueness and existence checks. Each write
+operation runs in a single unit of work.
 """
 
+from app.infraDB.config.unit_of_work import unit_of_work
 from app.infraDB.repositories.users_repository import UsersRepository
 from app.infraDB.models.users import PermissionType
 from app.utils.security import hash_password
@@ -23,6 +25,7 @@ def create_user_service(data):
 
     Raises:
         ValueError: If a user with the provided email already exists.
+        PasswordHasherBusy: If the password hashing pool is saturated.
     """
     # Initialize the repository for user operations
     repo = UsersRepository()
@@ -37,13 +40,15 @@ def create_user_service(data):
     # Hash the plaintext password for secure storage
     hashed_pw = hash_password(data["password"])
 
-    # Delegate user creation to the repository with hashed credentials
-    return repo.insert_user(
-        data["name"],
-        data["email"],
-        hashed_pw,
-        permission
-    )
+    # Delegate user creation to the repository with hashed credentials and commit it
+    with unit_of_work():
+        user = repo.insert_user(
+            data["name"],
+            data["email"],
+            hashed_pw,
+            permission
+        )
+    return user
 
 
 def get_all_users_service():
@@ -51,7 +56,7 @@ def get_all_users_service():
     Retrieve all users.
 
     Returns:
-        list[Users]: List of all user instances.
+        list[Row]: Read-only rows with the listed user columns.
     """
     # Initialize repository and fetch all users
     repo = UsersRepository()
@@ -92,6 +97,7 @@ def update_user_service(id, data):
 
     Raises:
         ValueError: If the user to update does not exist.
+        PasswordHasherBusy: If a new password is given and the hashing pool is saturated.
     """
     repo = UsersRepository()
 
@@ -100,14 +106,15 @@ def update_user_service(id, data):
         data["password_hash"] = hash_password(data["password"])
         del data["password"]  # Remove plaintext password
 
-    # Delegate update to repository
-    user = repo.update_user(
-        id=id,
-        name=data.get("name"),
-        email=data.get("email"),
-        password_hash=data.get("password_hash"),
-        permission=data.get("permission")
-    )
+    # Delegate update to repository and commit it
+    with unit_of_work():
+        user = repo.update_user(
+            id=id,
+            name=data.get("name"),
+            email=data.get("email"),
+            password_hash=data.get("password_hash"),
+            permission=data.get("permission")
+        )
 
     # Raise error if update did not find an existing user
     if not user:
@@ -132,7 +139,8 @@ def delete_user_service(id):
 
     repo = UsersRepository()
     # Attempt deletion; returns False if no rows affected
-    success = repo.delete_user(id)
+    with unit_of_work():
+        success = repo.delete_user(id)
 
     if not success:
         raise ValueError("User not found")
@@ -0,0 +1,505 @@
+"""
+Verification service module.
+
+Verifies OpenTimestamps proofs and remembers the outcome. A confirmed proof can
+never become unconfirmed, so its status is stored on the transaction and later
+checks are answered from the database without reading the proof or running
+'ots verify'. Outcomes are also kept in an in-process LRU keyed by the proof's
+content and the digest it commits to; pending and failed outcomes are re-checked
+at most once per OTS_VERIFY_RECHECK_INTERVAL seconds.
+
+Batch verification runs the proofs of many transactions on a bounded thread
+pool, verifying each distinct proof once, and yields results as they complete.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from flask import current_app
+from app.infraDB.config.unit_of_work import unit_of_work
+from app.infraDB.repositories.transactions_repositorie import TransactionsRepository
+from app.infraDB.models.transactions import ProofStatus, VerificationStatus
+from app.utils.hash_generator import is_canonical_record
+from app.utils.merkle import compute_merkle_root, parse_merkle_proof
+from app.utils.ots_handler import read_ots_fingerprint, verify_ots_file
+from app.utils.ots_library import verification_result
+
+
+class VerificationCache:
+    """
+    Thread-safe LRU cache of verification results, keyed by proof content and file digest.
+
+    Keys come from verification_key, so a rewritten (upgraded) or substituted
+    proof never reuses the result of another one. Confirmed results are served for as long as they stay in the cache; pending
+    and failed ones only until recheck_interval seconds have passed.
+    """
+
+    def __init__(self, max_size: int = 4096, recheck_interval: float = 300):
+        self._entries = OrderedDict()
+        self._max_size = max_size
+        self._recheck_interval = recheck_interval
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Read the cache configuration of a Flask application.
+
+        Args:
+            app (Flask): The application whose OTS_VERIFY_* settings apply.
+        """
+        self._max_size = app.config["OTS_VERIFY_CACHE_SIZE"]
+        self._recheck_interval = app.config["OTS_VERIFY_RECHECK_INTERVAL"]
+        app.extensions["verification_cache"] = self
+
+    def get(self, key: bytes):
+        """
+        Return the cached result of a proof, unless it is due for a re-check.
+
+        Args:
+            key (bytes): Cache key of the proof, from verification_key.
+
+        Returns:
+            dict or None: Verification result, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            result, checked_at = entry
+            if result["status"] != "confirmed" and time.monotonic() - checked_at >= self._recheck_interval:
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: bytes, result: dict):
+        """
+        Cache the result of a verification that just ran.
+
+        Args:
+            key (bytes): Cache key of the proof, from verification_key.
+            result (dict): Verification result.
+        """
+        if self._max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (result, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+# Shared cache instance, bound to the application in create_app
+verification_cache = VerificationCache()
+
+
+def verification_key(proof_hash: bytes, digest: bytes) -> bytes:
+    """
+    Build the verification cache key of a proof.
+
+    Args:
+        proof_hash (bytes): SHA256 of the serialized proof.
+        digest (bytes): Digest the proof commits to.
+
+    Returns:
+        bytes: The key, binding the result to these exact proof bytes.
+    """
+    return proof_hash + digest
+
+
+def _parse_attested_at(value: str):
+    """
+    Parse the 'attested_at' of a verification result into an aware datetime.
+
+    Args:
+        value (str): ISO 8601 date or datetime, or None.
+
+    Returns:
+        datetime or None: The attestation time, in UTC when no offset was given.
+    """
+    if not value:
+        return None
+    attested_at = datetime.fromisoformat(value)
+    if attested_at.tzinfo is None:
+        attested_at = attested_at.replace(tzinfo=timezone.utc)
+    return attested_at
+
+
+def _stored_result(transaction) -> dict:
+    """
+    Build the verification result of a transaction whose confirmation is stored.
+
+    Args:
+        transaction (Transactions): A transaction with a CONFIRMED verification status.
+
+    Returns:
+        dict: Verification result in the format of ots_library.verification_result.
+    """
+    attested_at = transaction.attested_at.isoformat() if transaction.attested_at else None
+    return verification_result(
+        "confirmed",
+        f"Success! Bitcoin block {transaction.block_height} attests existence as of {attested_at}",
+        block_height=transaction.block_height,
+        attested_at=attested_at
+    )
+
+
+def verify_proof(ots_filename: str, key: bytes) -> dict:
+    """
+    Verify a proof file through the verification cache.
+
+    Args:
+        ots_filename (str): Name of the .ots file inside OTS_FOLDER.
+        key (bytes): Cache key of the proof, from verification_key.
+
+    Returns:
+        dict: Verification result in the format of ots_library.verification_result.
+    """
+    result = verification_cache.get(key)
+    if result is None:
+        result = verify_ots_file(ots_filename)
+        if "status" in result and "message" not in result:
+            verification_cache.put(key, result)
+    return result
+
+
+def verify_proof_file(ots_filename: str) -> dict:
+    """
+    Verify a proof file given by name.
+
+    Args:
+        ots_filename (str): Name of the .ots file inside OTS_FOLDER.
+
+    Returns:
+        dict: A dictionary containing verification status and output details.
+    """
+    try:
+        digest, proof_hash = read_ots_fingerprint(ots_filename)
+    except (FileNotFoundError, IsADirectoryError):
+        return {"success": False, "status": "failed", "message": "OTS file not found."}
+    except ValueError as e:
+        return {"success": False, "status": "failed", "message": str(e)}
+
+    return verify_proof(ots_filename, verification_key(proof_hash, digest))
+
+
+def _commits_to_other_hash(transaction, digest: bytes) -> bool:
+    """
+    Tell whether a proof commits to something other than the transaction's stored hash.
+
+    Only rows hashed from their canonical record stamp the bytes of blockchain_hash;
+    older rows stamped a separately computed digest and cannot be checked this way.
+
+    Args:
+        transaction (Transactions or Row): Transaction with blockchain_hash, hash_input and merkle_proof.
+        digest (bytes): Digest committed to by its .ots file.
+
+    Returns:
+        bool: True if the proof belongs to another hash.
+    """
+    if not is_canonical_record(transaction.hash_input):
+        return False
+
+    stamped = hashlib.sha256(bytes.fromhex(transaction.blockchain_hash)).digest()
+    # Batched hashes are Merkle leaves; the root's .ots commits to the root instead
+    committed = parse_merkle_proof(transaction.merkle_proof)[0] if transaction.merkle_proof else digest
+    return committed != stamped
+
+
+def verify_transaction_proof(transaction_id: int) -> dict:
+    """
+    Verify the OpenTimestamps proof of a transaction.
+
+    A stored confirmation is returned as is. Otherwise, for Merkle-batched
+    transactions, the inclusion path is first folded up to the batch root and
+    checked against the digest committed to by the root's .ots file. The proof
+    must commit to the transaction's own hash (where it was stamped from its
+    canonical record); it is then verified and a changed outcome is stored.
+
+    Args:
+        transaction_id (int): The transaction ID.
+
+    Returns:
+        dict: A dictionary containing verification status and output details.
+    """
+    transaction_repo = TransactionsRepository()
+    transaction = transaction_repo.select_transaction_by_id(transaction_id)
+
+    if not transaction:
+        return {"success": False, "message": "Transaction not found"}
+
+    if transaction.proof_status == ProofStatus.PENDING:
+        return {"success": False, "message": "OTS proof is still being generated"}
+
+    if not transaction.ots_filename:
+        return {"success": False, "message": "OTS file not associated with this transaction"}
+
+    # Confirmed is final: no file read, no verification
+    if transaction.verification_status == VerificationStatus.CONFIRMED:
+        return _stored_result(transaction)
+
+    try:
+        digest, proof_hash = read_ots_fingerprint(transaction.ots_filename)
+    except FileNotFoundError:
+        return {"success": False, "message": "OTS file not found."}
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+
+    if transaction.merkle_proof:
+        # The root's .ots commits to SHA256(root), as for any stamped file
+        root = compute_merkle_root(transaction.merkle_proof)
+        if hashlib.sha256(root).digest() != digest:
+            return {"success": False, "message": "Merkle inclusion proof does not match the batch root."}
+
+    if _commits_to_other_hash(transaction, digest):
+        return {"success": False, "message": "OTS proof does not commit to the transaction hash."}
+
+    result = verify_proof(transaction.ots_filename, verification_key(proof_hash, digest))
+    if "message" in result:
+        return result
+
+    _record_result(transaction_repo, transaction, result)
+    return result
+
+
+def _record_result(transaction_repo, transaction, result: dict):
+    """
+    Store a verification result on a transaction when its outcome changed.
+
+    Args:
+        transaction_repo (TransactionsRepository): Repository used for the update.
+        transaction (Transactions): The verified transaction.
+        result (dict): Verification result.
+    """
+    status = VerificationStatus(result["status"])
+    if transaction.verification_status == status and transaction.block_height == result["block_height"]:
+        return
+
+    with unit_of_work():
+        transaction_repo.update_verification(
+            transaction.id,
+            status,
+            result["block_height"],
+            _parse_attested_at(result["attested_at"]),
+            datetime.now(timezone.utc)
+        )
+
+
+def find_verification_targets(transaction_ids: list = None, date_from=None, date_to=None, limit: int = None) -> tuple:
+    """
+    Select the transactions of a batch verification.
+
+    Args:
+        transaction_ids (list[int], optional): Transactions to verify.
+        date_from (datetime, optional): Verify transactions created at or after this time.
+        date_to (datetime, optional): Verify transactions created before this time.
+        limit (int, optional): Maximum number of transactions selected.
+
+    Returns:
+        tuple(list[Row], list[int]): The transactions found, and the requested IDs that do not exist.
+    """
+    transaction_repo = TransactionsRepository()
+    targets = transaction_repo.select_verification_targets(transaction_ids, date_from, date_to, limit)
+
+    missing = []
+    if transaction_ids is not None:
+        found = {target.id for target in targets}
+        missing = sorted(set(transaction_ids) - found)
+
+    return targets, missing
+
+
+def _batch_record(transaction_id: int, result: dict) -> dict:
+    """
+    Shape the result of one transaction in a batch verification.
+
+    Args:
+        transaction_id (int): The verified transaction.
+        result (dict): Its verification result, or an error with a 'message'.
+
+    Returns:
+        dict: One line of the streamed response.
+    """
+    record = {
+        "transaction_id": transaction_id,
+        "success": result.get("success", False),
+        "status": result.get("status", "failed"),
+        "block_height": result.get("block_height"),
+        "attested_at": result.get("attested_at")
+    }
+    if "message" in result:
+        record["message"] = result["message"]
+    else:
+        record["details"] = result.get("output", "")
+    return record
+
+
+def _group_targets(targets, errors: list) -> dict:
+    """
+    Group the transactions of a batch by the proof that has to be verified for them.
+
+    Transactions stamped in the same Merkle batch share one .ots file, and files
+    with identical content share one verification result, so each group is
+    verified once. Transactions that cannot be verified are appended to errors
+    instead.
+
+    Args:
+        targets (list[Row]): Transactions selected by find_verification_targets, none confirmed.
+        errors (list): Receives (transaction_id, result) for transactions without a usable proof.
+
+    Returns:
+        dict: Verification cache key -> (ots_filename, list of transaction rows).
+    """
+    groups = {}
+    fingerprints = {}
+
+    for target in targets:
+        if target.proof_status == ProofStatus.PENDING:
+            errors.append((target.id, {"message": "OTS proof is still being generated"}))
+            continue
+        if not target.ots_filename:
+            errors.append((target.id, {"message": "OTS file not associated with this transaction"}))
+            continue
+
+        # Read each proof header once, however many transactions share the file
+        if target.ots_filename not in fingerprints:
+            try:
+                fingerprints[target.ots_filename] = read_ots_fingerprint(target.ots_filename)
+            except FileNotFoundError:
+                fingerprints[target.ots_filename] = None
+            except ValueError:
+                fingerprints[target.ots_filename] = ()
+        fingerprint = fingerprints[target.ots_filename]
+
+        if fingerprint is None:
+            errors.append((target.id, {"message": "OTS file not found."}))
+            continue
+        if not fingerprint:
+            errors.append((target.id, {"message": "Unsupported OTS proof format"}))
+            continue
+        digest, proof_hash = fingerprint
+
+        if target.merkle_proof:
+            # The root's .ots commits to SHA256(root), as for any stamped file
+            root = compute_merkle_root(target.merkle_proof)
+            if hashlib.sha256(root).digest() != digest:
+                errors.append((target.id, {"message": "Merkle inclusion proof does not match the batch root."}))
+                continue
+
+        if _commits_to_other_hash(target, digest):
+            errors.append((target.id, {"message": "OTS proof does not commit to the transaction hash."}))
+            continue
+
+        groups.setdefault(verification_key(proof_hash, digest), (target.ots_filename, []))[1].append(target)
+
+    return groups
+
+
+def _record_group(transaction_repo, members, result: dict):
+    """
+    Store a verification result on the transactions of a group whose outcome changed.
+
+    Args:
+        transaction_repo (TransactionsRepository): Repository used for the update.
+        members (list[Row]): Transactions sharing the verified proof.
+        result (dict): Verification result.
+    """
+    if "message" in result:
+        return
+
+    status = VerificationStatus(result["status"])
+    changed = [
+        member.id for member in members
+        if member.verification_status != status or member.block_height != result["block_height"]
+    ]
+    if not changed:
+        return
+
+    with unit_of_work():
+        transaction_repo.update_verifications(
+            changed,
+            status,
+            result["block_height"],
+            _parse_attested_at(result["attested_at"]),
+            datetime.now(timezone.utc)
+        )
+
+
+def _verify_in_app(app, ots_filename: str) -> dict:
+    """
+    Verify a proof file from a pool thread, inside the application's context.
+    """
+    with app.app_context():
+        return verify_ots_file(ots_filename)
+
+
+def verify_transactions_batch(targets, missing_ids: list = (), max_workers: int = 4):
+    """
+    Verify the proofs of many transactions, yielding each result as soon as it is known.
+
+    Stored confirmations, unusable proofs and cached results are yielded first.
+    The remaining distinct proofs are verified on a pool of at most max_workers
+    threads; database updates happen in the calling thread as results arrive.
+
+    Args:
+        targets (list[Row]): Transactions selected by find_verification_targets.
+        missing_ids (list[int], optional): Requested IDs that do not exist.
+        max_workers (int, optional): Number of proofs verified concurrently.
+
+    Yields:
+        dict: One record per transaction, in completion order.
+    """
+    transaction_repo = TransactionsRepository()
+
+    for transaction_id in missing_ids:
+        yield _batch_record(transaction_id, {"message": "Transaction not found"})
+
+    # Confirmed is final: answer from the stored status
+    pending = []
+    for target in targets:
+        if target.verification_status == VerificationStatus.CONFIRMED:
+            yield _batch_record(target.id, _stored_result(target))
+        else:
+            pending.append(target)
+
+    errors = []
+    groups = _group_targets(pending, errors)
+    for transaction_id, result in errors:
+        yield _batch_record(transaction_id, result)
+
+    to_verify = {}
+    for key, (ots_filename, members) in groups.items():
+        result = verification_cache.get(key)
+        if result is None:
+            to_verify[key] = (ots_filename, members)
+            continue
+        _record_group(transaction_repo, members, result)
+        for member in members:
+            yield _batch_record(member.id, result)
+
+    if not to_verify:
+        return
+
+    app = current_app._get_current_object()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_verify))),
+                            thread_name_prefix="ots-verify") as pool:
+        futures = {
+            pool.submit(_verify_in_app, app, ots_filename): key
+            for key, (ots_filename, _) in to_verify.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            members = to_verify[key][1]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"success": False, "status": "failed", "message": f"Verification error: {e}"}
+
+            if "status" in result and "message" not in result:
+                verification_cache.put(key, result)
+            _record_group(transaction_repo, members, result)
+            for member in members:
+                yield _batch_record(member.id, result)
@@ -0,0 +1,66 @@
+"""
+Export module.
+
+Provides generators that serialize records one at a time, for streamed
+responses whose memory use does not grow with the number of records.
+"""
+
+from flask import current_app
+
+# Media types of the supported export formats
+EXPORT_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+def stream_ndjson(records):
+    """
+    Serialize records as newline-delimited JSON, one line per record.
+
+    Args:
+        records (Iterable[dict]): JSON-serializable records.
+
+    Yields:
+        str: One JSON document followed by a newline.
+    """
+    for record in records:
+        yield current_app.json.dumps(record) + "\n"
+
+
+def stream_json_array(records):
+    """
+    Serialize records as a single JSON array, written incrementally.
+
+    Args:
+        records (Iterable[dict]): JSON-serializable records.
+
+    Yields:
+        str: Chunks that concatenate into a valid JSON array.
+    """
+    yield "["
+    for index, record in enumerate(records):
+        # Separator goes before every element but the first
+        yield ("," if index else "") + current_app.json.dumps(record)
+    yield "]\n"
+
+
+def stream_export(records, export_format: str):
+    """
+    Pick the serializer of an export format.
+
+    Args:
+        records (Iterable[dict]): JSON-serializable records.
+        export_format (str): 'ndjson' or 'json'.
+
+    Returns:
+        Iterator[str]: Chunks of the serialized export.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if export_format == "ndjson":
+        return stream_ndjson(records)
+    if export_format == "json":
+        return stream_json_array(records)
+    raise ValueError(f"Export format must be one of: {', '.join(EXPORT_MIMETYPES)}")
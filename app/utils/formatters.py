@@ -3,6 +3,8 @@ Formatters module.
 
 Provides utility functions to serialize model instances into JSON-serializable formats,
 using Marshmallow schemas for products and manual mappings for transactions and users.
+The *_row variants serialize the read-only rows returned by list queries and produce
+exactly the same output as their model counterparts.
 """
 
 from app.schemas.product_schema import ProductSchema
@@ -22,18 +24,40 @@ def format_product(product):
     return ProductSchema().dump(product)
 
 
+def format_product_row(row):
+    """
+    Serialize a product row the same way ProductSchema dumps a Product instance.
+
+    Args:
+        row: A row (or any object) exposing the product columns as attributes.
+
+    Returns:
+        dict: Serialized product data.
+    """
+    return {
+        "id": row.id,
+        "code": row.code,
+        "name": row.name,
+        "category": row.category,
+        "current_stock": row.current_stock,
+        # ISO 8601 timestamps, as marshmallow's DateTime field renders them
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "updated_at": row.updated_at.isoformat() if row.updated_at else None
+    }
+
+
 def format_product_list(products):
     """
-    Serialize a list of Product instances to a list of dictionaries.
+    Serialize a list of products to a list of dictionaries.
 
     Args:
-        products (list): List of Product model instances to serialize.
+        products (list): Product model instances or product rows to serialize.
 
     Returns:
         list[dict]: List of serialized product data.
     """
-    # Many=True enables serialization of multiple objects
-    return ProductSchema(many=True).dump(products)
+    # Plain attribute reads; no schema machinery per element
+    return [format_product_row(product) for product in products]
 
 
 def format_transaction(transaction):
@@ -60,11 +84,58 @@ def format_transaction(transaction):
         "type": transaction.type.value,
         "quantity": transaction.quantity,
         "blockchain_hash": transaction.blockchain_hash,
+        # State of the OpenTimestamps proof ('pending' until a worker stamps it)
+        "proof_status": transaction.proof_status.value,
         # ISO 8601 formatted timestamp for client consumption
         "created_at": transaction.created_at.isoformat()
     }
 
 
+def format_batch_results(mode, results):
+    """
+    Convert the results of a transaction batch into its response body and HTTP status.
+
+    Args:
+        mode (str): Batch mode ('atomic' or 'best_effort').
+        results (list[dict]): Per-item results, created items carrying their Transaction instance.
+
+    Returns:
+        tuple(dict, int): Body with 'mode' and 'results', and HTTP 201 if every item
+                          was created or 207 if some failed.
+    """
+    # Format created transactions; failed items carry their error message
+    formatted = [
+        {**result, "transaction": format_transaction(result["transaction"])}
+        if "transaction" in result else result
+        for result in results
+    ]
+    all_created = all(result["status"] == "created" for result in results)
+    return {"mode": mode, "results": formatted}, 201 if all_created else 207
+
+
+def format_transaction_row(row):
+    """
+    Convert a transaction row into the same dictionary as format_transaction.
+
+    Args:
+        row: A row from a transaction list query, carrying the user's email as 'user_email'.
+
+    Returns:
+        dict: Serialized transaction data including user email and timestamps.
+    """
+    return {
+        "id": row.id,
+        "product_id": row.product_id,
+        "user_id": row.user_id,
+        "user_email": row.user_email,
+        "type": row.type.value,
+        "quantity": row.quantity,
+        "blockchain_hash": row.blockchain_hash,
+        "proof_status": row.proof_status.value,
+        "created_at": row.created_at.isoformat()
+    }
+
+
 def format_user(user):
     """
     Convert a Users model instance into a JSON-serializable dictionary.
@@ -90,3 +161,23 @@ def format_user(user):
             else None
         )
     }
+
+
+def format_user_row(row):
+    """
+    Convert a user row into the same dictionary as format_user.
+
+    Args:
+        row: A row from the user list query.
+
+    Returns:
+        dict: Serialized user data including permission value and ISO timestamps.
+    """
+    return {
+        "id": row.id,
+        "name": row.name,
+        "email": row.email,
+        "permission": row.permission.value,
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat() if row.updated_at else None
+    }
@@ -1,29 +1,43 @@
 import hashlib
-from datetime import datetime, timezone
+import json
+from datetime import timezone
 
-def generate_transaction_hash_bytes(product_id, quantity, transaction_type, user_email):
+def canonical_timestamp(moment):
     """
-    Generates a SHA256 hash in bytes (for OTS).
+    Formats a timestamp in UTC with microseconds (naive values are taken as UTC),
+    so a persisted created_at always serializes the same way.
     """
-    raw_data = f"{product_id}-{quantity}-{transaction_type}-{user_email}-{datetime.now(timezone.utc).isoformat()}"
-    return hashlib.sha256(raw_data.encode()).digest()
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
 
-def generate_transaction_hash_hex(product_id, quantity, transaction_type, user_email):
+def canonical_transaction_record(product_id, quantity, transaction_type, user_id, created_at):
     """
-    Generates a SHA256 hash as a readable hex string (for DB).
+    Builds the canonical serialization of a transaction: compact JSON with sorted keys,
+    made only of persisted columns, so the hash can be recomputed from the row.
     """
-    raw_data = f"{product_id}-{quantity}-{transaction_type}-{user_email}-{datetime.now(timezone.utc).isoformat()}"
-    return hashlib.sha256(raw_data.encode()).hexdigest()
+    return json.dumps(
+        {
+            "created_at": canonical_timestamp(created_at),
+            "product_id": product_id,
+            "quantity": quantity,
+            "type": transaction_type,
+            "user_id": user_id,
+        },
+        sort_keys=True,
+        separators=(",", ":")
+    )
 
-def generate_ots_filename(product_id, quantity, transaction_type, user_email):
+def hash_transaction_record(record):
     """
-    Generates a unique filename for storing the hash and its .ots proof,
-    based on transaction data and timestamp.
-
-    Returns:
-        str: Base filename without extension (.bin or .ots will be added)
+    Generates the SHA256 hash of a canonical record, in bytes (stamped with OTS;
+    its hex form is stored in the DB).
     """
+    return hashlib.sha256(record.encode()).digest()
 
-    safe_email = user_email.replace("@", "_at_").replace(".", "_")
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
-    return f"transaction_{product_id}_{quantity}_{transaction_type}_{safe_email}_{timestamp}.bin"
+def is_canonical_record(hash_input):
+    """
+    Tells whether a stored hash input is a canonical record, i.e. its hash is the one
+    that was stamped. Older rows stored another input, or none.
+    """
+    return bool(hash_input) and hash_input.startswith("{")
@@ -0,0 +1,56 @@
+"""
+Ledger utility module.
+
+Defines the hash chain linking transactions. Every transaction stores the hash
+of its chain record (the columns describing the movement, its hash included)
+chained to the hash of the previous transaction:
+
+    chain_hash(n) = SHA256( chain_hash(n - 1) || SHA256(record(n)) )
+
+starting from GENESIS_HASH. Editing, deleting or reordering any row breaks the
+link of the row that follows it, so one sequential pass finds the first change.
+"""
+
+import hashlib
+from app.utils.hash_generator import canonical_timestamp
+
+# Chain hash the first transaction links to
+GENESIS_HASH = "0" * 64
+
+
+def record_digest(row) -> bytes:
+    """
+    Hash the chain record of a transaction.
+
+    Args:
+        row (Transactions or Row): Transaction with id, product_id, user_id, type,
+            quantity, blockchain_hash and created_at.
+
+    Returns:
+        bytes: SHA256 digest of the record.
+    """
+    transaction_type = getattr(row.type, "value", row.type)
+    record = "|".join((
+        str(row.id),
+        str(row.product_id),
+        str(row.user_id),
+        transaction_type,
+        str(row.quantity),
+        row.blockchain_hash,
+        canonical_timestamp(row.created_at),
+    ))
+    return hashlib.sha256(record.encode()).digest()
+
+
+def link_hash(previous_hash: str, row) -> str:
+    """
+    Compute the chain hash of a transaction.
+
+    Args:
+        previous_hash (str): Chain hash of the previous transaction, or GENESIS_HASH.
+        row (Transactions or Row): The transaction (see record_digest).
+
+    Returns:
+        str: Hex chain hash of the transaction.
+    """
+    return hashlib.sha256(bytes.fromhex(previous_hash) + record_digest(row)).hexdigest()
@@ -0,0 +1,114 @@
+"""
+Merkle tree module.
+
+Builds SHA256 Merkle trees over transaction digests so a whole batch can be
+timestamped with a single OpenTimestamps stamp of the root, and encodes the
+compact inclusion proof that links each digest to that root.
+
+A proof is stored as a hex string: the 32-byte leaf digest followed by one
+33-byte step per tree level, made of a side byte (SIBLING_LEFT or SIBLING_RIGHT)
+and the 32-byte sibling hash.
+"""
+
+import hashlib
+
+# Side markers for a proof step: where the sibling sits relative to the running hash
+SIBLING_LEFT = 0x00
+SIBLING_RIGHT = 0x01
+
+DIGEST_SIZE = 32
+STEP_SIZE = DIGEST_SIZE + 1
+
+
+def _hash_pair(left: bytes, right: bytes) -> bytes:
+    """
+    Hash two child nodes into their parent node.
+    """
+    return hashlib.sha256(left + right).digest()
+
+
+def build_merkle_tree(leaves: list) -> tuple:
+    """
+    Build a Merkle tree and the inclusion proof of every leaf.
+
+    An odd node at the end of a level is promoted unchanged to the next level,
+    so no leaf is ever duplicated.
+
+    Args:
+        leaves (list[bytes]): 32-byte leaf digests, in batch order.
+
+    Returns:
+        tuple(bytes, list[str]): The Merkle root and the hex-encoded proof of each leaf.
+    """
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+
+    # Steps accumulated per leaf, and the leaves covered by each node of the current level
+    steps = [bytearray() for _ in leaves]
+    level = list(leaves)
+    members = [[index] for index in range(len(leaves))]
+
+    while len(level) > 1:
+        next_level, next_members = [], []
+        for i in range(0, len(level) - 1, 2):
+            left, right = level[i], level[i + 1]
+            for index in members[i]:
+                steps[index] += bytes([SIBLING_RIGHT]) + right
+            for index in members[i + 1]:
+                steps[index] += bytes([SIBLING_LEFT]) + left
+            next_level.append(_hash_pair(left, right))
+            next_members.append(members[i] + members[i + 1])
+
+        # Promote the unpaired node, if any
+        if len(level) % 2:
+            next_level.append(level[-1])
+            next_members.append(members[-1])
+
+        level, members = next_level, next_members
+
+    proofs = [(leaf + bytes(path)).hex() for leaf, path in zip(leaves, steps)]
+    return level[0], proofs
+
+
+def parse_merkle_proof(proof: str) -> tuple:
+    """
+    Decode a hex-encoded inclusion proof.
+
+    Args:
+        proof (str): Proof as produced by build_merkle_tree.
+
+    Returns:
+        tuple(bytes, list[tuple(int, bytes)]): The leaf digest and its (side, sibling) steps.
+
+    Raises:
+        ValueError: If the proof is malformed.
+    """
+    raw = bytes.fromhex(proof)
+    if len(raw) < DIGEST_SIZE or (len(raw) - DIGEST_SIZE) % STEP_SIZE:
+        raise ValueError("Malformed Merkle proof")
+
+    leaf = raw[:DIGEST_SIZE]
+    steps = []
+    for offset in range(DIGEST_SIZE, len(raw), STEP_SIZE):
+        side = raw[offset]
+        if side not in (SIBLING_LEFT, SIBLING_RIGHT):
+            raise ValueError("Malformed Merkle proof")
+        steps.append((side, raw[offset + 1:offset + STEP_SIZE]))
+
+    return leaf, steps
+
+
+def compute_merkle_root(proof: str) -> bytes:
+    """
+    Fold an inclusion proof from its leaf up to the Merkle root.
+
+    Args:
+        proof (str): Hex-encoded inclusion proof.
+
+    Returns:
+        bytes: The Merkle root the proof commits to.
+    """
+    node, steps = parse_merkle_proof(proof)
+    for side, sibling in steps:
+        node = _hash_pair(sibling, node) if side == SIBLING_LEFT else _hash_pair(node, sibling)
+    return node
@@ -1,10 +1,35 @@
 import subprocess
 import os
+import re
 import hashlib
+import tempfile
+from flask import current_app
+from app.utils import ots_library
+from app.utils.proof_store import open_proof_store, resolve_path, write_atomically
+from app.utils.merkle import parse_merkle_proof, SIBLING_LEFT
 
-# Define the absolute path for the folder where .ots and .bin files will be stored
+# Define the absolute path for the folder where .ots files will be stored
 OTS_FOLDER = os.getenv("OTS_DATA_PATH", os.path.join(os.getcwd(), "ots_data"))
 
+# Backends OTS_BACKEND may name: 'subprocess' runs the 'ots' CLI,
+# 'library' calls the opentimestamps library in-process
+OTS_BACKENDS = ("subprocess", "library")
+
+# 'ots verify' success line, e.g. "Success! Bitcoin block 358391 attests existence as of 2015-05-28 EDT"
+_CLI_SUCCESS = re.compile(r"Bitcoin block (\d+) attests existence as of (\d{4}-\d{2}-\d{2})")
+
+# OpenTimestamps detached proof header: magic bytes and major version 1
+OTS_HEADER_MAGIC = b"\x00OpenTimestamps\x00\x00Proof\x00\xbf\x89\xe2\xe8\x84\xe8\x92\x94"
+OTS_MAJOR_VERSION = b"\x01"
+
+# OpenTimestamps operation tags used to chain a Merkle path into a proof
+OTS_OP_SHA256 = b"\x08"
+OTS_OP_APPEND = b"\xf0"
+OTS_OP_PREPEND = b"\xf1"
+
+# Content-addressed proof names: 'ab/cd/<sha256 of the stamped data>.ots'
+_STORAGE_NAME = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.ots$")
+
 def ensure_ots_folder():
     """
     Ensure that the OTS storage folder exists.
@@ -13,71 +38,367 @@ def ensure_ots_folder():
     if not os.path.exists(OTS_FOLDER):
         os.makedirs(OTS_FOLDER)
 
-def generate_transaction_hash(product_id, quantity, transaction_type, user_email):
+def proof_store():
+    """
+    Return the store every proof of the current application is read from and written to.
+
+    It is opened on first use, from OTS_STORAGE and OTS_PACK_SEGMENT_SIZE, and kept
+    in app.extensions.
+    """
+    store = current_app.extensions.get("proof_store")
+    if store is None:
+        config = current_app.config
+        store = current_app.extensions.setdefault(
+            "proof_store",
+            open_proof_store(OTS_FOLDER, config["OTS_STORAGE"], config["OTS_PACK_SEGMENT_SIZE"])
+        )
+    return store
+
+def _resolve_backend(backend: str = None) -> str:
+    """
+    Return the backend to use, defaulting to OTS_BACKEND.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = backend or current_app.config["OTS_BACKEND"]
+    if backend not in OTS_BACKENDS:
+        raise ValueError(f"Unknown OTS backend '{backend}', expected one of: {', '.join(OTS_BACKENDS)}")
+    return backend
+
+def ots_storage_name(digest: bytes) -> str:
+    """
+    Build the content-addressed name of the proof committing to a digest.
+
+    Proofs are sharded by the first two bytes of the digest, so no directory
+    holds more than a small fraction of them, and distinct data never share a name.
+
+    Args:
+        digest (bytes): SHA256 digest of the stamped data, as committed to by the proof.
+
+    Returns:
+        str: Relative name, e.g. 'ab/cd/abcd...ef.ots'.
+    """
+    hex_digest = digest.hex()
+    return f"{hex_digest[:2]}/{hex_digest[2:4]}/{hex_digest}.ots"
+
+def is_storage_name(ots_filename: str) -> bool:
+    """
+    Tell whether a proof name follows the content-addressed layout.
+    """
+    return bool(_STORAGE_NAME.match(ots_filename))
+
+def proof_path(ots_filename: str) -> str:
+    """
+    Resolve a proof name to its path inside OTS_FOLDER.
+
+    Args:
+        ots_filename (str): Relative proof name (content-addressed or legacy flat name).
+
+    Returns:
+        str: Absolute path of the proof.
+
+    Raises:
+        ValueError: If the name is absolute, has a '..' component or would resolve outside OTS_FOLDER.
+    """
+    return resolve_path(OTS_FOLDER, ots_filename)
+
+def read_proof(ots_filename: str):
     """
-    Generate a SHA256 hash in bytes from transaction data.
+    Read a proof from the proof store.
 
     Args:
-        product_id (int): ID of the product involved in the transaction.
-        quantity (int): Quantity of items moved.
-        transaction_type (str): Type of transaction ('entry' or 'exit').
-        user_email (str): Email of the user who performed the transaction.
+        ots_filename (str): Relative proof name.
 
     Returns:
-        bytes: SHA256 hash of the formatted input data, encoded as bytes.
+        bytes or memoryview: The serialized proof (a zero-copy slice with packed storage).
+
+    Raises:
+        FileNotFoundError: If the proof is not stored.
+        ValueError: If the name is invalid.
+    """
+    return proof_store().read(ots_filename)
+
+def write_proof(ots_filename: str, content: bytes):
+    """
+    Store a proof, replacing any previous version.
+
+    Args:
+        ots_filename (str): Relative proof name.
+        content (bytes): The serialized proof.
+    """
+    proof_store().write(ots_filename, content)
+
+def proof_exists(ots_filename: str) -> bool:
+    """
+    Tell whether a proof is stored.
+
+    Raises:
+        ValueError: If the name is invalid.
+    """
+    return proof_store().exists(ots_filename)
+
+def proof_file_path(ots_filename: str):
+    """
+    Return the path of a stored proof file, or None when proofs are packed.
+
+    Raises:
+        ValueError: If the name is invalid.
     """
-    raw_data = f"{product_id}-{quantity}-{transaction_type}-{user_email}"
-    return hashlib.sha256(raw_data.encode()).digest()
+    return proof_store().file_path(ots_filename)
 
-def create_timestamp_file(hash_bytes: bytes, filename: str) -> str:
+def compact_proofs(min_dead_ratio: float = None):
+    """
+    Compact packed proof segments when enough of their bytes are superseded.
+
+    Args:
+        min_dead_ratio (float, optional): Threshold; defaults to OTS_PACK_COMPACT_RATIO.
+
+    Returns:
+        dict or None: Compaction stats, or None if nothing was compacted (or proofs are files).
+    """
+    if min_dead_ratio is None:
+        min_dead_ratio = current_app.config["OTS_PACK_COMPACT_RATIO"]
+    return proof_store().compact(min_dead_ratio)
+
+def create_timestamp_file(hash_bytes: bytes, backend: str = None) -> tuple:
     """
     Create a timestamp file (.ots) for a given hash by using OpenTimestamps.
 
+    The proof is stored under its content-addressed name in the proof store;
+    no copy of the hash is kept next to it.
+
     Args:
         hash_bytes (bytes): The transaction hash to be timestamped.
-        filename (str): Name of the file to store the binary hash before stamping.
+        backend (str, optional): 'subprocess' or 'library'; defaults to OTS_BACKEND.
 
     Returns:
-        str: Full path to the generated .ots file.
+        tuple(str, str): Name of the generated .ots file, relative to OTS_FOLDER,
+        and the hex SHA256 of the proof content.
     """
+    backend = _resolve_backend(backend)
     ensure_ots_folder()
-    file_path = os.path.join(OTS_FOLDER, filename)
+    ots_filename = ots_storage_name(hashlib.sha256(hash_bytes).digest())
+
+    if backend == "library":
+        # Stamp in-process
+        content = ots_library.stamp(hash_bytes)
+        write_proof(ots_filename, content)
+        return ots_filename, proof_content_hash(content)
 
-    # Save the hash as a binary file
-    with open(file_path, "wb") as f:
-        f.write(hash_bytes)
+    # The CLI stamps files: give it the hash in a scratch directory that is removed afterwards
+    with tempfile.TemporaryDirectory(dir=OTS_FOLDER) as scratch:
+        data_path = os.path.join(scratch, "hash.bin")
+        with open(data_path, "wb") as f:
+            f.write(hash_bytes)
 
-    # Run the OpenTimestamps client to generate the .ots proof
-    subprocess.run(["ots", "stamp", file_path], check=True)
+        # Run the OpenTimestamps client to generate the .ots proof
+        subprocess.run(["ots", "stamp", data_path], check=True)
+        with open(data_path + ".ots", "rb") as f:
+            content = f.read()
+        write_proof(ots_filename, content)
 
-    # Return the path to the generated .ots file
-    return file_path + ".ots"
+    return ots_filename, proof_content_hash(content)
 
-def verify_ots_file(filename: str) -> dict:
+def verify_ots_file(filename: str, backend: str = None) -> dict:
     """
     Verify the timestamp (.ots file) using OpenTimestamps.
 
+    The proof is checked against the digest it commits to, so no copy of the
+    stamped data is needed. Both backends return the same structure: 'success',
+    'status' ('confirmed', 'pending' or 'failed'), 'block_height', 'attested_at'
+    and the raw 'output'.
+
     Args:
-        filename (str): Name of the .ots file to be verified.
+        filename (str): Name of the .ots file to be verified, relative to OTS_FOLDER.
+        backend (str, optional): 'subprocess' or 'library'; defaults to OTS_BACKEND.
 
     Returns:
         dict: A dictionary containing verification status and output details.
               If the file is not found or verification fails, returns an error message.
     """
-    path = os.path.join(OTS_FOLDER, filename)
+    backend = _resolve_backend(backend)
+    try:
+        content = read_proof(filename)
+    except ValueError as e:
+        return {"success": False, "status": "failed", "message": str(e)}
+    except (FileNotFoundError, IsADirectoryError):
+        return {"success": False, "status": "failed", "message": "OTS file not found."}
 
-    if not os.path.exists(path):
-        return {"success": False, "message": "OTS file not found."}
+    if backend == "library":
+        return ots_library.verify(content)
+
+    try:
+        digest = _header_digest(content)
+    except ValueError as e:
+        return ots_library.verification_result("failed", str(e))
 
+    path = proof_file_path(filename)
+    if path is not None:
+        return _run_cli_verify(digest, path)
+
+    # Packed proofs have no file of their own: hand the CLI a scratch copy
+    with tempfile.TemporaryDirectory(dir=OTS_FOLDER) as scratch:
+        path = os.path.join(scratch, "proof.ots")
+        with open(path, "wb") as f:
+            f.write(content)
+        return _run_cli_verify(digest, path)
+
+def _run_cli_verify(digest: bytes, path: str) -> dict:
+    """
+    Run 'ots verify' on a proof file against the digest it commits to.
+    """
     try:
-        # Run the verification command using the OTS CLI
-        output = subprocess.check_output(["ots", "verify", path], stderr=subprocess.STDOUT)
-        return {
-            "success": True,
-            "output": output.decode()
-        }
+        # Run the verification command using the OTS CLI, against the committed digest
+        output = subprocess.check_output(
+            ["ots", "verify", "-d", digest.hex(), path],
+            stderr=subprocess.STDOUT
+        ).decode()
     except subprocess.CalledProcessError as e:
-        return {
-            "success": False,
-            "output": e.output.decode()
-        }
+        output = e.output.decode()
+
+    return _parse_cli_output(output)
+
+def _parse_cli_output(output: str) -> dict:
+    """
+    Turn the output of 'ots verify' into a structured verification result.
+
+    Args:
+        output (str): Combined stdout/stderr of the CLI.
+
+    Returns:
+        dict: Result in the format of ots_library.verification_result.
+    """
+    match = _CLI_SUCCESS.search(output)
+    if match:
+        return ots_library.verification_result(
+            "confirmed",
+            output,
+            block_height=int(match.group(1)),
+            attested_at=match.group(2)
+        )
+
+    if "Pending confirmation" in output:
+        return ots_library.verification_result("pending", output)
+
+    return ots_library.verification_result("failed", output)
+
+def upgrade_ots_file(filename: str):
+    """
+    Upgrade a .ots proof with the attestations its calendars have completed.
+
+    The upgraded proof replaces the stored one atomically (file rename, or a new
+    packed record), so concurrent readers see either the old or the new proof,
+    never a partial one. Upgrades always run in-process, whatever OTS_BACKEND is.
+
+    Args:
+        filename (str): Name of the .ots file inside OTS_FOLDER.
+
+    Returns:
+        str or None: The hex SHA256 of the rewritten proof if it gained a Bitcoin
+                     attestation, None if it is not anchored yet.
+
+    Raises:
+        FileNotFoundError: If the proof does not exist.
+        ValueError: If the name is outside OTS_FOLDER or the file is not a valid OpenTimestamps proof.
+    """
+    detached = ots_library.deserialize_timestamp(read_proof(filename))
+
+    if not ots_library.upgrade_timestamp(detached.timestamp):
+        return None
+
+    content = ots_library.serialize_timestamp(detached)
+    write_proof(filename, content)
+    return proof_content_hash(content)
+
+def proof_content_hash(content) -> str:
+    """
+    Hash a serialized proof, to identify its version without reading it again.
+
+    Args:
+        content (bytes): The serialized proof.
+
+    Returns:
+        str: The hex SHA256 of the proof; the hex form of read_ots_fingerprint's second value.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+def read_ots_digest(filename: str) -> bytes:
+    """
+    Read the digest committed to by a SHA256 .ots proof.
+
+    Args:
+        filename (str): Name of the .ots file in the proof store.
+
+    Returns:
+        bytes: The 32-byte SHA256 digest of the stamped file.
+
+    Raises:
+        FileNotFoundError: If the proof is not stored.
+        ValueError: If the name is outside OTS_FOLDER or the file is not a SHA256 OpenTimestamps proof.
+    """
+    return _header_digest(read_proof(filename))
+
+def read_ots_fingerprint(filename: str) -> tuple:
+    """
+    Read the digest committed to by a SHA256 .ots proof, and the SHA256 of the proof itself.
+
+    Args:
+        filename (str): Name of the .ots file in the proof store.
+
+    Returns:
+        tuple(bytes, bytes): The digest of the stamped file, and the digest of the proof content.
+
+    Raises:
+        FileNotFoundError: If the proof is not stored.
+        ValueError: If the name is outside OTS_FOLDER or the file is not a SHA256 OpenTimestamps proof.
+    """
+    content = read_proof(filename)
+    return _header_digest(content), hashlib.sha256(content).digest()
+
+def _header_digest(content) -> bytes:
+    """
+    Extract the committed digest from the header of a serialized SHA256 proof.
+
+    Raises:
+        ValueError: If the content is not a SHA256 OpenTimestamps proof.
+    """
+    prefix = OTS_HEADER_MAGIC + OTS_MAJOR_VERSION + OTS_OP_SHA256
+    header = bytes(content[:len(prefix) + 32])
+    if not header.startswith(prefix) or len(header) != len(prefix) + 32:
+        raise ValueError("Unsupported OTS proof format")
+
+    return header[len(prefix):]
+
+def build_inclusion_timestamp(root_filename: str, merkle_proof: str) -> bytes:
+    """
+    Build a standalone .ots proof for one member of a Merkle-batched stamp.
+
+    The leaf's Merkle path is written as OpenTimestamps append/prepend + SHA256
+    operations, followed by a SHA256 of the root (the digest of the stamped
+    root file) and the timestamp stored in the root's .ots file. The result is
+    a regular proof for the leaf digest, verifiable with any OTS client.
+
+    Args:
+        root_filename (str): Name of the root's .ots file inside OTS_FOLDER.
+        merkle_proof (str): Hex-encoded inclusion proof of the leaf.
+
+    Returns:
+        bytes: Serialized .ots proof whose file digest is the leaf.
+    """
+    leaf, steps = parse_merkle_proof(merkle_proof)
+
+    root_ots = bytes(read_proof(root_filename))
+
+    prefix = OTS_HEADER_MAGIC + OTS_MAJOR_VERSION + OTS_OP_SHA256
+    if not root_ots.startswith(prefix):
+        raise ValueError("Unsupported OTS proof format")
+
+    # Each step hashes the running digest together with its 32-byte sibling
+    path_ops = bytearray()
+    for side, sibling in steps:
+        tag = OTS_OP_PREPEND if side == SIBLING_LEFT else OTS_OP_APPEND
+        path_ops += tag + bytes([len(sibling)]) + sibling + OTS_OP_SHA256
+
+    root_timestamp = root_ots[len(prefix) + 32:]
+    return prefix + leaf + bytes(path_ops) + OTS_OP_SHA256 + root_timestamp
@@ -0,0 +1,236 @@
+"""
+In-process OpenTimestamps module.
+
+Stamps, upgrades and verifies proofs with the opentimestamps library instead of
+spawning the 'ots' CLI, which saves an interpreter start-up and client import
+per call. Bitcoin attestations are checked against block headers served by an
+Esplora API rather than a local Bitcoin node.
+"""
+
+import json
+import os
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from io import BytesIO
+from flask import current_app
+from opentimestamps.calendar import RemoteCalendar, UrlWhitelist, DEFAULT_CALENDAR_WHITELIST
+from opentimestamps.core.notary import PendingAttestation, BitcoinBlockHeaderAttestation
+from opentimestamps.core.op import OpAppend, OpSHA256
+from opentimestamps.core.serialize import BytesSerializationContext, BytesDeserializationContext
+from opentimestamps.core.timestamp import DetachedTimestampFile
+
+
+@lru_cache(maxsize=8)
+def _calendar_whitelist(calendar_urls: tuple) -> UrlWhitelist:
+    """
+    Return the calendars a proof may point us to: the configured ones plus the public pools.
+    """
+    whitelist = UrlWhitelist(calendar_urls)
+    whitelist.update(DEFAULT_CALENDAR_WHITELIST)
+    return whitelist
+
+
+def serialize_timestamp(detached: DetachedTimestampFile) -> bytes:
+    """
+    Serialize a detached timestamp into .ots file content.
+    """
+    ctx = BytesSerializationContext()
+    detached.serialize(ctx)
+    return ctx.getbytes()
+
+
+def deserialize_timestamp(content: bytes) -> DetachedTimestampFile:
+    """
+    Parse .ots file content into a detached timestamp.
+
+    Raises:
+        ValueError: If the content is not a valid OpenTimestamps proof.
+    """
+    try:
+        return DetachedTimestampFile.deserialize(BytesDeserializationContext(content))
+    except Exception as e:
+        raise ValueError(f"Invalid OTS proof: {e}")
+
+
+def stamp(file_content: bytes) -> bytes:
+    """
+    Timestamp a file's content on the calendars of OTS_CALENDAR_URLS.
+
+    Like 'ots stamp', the file digest is salted with a random nonce before it is
+    sent, so calendars never learn the digest itself.
+
+    Args:
+        file_content (bytes): Content of the file to timestamp.
+
+    Returns:
+        bytes: Serialized .ots proof with one pending attestation per calendar.
+
+    Raises:
+        RuntimeError: If fewer than OTS_MIN_CALENDARS calendars accepted the hash.
+    """
+    detached = DetachedTimestampFile.from_fd(OpSHA256(), BytesIO(file_content))
+    tip = detached.timestamp.ops.add(OpAppend(os.urandom(16))).ops.add(OpSHA256())
+
+    # Settings are read here: the pool threads below run outside the app context
+    calendar_urls = current_app.config["OTS_CALENDAR_URLS"]
+    min_calendars = current_app.config["OTS_MIN_CALENDARS"]
+    timeout = current_app.config["OTS_CALENDAR_TIMEOUT"]
+
+    def submit(url):
+        return RemoteCalendar(url).submit(tip.msg, timeout=timeout)
+
+    # Calendars are independent, so they are contacted in parallel
+    accepted, errors = 0, []
+    with ThreadPoolExecutor(max_workers=max(1, len(calendar_urls))) as pool:
+        futures = {url: pool.submit(submit, url) for url in calendar_urls}
+        for url, future in futures.items():
+            try:
+                tip.merge(future.result())
+                accepted += 1
+            except Exception as e:
+                errors.append(f"{url}: {e}")
+
+    if accepted < min(min_calendars, len(calendar_urls)) or accepted == 0:
+        raise RuntimeError("Timestamp not accepted by enough calendars: " + "; ".join(errors))
+
+    return serialize_timestamp(detached)
+
+
+def _pending_nodes(timestamp):
+    """
+    Yield (timestamp node, attestation) for every pending attestation of a timestamp tree.
+    """
+    for attestation in timestamp.attestations:
+        if isinstance(attestation, PendingAttestation):
+            yield timestamp, attestation
+    for child in timestamp.ops.values():
+        yield from _pending_nodes(child)
+
+
+def upgrade_timestamp(timestamp) -> bool:
+    """
+    Fetch completed attestations for the pending ones of a timestamp, in place.
+
+    Only whitelisted calendars are contacted, so a crafted proof cannot make the
+    server issue requests to arbitrary URLs.
+
+    Args:
+        timestamp (Timestamp): Root timestamp of a proof.
+
+    Returns:
+        bool: True if the timestamp gained a Bitcoin attestation.
+    """
+    whitelist = _calendar_whitelist(tuple(current_app.config["OTS_CALENDAR_URLS"]))
+    timeout = current_app.config["OTS_CALENDAR_TIMEOUT"]
+    changed = False
+    for node, attestation in list(_pending_nodes(timestamp)):
+        if attestation.uri not in whitelist:
+            continue
+        try:
+            upgraded = RemoteCalendar(attestation.uri).get_timestamp(node.msg, timeout=timeout)
+        except Exception:
+            # Not anchored yet (commitment not found) or calendar unreachable
+            continue
+
+        before = _count_bitcoin_attestations(node)
+        node.merge(upgraded)
+        changed = changed or _count_bitcoin_attestations(node) > before
+    return changed
+
+
+def _count_bitcoin_attestations(timestamp) -> int:
+    """
+    Count the Bitcoin block header attestations of a timestamp tree.
+    """
+    return sum(
+        isinstance(attestation, BitcoinBlockHeaderAttestation)
+        for _, attestation in timestamp.all_attestations()
+    )
+
+
+@lru_cache(maxsize=4096)
+def _block_header(height: int, esplora_url: str, timeout: float) -> tuple:
+    """
+    Read the merkle root and time of a Bitcoin block from an Esplora API.
+
+    Block headers never change once buried, so lookups are cached.
+
+    Returns:
+        tuple(str, int): Merkle root (display hex) and block timestamp (Unix time).
+    """
+    with urllib.request.urlopen(f"{esplora_url}/block-height/{height}", timeout=timeout) as resp:
+        block_hash = resp.read().decode().strip()
+    with urllib.request.urlopen(f"{esplora_url}/block/{block_hash}", timeout=timeout) as resp:
+        block = json.loads(resp.read())
+    return block["merkle_root"], block["timestamp"]
+
+
+def verification_result(status: str, output: str, block_height: int = None, attested_at: str = None) -> dict:
+    """
+    Build a verification result in the format shared by both OTS backends.
+    """
+    return {
+        "success": status == "confirmed",
+        "status": status,
+        "block_height": block_height,
+        "attested_at": attested_at,
+        "output": output
+    }
+
+
+def verify(ots_content: bytes, file_content: bytes = None) -> dict:
+    """
+    Verify a proof: upgrade pending attestations in memory, then check Bitcoin attestations.
+
+    Args:
+        ots_content (bytes): Serialized .ots proof.
+        file_content (bytes, optional): Original file; when given, its digest must match the proof.
+
+    Returns:
+        dict: 'success', 'status' ('confirmed', 'pending' or 'failed'), 'block_height',
+              'attested_at' (ISO 8601 or None) and a human-readable 'output'.
+    """
+    try:
+        detached = deserialize_timestamp(ots_content)
+    except ValueError as e:
+        return verification_result("failed", str(e))
+
+    if file_content is not None and OpSHA256()(file_content) != detached.file_digest:
+        return verification_result("failed", "File does not match original!")
+
+    upgrade_timestamp(detached.timestamp)
+
+    attestations = list(detached.timestamp.all_attestations())
+    confirmed = []
+    for msg, attestation in attestations:
+        if not isinstance(attestation, BitcoinBlockHeaderAttestation):
+            continue
+        try:
+            merkle_root, block_time = _block_header(
+                attestation.height, current_app.config["OTS_ESPLORA_URL"], current_app.config["OTS_CALENDAR_TIMEOUT"]
+            )
+        except Exception as e:
+            return verification_result("failed", f"Could not read Bitcoin block {attestation.height}: {e}")
+        # Attestations commit to the merkle root in internal (reversed) byte order
+        if msg[::-1].hex() != merkle_root:
+            return verification_result("failed", f"Bitcoin block {attestation.height} does not match the proof")
+        confirmed.append((attestation.height, block_time))
+
+    if confirmed:
+        height, block_time = min(confirmed)
+        attested_at = datetime.fromtimestamp(block_time, timezone.utc).isoformat()
+        return verification_result(
+            "confirmed",
+            f"Success! Bitcoin block {height} attests existence as of {attested_at}",
+            block_height=height,
+            attested_at=attested_at
+        )
+
+    pending = [a.uri for _, a in attestations if isinstance(a, PendingAttestation)]
+    if pending:
+        return verification_result("pending", "\n".join(f"Calendar {uri}: Pending confirmation in Bitcoin blockchain" for uri in pending))
+
+    return verification_result("failed", "Timestamp has no attestations")
+
@@ -0,0 +1,75 @@
+"""
+Pagination module.
+
+Provides helpers for keyset (cursor) pagination over (created_at, id): cursors
+are opaque URL-safe tokens encoding the sort key of the last row of a page, so
+fetching any page costs one index range scan, however deep the client pages.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    Encode the sort key of a row into an opaque cursor.
+
+    Args:
+        created_at (datetime): Creation timestamp of the last row of a page.
+        id (int): Identifier of the last row of a page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor string received from a client.
+
+    Returns:
+        tuple(datetime, int): The (created_at, id) key to resume after.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_page_args(args, default_limit: int, max_limit: int) -> tuple:
+    """
+    Read the 'limit' and 'cursor' query parameters of a paginated request.
+
+    Args:
+        args (MultiDict): Request query parameters.
+        default_limit (int): Page size used when 'limit' is absent.
+        max_limit (int): Largest page size a client may request.
+
+    Returns:
+        tuple(int, tuple or None): The page size and the decoded cursor, if any.
+
+    Raises:
+        ValueError: If 'limit' is not an integer between 1 and max_limit, or the cursor is malformed.
+    """
+    limit = args.get("limit", default_limit)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("Limit must be an integer")
+
+    if not 1 <= limit <= max_limit:
+        raise ValueError(f"Limit must be between 1 and {max_limit}")
+
+    cursor = args.get("cursor")
+    return limit, decode_cursor(cursor) if cursor else None
@@ -0,0 +1,422 @@
+"""
+Proof store module.
+
+Keeps .ots proofs either as one file each (the default) or packed into
+append-only segment files. The packed store suits very large ledgers: it
+needs a handful of inodes instead of one per proof, and reads are slices of
+memory-mapped segments instead of an open() per proof.
+
+Packed layout, under '<OTS folder>/packs':
+    segment-000001.pack ...  proofs appended back to back, each segment capped in size
+    index                    one 'name segment offset length' line per write; the last
+                             line of a name wins, so a rewritten (upgraded) proof is
+                             simply appended again
+    .lock                    serializes writers across processes
+
+Rewritten proofs leave dead bytes behind in older segments; compaction copies
+the live proofs into fresh segments, swaps the index and drops the old segments.
+"""
+
+import fcntl
+import mmap
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+# Characters allowed in packed proof names (the packed index is whitespace-separated).
+# The stores only generate such names; legacy flat names may contain other characters
+_NAME = re.compile(r"^[A-Za-z0-9._/-]+$")
+_SEGMENT = re.compile(r"^segment-(\d{6})\.pack$")
+
+
+def resolve_path(root: str, name: str) -> str:
+    """
+    Resolve a proof name to a path inside a root folder.
+
+    Only path traversal is rejected, so legacy names written by older versions
+    (which may contain characters such as '+') still resolve.
+
+    Args:
+        root (str): Folder the proofs live in.
+        name (str): Relative proof name.
+
+    Returns:
+        str: Absolute path of the proof.
+
+    Raises:
+        ValueError: If the name is empty, absolute, has a '..' component or would resolve outside the root.
+    """
+    if not name or "\0" in name or os.path.isabs(name) or ".." in name.replace("\\", "/").split("/"):
+        raise ValueError("Invalid OTS file name")
+    root = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root, name))
+    if not path.startswith(root + os.sep):
+        raise ValueError("Invalid OTS file name")
+    return path
+
+
+def write_atomically(path: str, content: bytes):
+    """
+    Write a file through a temporary file and a rename, so readers never see it partially written.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class FileProofStore:
+    """
+    One file per proof, at its name relative to the root folder.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def file_path(self, name: str) -> str:
+        """
+        Return the path of a proof, for callers that can serve or pass files directly.
+
+        Raises:
+            ValueError: If the name is invalid.
+        """
+        return resolve_path(self.root, name)
+
+    def exists(self, name: str) -> bool:
+        """
+        Tell whether a proof is stored.
+        """
+        return os.path.isfile(resolve_path(self.root, name))
+
+    def read(self, name: str) -> bytes:
+        """
+        Read a proof.
+
+        Raises:
+            FileNotFoundError: If the proof is not stored.
+            ValueError: If the name is invalid.
+        """
+        path = resolve_path(self.root, name)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(name)
+        with open(path, "rb") as f:
+            return f.read()
+
+    def write(self, name: str, content: bytes):
+        """
+        Store a proof, replacing any previous version atomically.
+        """
+        write_atomically(resolve_path(self.root, name), content)
+
+    def compact(self, min_dead_ratio: float = 0.0):
+        """
+        Nothing to compact: replaced files free their space immediately.
+        """
+        return None
+
+
+class PackedProofStore:
+    """
+    Proofs appended to size-capped segment files, located through a sidecar index.
+
+    Safe for concurrent use by threads and by processes sharing the folder:
+    writers hold an exclusive file lock, and readers pick up new index lines
+    (or a compacted index) before every lookup.
+    """
+
+    def __init__(self, root: str, segment_size: int = 64 * 1024 * 1024):
+        self.root = root
+        self.pack_dir = os.path.join(root, "packs")
+        self._segment_size = segment_size
+        self._index_path = os.path.join(self.pack_dir, "index")
+        self._index = {}
+        self._index_pos = 0
+        self._index_ino = None
+        self._maps = {}
+        self._lock = threading.RLock()
+
+    def file_path(self, name: str):
+        """
+        Packed proofs have no file of their own; a legacy file not migrated yet is returned.
+
+        Raises:
+            ValueError: If the name would resolve outside the root.
+        """
+        if self._packed(name):
+            return None
+        return self._legacy_path(name)
+
+    def exists(self, name: str) -> bool:
+        """
+        Tell whether a proof is stored, packed or as a legacy file not migrated yet.
+        """
+        return self._packed(name) or self._legacy_path(name) is not None
+
+    def read(self, name: str):
+        """
+        Read a proof as a zero-copy slice of its memory-mapped segment, or from
+        its legacy file until it is migrated.
+
+        Returns:
+            memoryview or bytes: The serialized proof.
+
+        Raises:
+            FileNotFoundError: If the proof is not stored.
+            ValueError: If the name would resolve outside the root.
+        """
+        if _NAME.match(name):
+            with self._lock:
+                try:
+                    return self._read(name)
+                except FileNotFoundError:
+                    # The segment may have been dropped by a compaction in another process
+                    self._refresh(force=True)
+                    if name in self._index:
+                        return self._read(name)
+
+        legacy_path = self._legacy_path(name)
+        if legacy_path is None:
+            raise FileNotFoundError(name)
+        with open(legacy_path, "rb") as f:
+            return f.read()
+
+    def write(self, name: str, content: bytes):
+        """
+        Append a proof to the current segment and record it in the index.
+
+        Raises:
+            ValueError: If the name is not one the stores generate.
+        """
+        if not _NAME.match(name):
+            raise ValueError("Invalid OTS file name")
+        with self._lock, self._writer():
+            self._refresh()
+            segments = self._segments()
+            segment = segments[-1] if segments else 1
+            segment_path = self._segment_path(segment)
+            size = os.path.getsize(segment_path) if os.path.exists(segment_path) else 0
+            if size and size + len(content) > self._segment_size:
+                segment += 1
+                segment_path = self._segment_path(segment)
+                size = 0
+
+            with open(segment_path, "ab") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._append_index(f"{name} {segment} {size} {len(content)}\n")
+            self._index[name] = (segment, size, len(content))
+
+    def stats(self) -> dict:
+        """
+        Report how much of the segments is still referenced.
+
+        Returns:
+            dict: 'proofs', 'live_bytes', 'total_bytes' and 'segments'.
+        """
+        with self._lock:
+            self._refresh()
+            segments = self._segments()
+            return {
+                "proofs": len(self._index),
+                "live_bytes": sum(length for _, _, length in self._index.values()),
+                "total_bytes": sum(os.path.getsize(self._segment_path(s)) for s in segments),
+                "segments": len(segments)
+            }
+
+    def compact(self, min_dead_ratio: float = 0.0):
+        """
+        Copy the live proofs into fresh segments and drop the old ones.
+
+        Args:
+            min_dead_ratio (float, optional): Only compact when at least this share
+                of the segment bytes is dead (superseded proofs).
+
+        Returns:
+            dict or None: Stats before compaction and 'reclaimed_bytes', or None if skipped.
+        """
+        with self._lock, self._writer():
+            self._refresh()
+            before = self.stats()
+            dead = before["total_bytes"] - before["live_bytes"]
+            if not before["total_bytes"] or dead / before["total_bytes"] < min_dead_ratio or dead == 0:
+                return None
+
+            old_segments = self._segments()
+            segment = old_segments[-1] + 1
+            size = 0
+            lines = []
+            out = open(self._segment_path(segment), "ab")
+            try:
+                # Keep proofs in segment order, so reads stay mostly sequential
+                for name, (seg, offset, length) in sorted(self._index.items(), key=lambda item: item[1]):
+                    if size and size + length > self._segment_size:
+                        out.flush()
+                        os.fsync(out.fileno())
+                        out.close()
+                        segment += 1
+                        size = 0
+                        out = open(self._segment_path(segment), "ab")
+                    out.write(self._read(name))
+                    lines.append(f"{name} {segment} {size} {length}\n")
+                    size += length
+                out.flush()
+                os.fsync(out.fileno())
+            finally:
+                out.close()
+
+            # Swap the index, then drop the segments nothing points to anymore
+            write_atomically(self._index_path, "".join(lines).encode())
+            self._drop_maps()
+            for old in old_segments:
+                os.remove(self._segment_path(old))
+
+            self._refresh(force=True)
+            return {**before, "reclaimed_bytes": dead}
+
+    def _packed(self, name: str) -> bool:
+        """
+        Tell whether a proof is in the packs (only generated names ever are).
+        """
+        if not _NAME.match(name):
+            return False
+        with self._lock:
+            self._refresh()
+            return name in self._index
+
+    def _legacy_path(self, name: str):
+        """
+        Path of a proof written as a file of its own before proofs were packed, or None.
+        """
+        path = resolve_path(self.root, name)
+        return path if os.path.isfile(path) else None
+
+    def _read(self, name: str) -> memoryview:
+        """
+        Look a proof up and slice it out of its segment.
+        """
+        self._refresh()
+        entry = self._index.get(name)
+        if entry is None:
+            raise FileNotFoundError(name)
+        segment, offset, length = entry
+        return memoryview(self._map(segment, offset + length))[offset:offset + length]
+
+    def _map(self, segment: int, needed: int):
+        """
+        Return a read-only mapping of a segment covering at least 'needed' bytes.
+
+        The current segment keeps growing, so its mapping is renewed when a read goes past it.
+        """
+        mapping = self._maps.get(segment)
+        if mapping is None or len(mapping) < needed:
+            with open(self._segment_path(segment), "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mapping
+        return mapping
+
+    def _drop_maps(self):
+        """
+        Forget every segment mapping; mappings still referenced by slices stay alive until released.
+        """
+        self._maps = {}
+
+    def _refresh(self, force: bool = False):
+        """
+        Load index lines written since the last lookup, or the whole index after a compaction.
+        """
+        try:
+            stat = os.stat(self._index_path)
+        except FileNotFoundError:
+            self._index, self._index_pos, self._index_ino = {}, 0, None
+            return
+
+        if force or stat.st_ino != self._index_ino:
+            # A compaction replaced the index: start over
+            self._index, self._index_pos, self._index_ino = {}, 0, stat.st_ino
+            self._drop_maps()
+
+        if stat.st_size <= self._index_pos:
+            return
+
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_pos)
+            chunk = f.read(stat.st_size - self._index_pos)
+
+        # Only consume complete lines; a line being written is picked up next time
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].decode().splitlines():
+            name, segment, offset, length = line.split(" ")
+            self._index[name] = (int(segment), int(offset), int(length))
+        self._index_pos += end
+
+    def _append_index(self, line: str):
+        """
+        Append one record to the index, durably.
+        """
+        with open(self._index_path, "ab") as f:
+            f.write(line.encode())
+            f.flush()
+            os.fsync(f.fileno())
+        self._index_pos += len(line.encode())
+        if self._index_ino is None:
+            self._index_ino = os.stat(self._index_path).st_ino
+
+    def _segments(self) -> list:
+        """
+        Return the IDs of the existing segments, in order.
+        """
+        if not os.path.isdir(self.pack_dir):
+            return []
+        return sorted(int(m.group(1)) for m in map(_SEGMENT.match, os.listdir(self.pack_dir)) if m)
+
+    def _segment_path(self, segment: int) -> str:
+        """
+        Return the path of a segment file.
+        """
+        return os.path.join(self.pack_dir, f"segment-{segment:06d}.pack")
+
+    @contextmanager
+    def _writer(self):
+        """
+        Hold the cross-process writer lock.
+        """
+        os.makedirs(self.pack_dir, exist_ok=True)
+        with open(os.path.join(self.pack_dir, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def open_proof_store(root: str, storage: str = "files", segment_size: int = 64 * 1024 * 1024):
+    """
+    Create the proof store selected by configuration.
+
+    Args:
+        root (str): The OTS folder.
+        storage (str, optional): 'files' (one file per proof) or 'packed'.
+        segment_size (int, optional): Maximum size of a packed segment, in bytes.
+
+    Returns:
+        FileProofStore or PackedProofStore: The store.
+
+    Raises:
+        ValueError: If the storage type is unknown.
+    """
+    if storage == "files":
+        return FileProofStore(root)
+    if storage == "packed":
+        return PackedProofStore(root, segment_size)
+    raise ValueError(f"Unknown OTS storage '{storage}', expected 'files' or 'packed'")
@@ -2,11 +2,109 @@
 Security utility module.
 
 Provides functions for secure password operations, such as hashing passwords using bcrypt.
+bcrypt work runs on a small dedicated thread pool with a bounded backlog, so a burst
+of logins cannot take every request thread; when the backlog is full, callers get
+PasswordHasherBusy immediately instead of queueing.
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import bcrypt
 
 
+class PasswordHasherBusy(Exception):
+    """
+    Raised when the password hashing pool cannot accept more work.
+
+    Attributes:
+        retry_after (int): Seconds the client should wait before retrying.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("Authentication service is busy, please retry shortly")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a size-bounded executor.
+
+    At most BCRYPT_MAX_WORKERS operations run at once and at most BCRYPT_QUEUE_LIMIT
+    more may wait; anything beyond that is rejected with PasswordHasherBusy.
+    """
+
+    def __init__(self):
+        self._rounds = 12
+        self._max_workers = 2
+        self._retry_after = 1
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self._max_workers)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Read the bcrypt configuration of a Flask application.
+
+        Args:
+            app (Flask): The application whose BCRYPT_* settings apply.
+        """
+        self._rounds = app.config["BCRYPT_ROUNDS"]
+        self._max_workers = max(1, app.config["BCRYPT_MAX_WORKERS"])
+        self._retry_after = app.config["BCRYPT_RETRY_AFTER"]
+        self._slots = threading.BoundedSemaphore(self._max_workers + max(0, app.config["BCRYPT_QUEUE_LIMIT"]))
+        app.extensions["password_hasher"] = self
+
+    @property
+    def rounds(self) -> int:
+        """
+        bcrypt cost factor used for new hashes.
+        """
+        return self._rounds
+
+    def run(self, fn, *args):
+        """
+        Run a bcrypt call on the pool and wait for its result.
+
+        Args:
+            fn (callable): bcrypt function to call.
+            *args: Arguments forwarded to fn.
+
+        Returns:
+            Any: The value returned by fn.
+
+        Raises:
+            PasswordHasherBusy: If the pool and its backlog are full.
+        """
+        # Reserve a running or waiting slot without blocking the request thread
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy(self._retry_after)
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def _get_executor(self):
+        """
+        Create the executor on first use.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="bcrypt"
+                )
+            return self._executor
+
+
+# Shared hasher instance, bound to the application in create_app
+password_hasher = PasswordHasher()
+
+
 def hash_password(password: str) -> str:
     """
     Hash a plaintext password for secure storage.
@@ -16,10 +114,47 @@ def hash_password(password: str) -> str:
 
     Returns:
         str: The resulting bcrypt-hashed password as a UTF-8 string.
+
+    Raises:
+        PasswordHasherBusy: If the hashing pool is saturated.
     """
     # Encode the plaintext password to bytes
     password_bytes = password.encode("utf-8")
-    # Generate a salt and hash the password
-    hashed_bytes = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+    # Generate a salt at the configured cost and hash the password on the pool
+    hashed_bytes = password_hasher.run(bcrypt.hashpw, password_bytes, bcrypt.gensalt(password_hasher.rounds))
     # Decode the hashed bytes back to a string for storage
     return hashed_bytes.decode("utf-8")
+
+
+def check_password(password: str, password_hash: str) -> bool:
+    """
+    Check a plaintext password against a stored bcrypt hash.
+
+    Args:
+        password (str): The plaintext password provided by the user.
+        password_hash (str): The stored bcrypt hash.
+
+    Returns:
+        bool: True if the password matches.
+
+    Raises:
+        PasswordHasherBusy: If the hashing pool is saturated.
+    """
+    return password_hasher.run(bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Tell whether a stored hash was made with a different cost factor than the configured one.
+
+    Args:
+        password_hash (str): Stored bcrypt hash, formatted as '$2b$<cost>$<salt+hash>'.
+
+    Returns:
+        bool: True if the hash should be replaced.
+    """
+    try:
+        return int(password_hash.split("$")[2]) != password_hasher.rounds
+    except (IndexError, ValueError):
+        # Not a bcrypt hash we can read: replace it
+        return True
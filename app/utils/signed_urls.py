@@ -0,0 +1,64 @@
+"""
+Signed URL utility module.
+
+Signs and checks short-lived proof download links. A link names the proof it
+grants (its content-addressed file name, plus the Merkle path for batched
+transactions), the transaction it is downloaded for, and its expiry time, all
+covered by an HMAC-SHA256 signature. Anything holding the secret can check a
+link on its own, without a token or a database lookup.
+
+The signed message is the four fields joined by newlines:
+
+    <ots_filename>\n<transaction_id>\n<merkle_proof or empty>\n<expires, unix seconds>
+
+and the signature is its lowercase hex HMAC-SHA256 under OTS_LINK_SECRET. That
+secret is kept apart from SECRET_KEY, which signs the JWTs: a server checking the
+links must not be able to issue tokens.
+"""
+
+import hashlib
+import hmac
+import time
+
+
+def sign_proof_link(secret: str, ots_filename: str, transaction_id: int, merkle_proof: str, expires: int) -> str:
+    """
+    Compute the signature of a proof download link.
+
+    Args:
+        secret (str): Signing secret.
+        ots_filename (str): Name of the proof in the proof store.
+        transaction_id (int): Transaction the proof is downloaded for.
+        merkle_proof (str): Hex Merkle path of a batched transaction, or None.
+        expires (int): Expiry time, in Unix seconds.
+
+    Returns:
+        str: Hex HMAC-SHA256 signature.
+    """
+    message = f"{ots_filename}\n{transaction_id}\n{merkle_proof or ''}\n{expires}"
+    return hmac.new(secret.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+def check_proof_link(secret: str, ots_filename: str, transaction_id: int, merkle_proof: str,
+                     expires: int, signature: str, now: float = None) -> bool:
+    """
+    Check that a proof download link is authentic and not expired.
+
+    Args:
+        secret (str): Signing secret.
+        ots_filename (str): Name of the proof in the proof store.
+        transaction_id (int): Transaction the proof is downloaded for.
+        merkle_proof (str): Hex Merkle path of a batched transaction, or None.
+        expires (int): Expiry time, in Unix seconds.
+        signature (str): Signature carried by the link.
+        now (float, optional): Current Unix time; defaults to time.time().
+
+    Returns:
+        bool: True if the signature matches and the link has not expired.
+    """
+    if expires < (time.time() if now is None else now):
+        return False
+    expected = sign_proof_link(secret, ots_filename, transaction_id, merkle_proof, expires)
+    # Constant-time comparison, so the signature cannot be guessed byte by byte; on bytes,
+    # since compare_digest rejects non-ASCII strings (a tampered 'sig' must fail, not raise)
+    return hmac.compare_digest(expected.encode(), (signature or "").encode())
@@ -0,0 +1,161 @@
+"""
+ZIP streaming module.
+
+Writes ZIP archives as a sequence of byte chunks, for responses that are sent
+while they are being built. Entries are stored without compression (proofs and
+manifests gain little from deflate), and their size and CRC are known before
+they are written, so no data descriptors or seeking are needed.
+
+Central directory records are kept in a spooled temporary file rather than in
+memory, so memory use does not grow with the number of entries. ZIP64 records
+are written when the archive outgrows the classic format (65535 entries or 4 GiB).
+"""
+
+import struct
+import tempfile
+import zlib
+from datetime import datetime
+
+# Classic ZIP fields are 16/32-bit; larger values move to the ZIP64 extra field
+_MAX_16 = 0xFFFF
+_MAX_32 = 0xFFFFFFFF
+# Version needed to extract: 2.0 for plain entries, 4.5 for ZIP64
+_VERSION = 20
+_VERSION_ZIP64 = 45
+# General purpose flag: names are UTF-8
+_FLAG_UTF8 = 0x0800
+# Central directory records held in memory before spilling to disk
+_CENTRAL_SPOOL_SIZE = 1024 * 1024
+_CHUNK_SIZE = 64 * 1024
+
+
+def _dos_datetime(moment: datetime) -> tuple:
+    """
+    Encode a timestamp as MS-DOS (time, date) fields, clamped to the years ZIP can represent.
+    """
+    year = min(max(moment.year, 1980), 2107)
+    return (
+        (moment.hour << 11) | (moment.minute << 5) | (moment.second // 2),
+        ((year - 1980) << 9) | (moment.month << 5) | moment.day
+    )
+
+
+class ZipStream:
+    """
+    Incremental writer of a stored ZIP archive.
+
+    Call add() or add_file() per entry and send the chunks they return in order,
+    then send the chunks of finish().
+    """
+
+    def __init__(self):
+        self._offset = 0
+        self._entries = 0
+        self._central = tempfile.SpooledTemporaryFile(max_size=_CENTRAL_SPOOL_SIZE)
+        self._central_size = 0
+
+    def add(self, name: str, content: bytes, modified: datetime = None) -> bytes:
+        """
+        Add an entry held in memory.
+
+        Args:
+            name (str): Path of the entry inside the archive.
+            content (bytes): Entry data.
+            modified (datetime, optional): Modification time; defaults to now.
+
+        Returns:
+            bytes: Local header and data of the entry.
+        """
+        header = self._header(name, len(content), zlib.crc32(content), modified)
+        self._offset += len(header) + len(content)
+        return header + content
+
+    def add_file(self, name: str, fileobj, size: int, crc: int, modified: datetime = None):
+        """
+        Add an entry read from a file object, whose size and CRC-32 are already known.
+
+        Args:
+            name (str): Path of the entry inside the archive.
+            fileobj (file): Binary file positioned at the start of the data.
+            size (int): Number of bytes to copy.
+            crc (int): CRC-32 of those bytes.
+            modified (datetime, optional): Modification time; defaults to now.
+
+        Yields:
+            bytes: The local header, then the data in chunks.
+        """
+        header = self._header(name, size, crc, modified)
+        self._offset += len(header) + size
+        yield header
+        while True:
+            chunk = fileobj.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    def finish(self):
+        """
+        Close the archive.
+
+        Yields:
+            bytes: The central directory and the end records.
+        """
+        central_offset = self._offset
+        self._central.seek(0)
+        while True:
+            chunk = self._central.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+        self._central.close()
+
+        end_offset = central_offset + self._central_size
+        if self._entries >= _MAX_16 or central_offset >= _MAX_32 or self._central_size >= _MAX_32:
+            # ZIP64 end of central directory record, and the locator pointing to it
+            yield struct.pack(
+                "<IQHHIIQQQQ", 0x06064B50, 44, _VERSION_ZIP64, _VERSION_ZIP64, 0, 0,
+                self._entries, self._entries, self._central_size, central_offset
+            )
+            yield struct.pack("<IIQI", 0x07064B50, 0, end_offset, 1)
+
+        yield struct.pack(
+            "<IHHHHIIH", 0x06054B50, 0, 0,
+            min(self._entries, _MAX_16), min(self._entries, _MAX_16),
+            min(self._central_size, _MAX_32), min(central_offset, _MAX_32), 0
+        )
+
+    def _header(self, name: str, size: int, crc: int, modified: datetime) -> bytes:
+        """
+        Build the local header of an entry and record its central directory entry.
+        """
+        encoded_name = name.encode()
+        dos_time, dos_date = _dos_datetime(modified or datetime.now())
+        offset = self._offset
+        zip64 = size >= _MAX_32
+        version = _VERSION_ZIP64 if zip64 or offset >= _MAX_32 else _VERSION
+
+        # Local header: sizes move to a ZIP64 extra field when they do not fit
+        local_extra = struct.pack("<HHQQ", 0x0001, 16, size, size) if zip64 else b""
+        local_size = _MAX_32 if zip64 else size
+        header = struct.pack(
+            "<IHHHHHIIIHH", 0x04034B50, version, _FLAG_UTF8, 0, dos_time, dos_date,
+            crc, local_size, local_size, len(encoded_name), len(local_extra)
+        ) + encoded_name + local_extra
+
+        # Central directory entry: large sizes and offsets go to its ZIP64 extra field
+        extra_values = ([size, size] if zip64 else []) + ([offset] if offset >= _MAX_32 else [])
+        central_extra = (
+            struct.pack(f"<HH{len(extra_values)}Q", 0x0001, 8 * len(extra_values), *extra_values)
+            if extra_values else b""
+        )
+        record = struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | version, version, _FLAG_UTF8, 0,
+            dos_time, dos_date, crc, local_size, local_size, len(encoded_name),
+            len(central_extra), 0, 0, 0, 0o100644 << 16, min(offset, _MAX_32)
+        ) + encoded_name + central_extra
+        self._central.write(record)
+        self._central_size += len(record)
+        self._entries += 1
+
+        return header
+
@@ -0,0 +1,76 @@
+"""
+Compare the 'subprocess' and 'library' OTS backends.
+
+Stamps and verifies the same number of random hashes with each backend and
+prints per-call latencies. Stamping contacts the configured calendars, so
+results include network time; run it from the machine that serves the API.
+
+Usage:
+    python benchmark_ots.py --count 20 --backends subprocess library
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+# Keep benchmark proofs out of the real OTS folder
+os.environ["OTS_DATA_PATH"] = tempfile.mkdtemp(prefix="ots_bench_")
+
+from app import create_app
+from app.utils.ots_handler import OTS_BACKENDS, OTS_FOLDER, create_timestamp_file, verify_ots_file
+
+
+def percentile(samples: list, pct: float) -> float:
+    """
+    Return the pct-th percentile of samples (nearest rank).
+    """
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(label: str, samples: list):
+    """
+    Print mean, p50 and p95 of a list of durations, in milliseconds.
+    """
+    print(
+        f"{label:<22} n={len(samples):<4} "
+        f"mean={statistics.mean(samples) * 1000:8.1f} ms  "
+        f"p50={percentile(samples, 50) * 1000:8.1f} ms  "
+        f"p95={percentile(samples, 95) * 1000:8.1f} ms"
+    )
+
+
+def run(backend: str, count: int):
+    """
+    Stamp and then verify 'count' random hashes with one backend.
+    """
+    stamp_times, verify_times = [], []
+    filenames = []
+
+    for _ in range(count):
+        start = time.perf_counter()
+        filenames.append(create_timestamp_file(os.urandom(32), backend=backend)[0])
+        stamp_times.append(time.perf_counter() - start)
+
+    for filename in filenames:
+        start = time.perf_counter()
+        verify_ots_file(filename, backend=backend)
+        verify_times.append(time.perf_counter() - start)
+
+    report(f"{backend} stamp", stamp_times)
+    report(f"{backend} verify", verify_times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the OTS backends.")
+    parser.add_argument("--count", type=int, default=10, help="hashes stamped and verified per backend")
+    parser.add_argument("--backends", nargs="+", choices=OTS_BACKENDS, default=list(OTS_BACKENDS))
+    args = parser.parse_args()
+
+    print(f"Proofs written to {OTS_FOLDER}\n")
+    with create_app().app_context():
+        for backend in args.backends:
+            run(backend, args.count)
@@ -9,8 +9,8 @@ app = create_app()
 # Get admin password from environment variable or use default
 password = os.getenv("ADMIN_PASSWORD", "admin123")
 
-# Generate a bcrypt hash of the password
-hashed_password = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+# Generate a bcrypt hash of the password at the configured cost factor
+hashed_password = bcrypt.hashpw(password.encode(), bcrypt.gensalt(app.config["BCRYPT_ROUNDS"])).decode()
 
 # Use the application context to access the database
 with app.app_context():
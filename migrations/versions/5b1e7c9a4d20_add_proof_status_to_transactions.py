@@ -0,0 +1,34 @@
+"""add proof_status to transactions
+
+Revision ID: 5b1e7c9a4d20
+Revises: 2d64d798fb3e
+Create Date: 2026-10-18 09:12:41.208317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e7c9a4d20'
+down_revision = '2d64d798fb3e'
+branch_labels = None
+depends_on = None
+
+
+proofstatus = sa.Enum('PENDING', 'STAMPED', 'FAILED', name='proofstatus')
+
+
+def upgrade():
+    proofstatus.create(op.get_bind(), checkfirst=True)
+
+    # Existing transactions were stamped synchronously, so they already have a proof
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('proof_status', proofstatus, nullable=False, server_default='STAMPED'))
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('proof_status')
+
+    proofstatus.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,26 @@
+"""add proof hash to transactions
+
+Revision ID: 6e2f9b4d1a87
+Revises: a3e7d1c94f58
+Create Date: 2026-10-20 09:41:07.512384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2f9b4d1a87'
+down_revision = 'a3e7d1c94f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('proof_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('proof_hash')
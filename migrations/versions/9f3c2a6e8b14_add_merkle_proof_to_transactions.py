@@ -0,0 +1,26 @@
+"""add merkle_proof to transactions
+
+Revision ID: 9f3c2a6e8b14
+Revises: 5b1e7c9a4d20
+Create Date: 2026-10-18 10:03:17.554120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f3c2a6e8b14'
+down_revision = '5b1e7c9a4d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('merkle_proof', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('merkle_proof')
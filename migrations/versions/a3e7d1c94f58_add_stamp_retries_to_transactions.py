@@ -0,0 +1,28 @@
+"""add stamp retries to transactions
+
+Revision ID: a3e7d1c94f58
+Revises: f2c8e41a7b93
+Create Date: 2026-10-19 10:12:41.387215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e7d1c94f58'
+down_revision = 'f2c8e41a7b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('stamp_attempts', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('next_stamp_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('next_stamp_at')
+        batch_op.drop_column('stamp_attempts')
@@ -0,0 +1,40 @@
+"""add verification status to transactions
+
+Revision ID: a5d2e8f17c93
+Revises: e81b5f3c6d07
+Create Date: 2026-10-18 14:21:52.730418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5d2e8f17c93'
+down_revision = 'e81b5f3c6d07'
+branch_labels = None
+depends_on = None
+
+
+verificationstatus = sa.Enum('PENDING', 'CONFIRMED', 'FAILED', name='verificationstatus')
+
+
+def upgrade():
+    verificationstatus.create(op.get_bind(), checkfirst=True)
+
+    # Existing transactions have never been verified: every column starts empty
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('verification_status', verificationstatus, nullable=True))
+        batch_op.add_column(sa.Column('block_height', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('attested_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('verified_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('verified_at')
+        batch_op.drop_column('attested_at')
+        batch_op.drop_column('block_height')
+        batch_op.drop_column('verification_status')
+
+    verificationstatus.drop(op.get_bind(), checkfirst=True)
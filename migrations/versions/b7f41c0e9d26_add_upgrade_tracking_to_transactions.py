@@ -0,0 +1,40 @@
+"""add upgrade tracking to transactions
+
+Revision ID: b7f41c0e9d26
+Revises: a5d2e8f17c93
+Create Date: 2026-10-18 15:47:09.162583
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7f41c0e9d26'
+down_revision = 'a5d2e8f17c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # New proof state; only PostgreSQL stores enums as a native type
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE proofstatus ADD VALUE IF NOT EXISTS 'UPGRADED' BEFORE 'FAILED'")
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('upgrade_attempts', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('next_upgrade_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('upgraded_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index('ix_transactions_proof_status_next_upgrade_at', ['proof_status', 'next_upgrade_at'], unique=False)
+
+
+def downgrade():
+    # PostgreSQL cannot drop an enum value: fall back to the state it refines
+    op.execute("UPDATE transactions SET proof_status = 'STAMPED' WHERE proof_status = 'UPGRADED'")
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_proof_status_next_upgrade_at')
+        batch_op.drop_column('upgraded_at')
+        batch_op.drop_column('next_upgrade_at')
+        batch_op.drop_column('upgrade_attempts')
@@ -0,0 +1,26 @@
+"""add created_at id index to transactions
+
+Revision ID: c47d0e2b9a31
+Revises: 9f3c2a6e8b14
+Create Date: 2026-10-18 11:26:42.107385
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47d0e2b9a31'
+down_revision = '9f3c2a6e8b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_created_at_id')
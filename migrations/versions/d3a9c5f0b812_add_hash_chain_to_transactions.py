@@ -0,0 +1,107 @@
+"""add hash chain to transactions
+
+Revision ID: d3a9c5f0b812
+Revises: b7f41c0e9d26
+Create Date: 2026-10-18 18:21:40.517302
+
+"""
+import hashlib
+from datetime import timezone
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a9c5f0b812'
+down_revision = 'b7f41c0e9d26'
+branch_labels = None
+depends_on = None
+
+# Rows chained per round trip when linking existing transactions
+BACKFILL_BATCH_SIZE = 1000
+# Chain hash the first transaction links to
+GENESIS_HASH = "0" * 64
+
+
+# The chain hash is written out here rather than imported from app.utils.ledger,
+# so this migration keeps producing the hashes of this revision if the app changes.
+def _timestamp(moment):
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _link_hash(previous_hash, row):
+    # Enum columns store member names ('ENTRY'); the chain uses their values ('entry')
+    record = "|".join((
+        str(row.id), str(row.product_id), str(row.user_id), row.type.lower(),
+        str(row.quantity), row.blockchain_hash, _timestamp(row.created_at),
+    ))
+    record_digest = hashlib.sha256(record.encode()).digest()
+    return hashlib.sha256(bytes.fromhex(previous_hash) + record_digest).hexdigest()
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('hash_input', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('chain_hash', sa.String(length=64), nullable=True))
+
+    op.create_table('ledger_head',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=True),
+    sa.Column('chain_hash', sa.String(length=64), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('ledger_checkpoints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('chain_hash', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # Link the existing transactions in ID order, then point the head at the last one
+    bind = op.get_bind()
+    transactions = sa.table(
+        'transactions',
+        sa.column('id', sa.Integer), sa.column('product_id', sa.Integer), sa.column('user_id', sa.Integer),
+        sa.column('type', sa.String), sa.column('quantity', sa.Integer), sa.column('blockchain_hash', sa.String),
+        sa.column('created_at', sa.DateTime(timezone=True)), sa.column('chain_hash', sa.String),
+    )
+    chain_hash, last_id, after_id = GENESIS_HASH, None, 0
+    while True:
+        rows = bind.execute(
+            sa.select(transactions).where(transactions.c.id > after_id)
+            .order_by(transactions.c.id).limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        links = []
+        for row in rows:
+            chain_hash = _link_hash(chain_hash, row)
+            links.append({'row_id': row.id, 'chain_hash': chain_hash})
+            last_id = row.id
+
+        bind.execute(
+            transactions.update().where(transactions.c.id == sa.bindparam('row_id'))
+            .values(chain_hash=sa.bindparam('chain_hash')),
+            links
+        )
+        after_id = last_id
+
+    bind.execute(
+        sa.table('ledger_head', sa.column('id'), sa.column('transaction_id'), sa.column('chain_hash'),
+                 sa.column('updated_at'))
+        .insert().values(id=1, transaction_id=last_id, chain_hash=chain_hash, updated_at=sa.func.now())
+    )
+
+
+def downgrade():
+    op.drop_table('ledger_checkpoints')
+    op.drop_table('ledger_head')
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('chain_hash')
+        batch_op.drop_column('hash_input')
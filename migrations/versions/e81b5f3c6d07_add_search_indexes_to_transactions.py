@@ -0,0 +1,30 @@
+"""add search indexes to transactions
+
+Revision ID: e81b5f3c6d07
+Revises: c47d0e2b9a31
+Create Date: 2026-10-18 12:40:05.318246
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e81b5f3c6d07'
+down_revision = 'c47d0e2b9a31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_product_id_created_at_id', ['product_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_transactions_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_transactions_type_created_at_id', ['type', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_type_created_at_id')
+        batch_op.drop_index('ix_transactions_user_id_created_at_id')
+        batch_op.drop_index('ix_transactions_product_id_created_at_id')
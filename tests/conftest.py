@@ -0,0 +1,171 @@
+"""
+Shared test fixtures.
+
+The application is configured from the environment when config.py is imported,
+so the test settings are exported before the app package is loaded: a throwaway
+SQLite database and proof folder, a cheap bcrypt cost, inline stamping and no
+rate limiting or background sweeps.
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+_DATA_DIR = tempfile.mkdtemp(prefix="stockflow-tests-")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_DATA_DIR, 'stockflow.sqlite')}",
+    "SECRET_KEY": "test-secret-key-with-enough-entropy-for-hs256",
+    "OTS_DATA_PATH": os.path.join(_DATA_DIR, "ots"),
+    "OTS_BACKEND": "library",
+    "OTS_STAMP_WORKERS": "0",
+    "OTS_STAMP_RECOVER_INTERVAL": "0",
+    "OTS_UPGRADE_INTERVAL": "0",
+    "BCRYPT_ROUNDS": "4",
+    "RATE_LIMIT_ENABLED": "false",
+})
+
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.infraDB.config.connection import db
+from app.infraDB.models.products import Products
+from app.infraDB.models.transactions import Transactions, TransactionType, ProofStatus
+from app.infraDB.models.users import Users, PermissionType
+from app.utils.security import hash_password
+from fake_calendar import FakeCalendar
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    Application under test, created once for the whole session.
+    """
+    return create_app()
+
+
+@pytest.fixture(autouse=True)
+def database(app):
+    """
+    Fresh tables for every test, inside an application context.
+    """
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield db
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    """
+    Test client of the application.
+    """
+    return app.test_client()
+
+
+@pytest.fixture
+def admin(database):
+    """
+    An administrator account.
+    """
+    user = Users(
+        name="Admin",
+        email="admin@email.com",
+        password_hash=hash_password("admin123"),
+        permission=PermissionType.ADMIN
+    )
+    database.session.add(user)
+    database.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(client, admin):
+    """
+    Authorization header of the administrator.
+    """
+    response = client.post("/api/login", json={"email": "admin@email.com", "password": "admin123"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json['access_token']}"}
+
+
+@pytest.fixture
+def product(database):
+    """
+    A product with enough stock for exits.
+    """
+    item = Products(name="Widget", category="Tools", current_stock=1000, code="W-1")
+    database.session.add(item)
+    database.session.commit()
+    return item
+
+
+@pytest.fixture
+def make_transactions(database, admin, product):
+    """
+    Insert stamped transactions directly, without stamping or chaining them.
+
+    Returns:
+        function: Called with the number of transactions to insert.
+    """
+    def make(count: int):
+        database.session.add_all(
+            Transactions(
+                product_id=product.id,
+                user_id=admin.id,
+                type=TransactionType.ENTRY if index % 2 else TransactionType.EXIT,
+                quantity=index + 1,
+                blockchain_hash=f"{index:064x}",
+                ots_filename=f"{index:064x}.ots",
+                proof_status=ProofStatus.STAMPED
+            )
+            for index in range(count)
+        )
+        database.session.commit()
+
+    return make
+
+
+@pytest.fixture
+def count_queries(database):
+    """
+    Count the SQL statements sent to the database inside a block.
+
+    Usage:
+        with count_queries() as queries:
+            ...
+        assert len(queries) <= 3
+    """
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(database.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(database.engine, "before_cursor_execute", record)
+
+    return counter
+
+
+@pytest.fixture
+def calendar(app, monkeypatch):
+    """
+    A running fake calendar, configured as the only calendar of the app.
+    """
+    server = FakeCalendar()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setitem(app.config, "OTS_CALENDAR_URLS", [server.url])
+    monkeypatch.setitem(app.config, "OTS_MIN_CALENDARS", 1)
+    yield server
+
+    server.shutdown()
+    server.server_close()
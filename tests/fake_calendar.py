@@ -0,0 +1,63 @@
+"""
+Local stand-in for an OpenTimestamps calendar.
+
+The fake calendar accepts digests with a pending attestation pointing back to
+itself, and once anchored answers upgrade requests with a Bitcoin attestation.
+While 'failing' is set, it rejects every submission, like an unreachable calendar.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from opentimestamps.core.notary import BitcoinBlockHeaderAttestation, PendingAttestation
+from opentimestamps.core.serialize import BytesSerializationContext
+from opentimestamps.core.timestamp import Timestamp
+
+ANCHOR_HEIGHT = 800000
+
+
+class FakeCalendar(ThreadingHTTPServer):
+    """
+    Calendar server answering the 'digest' and 'timestamp' endpoints of the OTS protocol.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _CalendarHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.commitments = set()
+        self.anchored = False
+        self.failing = False
+
+
+class _CalendarHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b""):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.server.failing:
+            self._send(503, b"Calendar unavailable")
+            return
+        commitment = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.commitments.add(commitment)
+        timestamp = Timestamp(commitment)
+        timestamp.attestations.add(PendingAttestation(self.server.url))
+        self._send(200, _serialize(timestamp))
+
+    def do_GET(self):
+        commitment = bytes.fromhex(self.path.rsplit("/", 1)[-1])
+        if not self.server.anchored or commitment not in self.server.commitments:
+            self._send(404, b"Pending confirmation in Bitcoin blockchain")
+            return
+        timestamp = Timestamp(commitment)
+        timestamp.attestations.add(BitcoinBlockHeaderAttestation(ANCHOR_HEIGHT))
+        self._send(200, _serialize(timestamp))
+
+
+def _serialize(timestamp) -> bytes:
+    ctx = BytesSerializationContext()
+    timestamp.serialize(ctx)
+    return ctx.getbytes()
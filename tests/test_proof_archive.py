@@ -0,0 +1,26 @@
+"""
+Proof archive tests.
+"""
+
+import csv
+import io
+import zipfile
+from app.infraDB.models.transactions import Transactions, ProofStatus
+
+
+def test_manifest_reports_each_proof_status(client, auth_headers, make_transactions, database):
+    make_transactions(3)
+    pending, failed, missing = database.session.query(Transactions).order_by(Transactions.id).all()
+    pending.proof_status, pending.ots_filename = ProofStatus.PENDING, None
+    failed.proof_status = ProofStatus.FAILED
+    database.session.commit()
+
+    response = client.get("/api/transactions/ots/archive?from=2020-01-01T00:00:00Z&to=2100-01-01T00:00:00Z",
+                          headers=auth_headers)
+    assert response.status_code == 200
+
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        rows = list(csv.DictReader(io.StringIO(archive.read("manifest.csv").decode())))
+
+    statuses = {int(row["transaction_id"]): row["status"] for row in rows}
+    assert statuses == {pending.id: "pending", failed.id: "failed", missing.id: "missing"}
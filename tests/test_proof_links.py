@@ -0,0 +1,23 @@
+"""
+Signed proof link tests.
+"""
+
+from app.infraDB.models.transactions import Transactions, ProofStatus
+
+
+def test_links_report_pending_and_failed_proofs_apart(client, auth_headers, make_transactions, database):
+    make_transactions(3)
+    pending, failed, stamped = database.session.query(Transactions).order_by(Transactions.id).all()
+    pending.proof_status, pending.ots_filename = ProofStatus.PENDING, None
+    failed.proof_status = ProofStatus.FAILED
+    database.session.commit()
+
+    response = client.post("/api/transactions/ots/links",
+                           json={"transaction_ids": [pending.id, failed.id, stamped.id]}, headers=auth_headers)
+    assert response.status_code == 200
+
+    assert [link["transaction_id"] for link in response.json["links"]] == [stamped.id]
+    assert {error["transaction_id"]: error["message"] for error in response.json["errors"]} == {
+        pending.id: "OTS proof is still being generated",
+        failed.id: "OTS proof could not be created",
+    }
@@ -0,0 +1,87 @@
+"""
+Query plan tests for the transactions indexes.
+
+Each repository query is captured as it runs and explained with SQLite's
+EXPLAIN QUERY PLAN, which must show the composite index it was written for.
+"""
+
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import event
+from app.infraDB.models.transactions import TransactionType
+from app.infraDB.repositories.transactions_repositorie import TransactionsRepository
+
+
+@pytest.fixture
+def explain(database, make_transactions):
+    """
+    Run a repository call and return the query plan of its transactions query.
+
+    Returns:
+        function: Called with a function issuing the query; returns the plan as one string.
+    """
+    make_transactions(50)
+
+    def plan(query):
+        captured = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "FROM transactions" in statement:
+                captured.append((statement, parameters))
+
+        event.listen(database.engine, "before_cursor_execute", record)
+        try:
+            query()
+        finally:
+            event.remove(database.engine, "before_cursor_execute", record)
+
+        assert len(captured) == 1
+        statement, parameters = captured[0]
+        rows = database.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        return "\n".join(row[-1] for row in rows)
+
+    return plan
+
+
+def test_listing_uses_created_at_id_index(explain):
+    repo = TransactionsRepository()
+
+    plan = explain(lambda: repo.select_all_transactions(20))
+    assert "ix_transactions_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_next_page_seeks_created_at_id_index(explain):
+    repo = TransactionsRepository()
+    after = (datetime(2020, 1, 1, tzinfo=timezone.utc), 10)
+
+    plan = explain(lambda: repo.select_all_transactions(20, after))
+    assert "SEARCH transactions USING INDEX ix_transactions_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize("method, index", [
+    ("select_transactions_by_product", "ix_transactions_product_id_created_at_id"),
+    ("select_transactions_by_user", "ix_transactions_user_id_created_at_id"),
+])
+def test_filtered_listing_uses_composite_index(explain, method, index):
+    repo = TransactionsRepository()
+
+    plan = explain(lambda: getattr(repo, method)(1, 20))
+    assert f"SEARCH transactions USING INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_search_by_type_uses_composite_index(explain):
+    repo = TransactionsRepository()
+
+    plan = explain(lambda: repo.search_transactions({"type": TransactionType.ENTRY}, 20))
+    assert "SEARCH transactions USING INDEX ix_transactions_type_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_upgrade_candidates_use_proof_status_index(explain):
+    repo = TransactionsRepository()
+
+    plan = explain(lambda: repo.select_upgrade_candidates(datetime.now(timezone.utc), 10))
+    assert "SEARCH transactions USING INDEX ix_transactions_proof_status_next_upgrade_at (proof_status=?" in plan
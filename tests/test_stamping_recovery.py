@@ -0,0 +1,75 @@
+"""
+Stamping retry tests, against a fake calendar that rejects submissions.
+
+A failed attempt must keep the proof pending with a scheduled retry, and the
+recovery sweep must stamp it once the calendar is back.
+"""
+
+from datetime import datetime, timezone
+import pytest
+from app.infraDB.models.transactions import Transactions, ProofStatus
+from app.services.stamping_service import stamping_queue
+
+
+def _transaction(database, transaction_id: int) -> Transactions:
+    database.session.expire_all()
+    return database.session.get(Transactions, transaction_id)
+
+
+@pytest.fixture
+def failed_entry(client, auth_headers, product, calendar):
+    """
+    An entry whose first stamping attempt failed on an unavailable calendar.
+
+    Returns:
+        int: The transaction ID.
+    """
+    calendar.failing = True
+    response = client.post("/api/transactions/entry", json={"product_id": product.id, "quantity": 2},
+                           headers=auth_headers)
+    assert response.status_code == 201
+    return response.json["id"]
+
+
+def test_failed_stamp_is_retried_by_the_recovery_sweep(failed_entry, calendar, database):
+    transaction = _transaction(database, failed_entry)
+    assert transaction.proof_status == ProofStatus.PENDING
+    assert transaction.stamp_attempts == 1
+    assert transaction.next_stamp_at is not None
+
+    # Backoff not over: the sweep leaves it alone
+    assert stamping_queue.recover() == 0
+
+    calendar.failing = False
+    transaction.next_stamp_at = datetime.now(timezone.utc)
+    database.session.commit()
+
+    assert stamping_queue.recover() == 1
+    transaction = _transaction(database, failed_entry)
+    assert transaction.proof_status == ProofStatus.STAMPED
+    assert transaction.ots_filename is not None
+    assert len(calendar.commitments) == 1
+
+
+def test_stamp_fails_after_max_attempts_and_cli_recovers_it(app, failed_entry, calendar, database, monkeypatch):
+    monkeypatch.setattr(stamping_queue, "_max_attempts", 2)
+
+    transaction = _transaction(database, failed_entry)
+    transaction.next_stamp_at = datetime.now(timezone.utc)
+    database.session.commit()
+
+    # Second failure: retries exhausted
+    assert stamping_queue.recover() == 1
+    transaction = _transaction(database, failed_entry)
+    assert transaction.proof_status == ProofStatus.FAILED
+    assert transaction.stamp_attempts == 2
+    assert stamping_queue.recover(older_than=0) == 0
+
+    calendar.failing = False
+    result = app.test_cli_runner().invoke(args=["ots", "recover-pending", "--failed"])
+    assert result.exit_code == 0, result.output
+    assert "Re-submitted 1 pending transaction(s)" in result.output
+
+    transaction = _transaction(database, failed_entry)
+    assert transaction.proof_status == ProofStatus.STAMPED
+    assert transaction.ots_filename is not None
@@ -0,0 +1,51 @@
+"""
+Query-count regression tests for transaction listings and exports.
+
+Listing and exporting read the user's email in the same statement as the
+transactions, so the number of queries must not grow with the number of rows.
+"""
+
+import json
+import pytest
+
+
+@pytest.mark.parametrize("path", [
+    "/api/transactions?limit=50",
+    "/api/transactions/by-product/1?limit=50",
+    "/api/user/transactions?limit=50",
+    "/api/transactions/search?type=entry&limit=50",
+])
+def test_listing_query_count_does_not_grow_with_rows(client, auth_headers, make_transactions, count_queries, path):
+    make_transactions(5)
+    with count_queries() as few:
+        response = client.get(path, headers=auth_headers)
+    assert response.status_code == 200
+
+    make_transactions(120)
+    with count_queries() as many:
+        response = client.get(path, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json["items"]) > 5
+
+    assert len(many) == len(few)
+    assert len(many) <= 3
+
+
+@pytest.mark.parametrize("path", [
+    "/api/transactions?format=ndjson",
+    "/api/transactions/by-product/1?format=ndjson",
+])
+def test_export_query_count_does_not_grow_with_rows(app, client, auth_headers, make_transactions, count_queries,
+                                                    monkeypatch, path):
+    # Several cursor batches, still a single statement
+    monkeypatch.setitem(app.config, "TRANSACTIONS_EXPORT_BATCH_SIZE", 25)
+    make_transactions(130)
+
+    with count_queries() as queries:
+        response = client.get(path, headers=auth_headers)
+        lines = response.get_data(as_text=True).splitlines()
+
+    assert response.status_code == 200
+    assert len(lines) == 130
+    assert all(json.loads(line)["user_email"] == "admin@email.com" for line in lines)
+    assert len(queries) <= 3
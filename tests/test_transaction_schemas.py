@@ -0,0 +1,51 @@
+"""
+Time range validation tests.
+
+Bounds without an offset are read as UTC, so a naive bound and an aware one
+are compared instead of crashing the request.
+"""
+
+
+def test_search_accepts_mixed_naive_and_aware_bounds(client, auth_headers, make_transactions):
+    make_transactions(3)
+    response = client.get("/api/transactions/search?from=2020-01-01T00:00:00&to=2100-01-01T00:00:00Z",
+                          headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json["items"]) == 3
+
+
+def test_search_rejects_reversed_mixed_bounds(client, auth_headers):
+    response = client.get("/api/transactions/search?from=2030-01-01T00:00:00&to=2020-01-01T00:00:00%2B02:00",
+                          headers=auth_headers)
+    assert response.status_code == 400
+    assert "from" in response.json["errors"]
+
+
+def test_verify_batch_accepts_mixed_naive_and_aware_bounds(client, auth_headers):
+    response = client.post("/api/transactions/verify/batch",
+                           json={"from": "2020-01-01T00:00:00", "to": "2030-01-01T00:00:00Z"},
+                           headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_verify_batch_rejects_reversed_mixed_bounds(client, auth_headers):
+    response = client.post("/api/transactions/verify/batch",
+                           json={"from": "2030-01-01T00:00:00", "to": "2020-01-01T00:00:00Z"},
+                           headers=auth_headers)
+    assert response.status_code == 400
+    assert "from" in response.json["errors"]
+
+
+def test_archive_accepts_mixed_naive_and_aware_bounds(client, auth_headers, make_transactions):
+    make_transactions(2)
+    response = client.get("/api/transactions/ots/archive?from=2020-01-01T00:00:00&to=2100-01-01T00:00:00Z",
+                          headers=auth_headers)
+    assert response.status_code == 200
+    assert response.mimetype == "application/zip"
+
+
+def test_archive_rejects_reversed_mixed_bounds(client, auth_headers):
+    response = client.get("/api/transactions/ots/archive?from=2030-01-01T00:00:00&to=2020-01-01T00:00:00Z",
+                          headers=auth_headers)
+    assert response.status_code == 400
+    assert "from" in response.json["errors"]
@@ -0,0 +1,98 @@
+"""
+Upgrade worker tests, against the fake calendar of the 'calendar' fixture.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from opentimestamps.core.notary import BitcoinBlockHeaderAttestation
+from fake_calendar import ANCHOR_HEIGHT
+from app.infraDB.models.transactions import Transactions, ProofStatus
+from app.services.upgrade_service import upgrade_worker
+from app.utils.ots_handler import read_proof
+from app.utils.ots_library import deserialize_timestamp
+
+
+def _transaction(database, transaction_id: int) -> Transactions:
+    database.session.expire_all()
+    return database.session.get(Transactions, transaction_id)
+
+
+def test_pending_proof_is_upgraded_once_anchored(client, auth_headers, product, calendar, database):
+    response = client.post("/api/transactions/entry", json={"product_id": product.id, "quantity": 3},
+                           headers=auth_headers)
+    assert response.status_code == 201
+    transaction_id = response.json["id"]
+
+    # Stamped inline on the fake calendar: one pending attestation
+    transaction = _transaction(database, transaction_id)
+    assert transaction.proof_status == ProofStatus.STAMPED
+    assert len(calendar.commitments) == 1
+
+    # Not anchored yet: the proof stays stamped and is retried later
+    assert upgrade_worker.run() == {"upgraded": 0, "pending": 1, "failed": 0}
+    transaction = _transaction(database, transaction_id)
+    assert transaction.proof_status == ProofStatus.STAMPED
+    assert transaction.upgrade_attempts == 1
+    assert transaction.next_upgrade_at is not None
+
+    # Backoff not over: nothing is due
+    assert upgrade_worker.run() == {"upgraded": 0, "pending": 0, "failed": 0}
+
+    calendar.anchored = True
+    transaction.next_upgrade_at = datetime.now(timezone.utc)
+    database.session.commit()
+
+    assert upgrade_worker.run() == {"upgraded": 1, "pending": 0, "failed": 0}
+    transaction = _transaction(database, transaction_id)
+    assert transaction.proof_status == ProofStatus.UPGRADED
+    assert transaction.upgraded_at is not None
+
+    # The rewritten proof carries the Bitcoin attestation
+    detached = deserialize_timestamp(bytes(read_proof(transaction.ots_filename)))
+    heights = [
+        attestation.height
+        for _, attestation in detached.timestamp.all_attestations()
+        if isinstance(attestation, BitcoinBlockHeaderAttestation)
+    ]
+    assert heights == [ANCHOR_HEIGHT]
+
+
+def test_proof_etag_follows_the_stored_content(client, auth_headers, product, calendar, database):
+    response = client.post("/api/transactions/entry", json={"product_id": product.id, "quantity": 2},
+                           headers=auth_headers)
+    assert response.status_code == 201
+    transaction_id = response.json["id"]
+    path = f"/api/transactions/{transaction_id}/ots"
+
+    transaction = _transaction(database, transaction_id)
+    assert transaction.proof_hash == hashlib.sha256(bytes(read_proof(transaction.ots_filename))).hexdigest()
+
+    stamped = client.get(path, headers=auth_headers)
+    assert stamped.status_code == 200
+    etag = stamped.headers["ETag"]
+    assert client.get(path, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+    calendar.anchored = True
+    assert upgrade_worker.run() == {"upgraded": 1, "pending": 0, "failed": 0}
+    transaction = _transaction(database, transaction_id)
+    assert transaction.proof_hash == hashlib.sha256(bytes(read_proof(transaction.ots_filename))).hexdigest()
+
+    # The upgraded proof is a new version: the old validator no longer matches
+    upgraded = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+    assert upgraded.status_code == 200
+    assert upgraded.headers["ETag"] != etag
+    assert upgraded.data == bytes(read_proof(transaction.ots_filename))
+
+
+def test_upgrade_skips_calendars_outside_the_whitelist(client, auth_headers, product, calendar, database, app,
+                                                      monkeypatch):
+    response = client.post("/api/transactions/entry", json={"product_id": product.id, "quantity": 1},
+                           headers=auth_headers)
+    assert response.status_code == 201
+    calendar.anchored = True
+
+    # The proof points to a calendar that is no longer configured
+    monkeypatch.setitem(app.config, "OTS_CALENDAR_URLS", ["http://127.0.0.1:9"])
+
+    assert upgrade_worker.run() == {"upgraded": 0, "pending": 1, "failed": 0}
+    assert _transaction(database, response.json["id"]).proof_status == ProofStatus.STAMPED